@@ -0,0 +1,19 @@
+# Thư viện AI và phát hiện ngôn ngữ, chỉ được import khi tạo reply lần đầu
+from lazy_import import is_available, provider
+
+_EXPORTS = {
+    'genai': ('google.generativeai', None, 'google-generativeai'),
+    'OpenAI': ('openai', 'OpenAI', 'openai'),
+    'lang_detect': ('langdetect', 'detect', 'langdetect'),
+}
+
+__getattr__ = provider(globals(), _EXPORTS)
+
+
+def available():
+    """{package: đã cài hay chưa}"""
+    return {
+        'google-generativeai': is_available('google.generativeai'),
+        'openai': is_available('openai'),
+        'langdetect': is_available('langdetect'),
+    }
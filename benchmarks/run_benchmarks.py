@@ -0,0 +1,298 @@
+"""Benchmark offline cho tầng database và logging.
+
+Chạy từ thư mục gốc của repo (không cần trình duyệt, mạng, API key hay màn hình):
+
+    python -m benchmarks.run_benchmarks                  # chạy và so sánh với baseline
+    python -m benchmarks.run_benchmarks --save-baseline  # lưu kết quả làm baseline
+    python -m benchmarks.run_benchmarks --logs 1000000 --accounts 50
+
+Database tổng hợp được tạo trong thư mục tạm (hoặc --db) bằng benchmarks.synthetic_data.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import synthetic_data
+from daily_stats import DailyStats
+from db_pool import DatabasePool
+from dedup_store import ReplyDedupStore
+from log_store import LogStore
+from log_writer import LogWriter
+from migrations import find_full_scans, migrate
+from queries import QueryRepository
+from settings_cache import SettingsCache
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Các bộ lọc của trang Log được đo
+LOG_FILTERS = {
+    'latest': None,
+    'level': {'level': 'ERROR'},
+    'account_level': {'account': '@bench_user_3', 'level': 'WARNING'},
+    'module_24h': {'module': 'Network', 'date_range': 'Last 24 Hours'},
+    'search': {'search_text': 'timeout retry'},
+    'search_account': {'search_text': 'verified', 'account': '@bench_user_1'},
+}
+
+
+def _percentile(sorted_samples, p):
+    index = min(len(sorted_samples) - 1, int(round(p / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def _latency_result(samples):
+    """Percentile chính xác từ các mẫu (giây); histogram theo bucket quá thô để so baseline"""
+    samples = sorted(sample * 1000 for sample in samples) or [0.0]
+    return {
+        'p50_ms': {'value': _percentile(samples, 50), 'better': 'lower'},
+        'p95_ms': {'value': _percentile(samples, 95), 'better': 'lower'},
+        'mean_ms': {'value': sum(samples) / len(samples), 'better': 'lower'},
+    }
+
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def _throughput_result(count, seconds):
+    return {'ops_per_s': {'value': count / seconds if seconds else 0.0, 'better': 'higher'}}
+
+
+def bench_startup_load(db_path, volumes):
+    """Các truy vấn khi mở ứng dụng: danh sách tài khoản, số liệu, cấu hình, trang log đầu"""
+    DatabasePool(db_path).close_all()
+    tracemalloc.start()
+    started = time.perf_counter()
+    conn = DatabasePool(db_path).connection()
+    accounts = conn.execute("SELECT * FROM accounts ORDER BY name").fetchall()
+    DailyStats(db_path).totals_by_account()
+    DailyStats(db_path).totals()
+    cache = SettingsCache(db_path)
+    cache.invalidate()
+    for i in range(volumes['accounts']):
+        cache.get(synthetic_data.profile_id_for(i))
+    LogStore(db_path).fetch_page(limit=200)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'cold_ms': {'value': elapsed_ms, 'better': 'lower'},
+        'peak_alloc_kb': {'value': peak / 1024, 'better': 'lower'},
+        'accounts_loaded': {'value': len(accounts), 'better': None},
+    }
+
+
+def bench_log_insert(db_path, count):
+    """Ghi count log qua LogWriter (hàng đợi + ghi theo lô) cho tới khi flush xong"""
+    writer = LogWriter(db_path)
+    started = time.perf_counter()
+    for i in range(count):
+        writer.write('INFO', 'Benchmark', f"bench_user_{i % 20}", f"benchmark log line {i}")
+    writer.flush(timeout=60)
+    return _throughput_result(count, time.perf_counter() - started)
+
+
+def bench_daily_stats_upsert(db_path, count, accounts):
+    """Ghi count số liệu qua DailyStats (journal + LogWriter) cho tới khi flush xong"""
+    stats = DailyStats(db_path)
+    started = time.perf_counter()
+    for i in range(count):
+        stats.record(synthetic_data.profile_id_for(i % accounts), replies=1, likes=1, response_ms_total=120)
+    LogWriter(db_path).flush(timeout=60)
+    return _throughput_result(count, time.perf_counter() - started)
+
+
+def bench_posted_insert(db_path, count, accounts):
+    queries = QueryRepository(db_path)
+    started = time.perf_counter()
+    for i in range(count):
+        queries.execute('insert_posted_tweet', (
+            synthetic_data.profile_id_for(i % accounts), f"bench-{i}", "original", f"posted {i}",
+            time.strftime('%Y-%m-%d %H:%M:%S'), int(time.time())
+        ))
+    return _throughput_result(count, time.perf_counter() - started)
+
+
+def bench_log_queries(db_path, repeat):
+    """Độ trễ lấy trang đầu (200 dòng) của trang Log với từng bộ lọc"""
+    store = LogStore(db_path)
+    results = {}
+    for name, filters in LOG_FILTERS.items():
+        samples = [_timed(store.fetch_page, None, 200, filters) for _ in range(repeat)]
+        for metric, value in _latency_result(samples).items():
+            results[f"{name}.{metric}"] = value
+    return results
+
+
+def bench_dedup(db_path, lookups, accounts):
+    """Khởi tạo ReplyDedupStore và tra cứu tweet id chưa reply/đã reply"""
+    profile_id = synthetic_data.profile_id_for(accounts // 2)
+    started = time.perf_counter()
+    store = ReplyDedupStore(profile_id, db_path)
+    init_ms = (time.perf_counter() - started) * 1000
+    known = [row[0] for row in DatabasePool(db_path).connection().execute(
+        "SELECT tweet_id FROM replied_tweets WHERE profile_id = ? LIMIT ?", (profile_id, lookups)
+    )]
+    # Lần tra cứu đầu tiên đồng bộ dần Bloom filter; đo riêng phần đã đồng bộ xong
+    warmup = time.perf_counter()
+    while not store._bloom_ready:
+        synthetic_data.TWEET_ID_BASE + 1 in store
+    warmup_ms = (time.perf_counter() - warmup) * 1000
+    miss = [_timed(store.__contains__, synthetic_data.TWEET_ID_BASE + i * 4096 + 4095) for i in range(lookups)]
+    hit = [_timed(store.__contains__, tweet_id) for tweet_id in known]
+    results = {
+        'init_ms': {'value': init_ms, 'better': 'lower'},
+        'bloom_sync_ms': {'value': warmup_ms, 'better': 'lower'},
+        'memory_kb': {'value': store.memory_bytes() / 1024, 'better': 'lower'},
+    }
+    for name, samples in (('miss', miss), ('hit', hit)):
+        for metric, value in _latency_result(samples).items():
+            results[f"{name}.{metric}"] = value
+    return results
+
+
+def max_rss_kb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS trả về byte, Linux trả về KB
+    return usage / 1024 if sys.platform == 'darwin' else usage
+
+
+def run_all(db_path, volumes, args):
+    results = {}
+    started = time.perf_counter()
+    migrate(db_path)
+    results['migrate'] = {'ms': {'value': (time.perf_counter() - started) * 1000, 'better': 'lower'}}
+    for name, detail in find_full_scans(DatabasePool(db_path).connection()):
+        print(f"Warning: hot query '{name}' does a full scan ({detail})")
+    results['startup_load'] = bench_startup_load(db_path, volumes)
+    results['log_query'] = bench_log_queries(db_path, args.repeat)
+    results['dedup'] = bench_dedup(db_path, args.lookups, volumes['accounts'])
+    results['log_insert'] = bench_log_insert(db_path, args.inserts)
+    results['daily_stats_upsert'] = bench_daily_stats_upsert(db_path, args.inserts // 10, volumes['accounts'])
+    results['posted_insert'] = bench_posted_insert(db_path, args.inserts // 10, volumes['accounts'])
+    results['process'] = {
+        'max_rss_kb': {'value': max_rss_kb(), 'better': 'lower'},
+        'db_size_kb': {'value': os.path.getsize(db_path) / 1024, 'better': None},
+    }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """So sánh với baseline, trả về danh sách dòng báo cáo và số chỉ số bị chậm đi"""
+    lines = []
+    regressions = 0
+    for group, metrics in results.items():
+        for metric, data in metrics.items():
+            value = data['value']
+            base = baseline.get(group, {}).get(metric, {}).get('value')
+            label = f"{group}.{metric}"
+            if base is None or data['better'] is None or base == 0:
+                lines.append(f"  {label:<40} {value:12.3f}")
+                continue
+            change = (value - base) / base * 100
+            worse = change > tolerance if data['better'] == 'lower' else change < -tolerance
+            better = change < -tolerance if data['better'] == 'lower' else change > tolerance
+            status = "REGRESSION" if worse else ("improved" if better else "")
+            regressions += int(worse)
+            lines.append(f"  {label:<40} {value:12.3f}  baseline {base:12.3f}  {change:+7.1f}%  {status}")
+    return lines, regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the database and logging layers")
+    parser.add_argument('--db', help="Dùng/tạo database ở đường dẫn này thay vì thư mục tạm")
+    parser.add_argument('--reuse-db', action='store_true', help="Không tạo lại dữ liệu nếu --db đã tồn tại")
+    parser.add_argument('--accounts', type=int, default=20)
+    parser.add_argument('--logs', type=int, default=200000)
+    parser.add_argument('--replied', type=int, default=5000, help="Số replied_tweets mỗi tài khoản")
+    parser.add_argument('--posted', type=int, default=200, help="Số posted_tweets mỗi tài khoản")
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--inserts', type=int, default=20000, help="Số log ghi trong bench log_insert")
+    parser.add_argument('--repeat', type=int, default=30, help="Số lần chạy mỗi truy vấn log")
+    parser.add_argument('--lookups', type=int, default=5000, help="Số lần tra cứu dedup")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=20.0, help="Phần trăm chênh lệch được bỏ qua")
+    parser.add_argument('--json', help="Ghi kết quả ra file JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    temp_dir = None
+    if args.db:
+        db_path = args.db
+    else:
+        temp_dir = tempfile.mkdtemp(prefix='x2bench-')
+        db_path = os.path.join(temp_dir, 'settings.db')
+
+    try:
+        volumes = {
+            'accounts': args.accounts, 'logs': args.logs, 'replied_tweets': args.accounts * args.replied,
+            'posted_tweets': args.accounts * args.posted, 'days': args.days, 'seed': args.seed,
+        }
+        if not (args.reuse_db and os.path.exists(db_path)):
+            if os.path.exists(db_path):
+                os.remove(db_path)
+            print(f"Generating synthetic data in {db_path} ...")
+            started = time.perf_counter()
+            volumes = synthetic_data.generate(
+                db_path, accounts=args.accounts, logs=args.logs, replied_per_account=args.replied,
+                posted_per_account=args.posted, days=args.days, seed=args.seed
+            )
+            print(f"  done in {time.perf_counter() - started:.1f} s")
+
+        DatabasePool(db_path)
+        results = run_all(db_path, volumes, args)
+        LogWriter(db_path).close()
+        DatabasePool(db_path).close_all()
+
+        baseline = {}
+        baseline_volumes = None
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as f:
+                saved = json.load(f)
+            baseline = saved.get('results', {})
+            baseline_volumes = saved.get('volumes')
+
+        print(f"\nResults (SQLite {sqlite3.sqlite_version}, Python {platform.python_version()}):")
+        lines, regressions = compare(results, baseline, args.tolerance)
+        print("\n".join(lines))
+        if baseline_volumes is not None and baseline_volumes != volumes:
+            print("\nWarning: baseline was recorded with different data volumes, comparison is approximate")
+
+        report = {
+            'recorded_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'sqlite_version': sqlite3.sqlite_version,
+            'python_version': platform.python_version(),
+            'volumes': volumes,
+            'results': results,
+        }
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        if args.save_baseline:
+            with open(args.baseline, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"\nBaseline saved to {args.baseline}")
+        elif baseline:
+            print(f"\n{regressions} regression(s) beyond {args.tolerance:.0f}%")
+        return 1 if regressions and not args.save_baseline else 0
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+from log_store import ensure_log_schema
+from migrations import POSTED_TWEETS_TABLE, REPLIED_TWEETS_TABLE
+
+# Schema giống DatabaseManager (src/database_manager.cpp) cộng bảng posted_tweets của bot,
+# ở phiên bản trước migration (run_benchmarks chạy migrations.migrate như khi mở ứng dụng)
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS accounts (
+        profile_id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        username TEXT NOT NULL,
+        password TEXT,
+        email TEXT,
+        phone TEXT,
+        debug_port INTEGER DEFAULT 9222,
+        profile_path TEXT,
+        use_proxy BOOLEAN DEFAULT 0,
+        proxy_url TEXT,
+        use_gemini BOOLEAN DEFAULT 1,
+        gemini_key TEXT,
+        chatgpt_key TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS settings (
+        profile_id TEXT PRIMARY KEY,
+        max_replies INTEGER DEFAULT 50,
+        min_views INTEGER DEFAULT 0,
+        skip_replies BOOLEAN DEFAULT 1,
+        skip_retweets BOOLEAN DEFAULT 1,
+        skip_japanese BOOLEAN DEFAULT 0,
+        auto_like BOOLEAN DEFAULT 1,
+        auto_follow_verified BOOLEAN DEFAULT 0,
+        auto_retweet BOOLEAN DEFAULT 0,
+        japanese_only BOOLEAN DEFAULT 0,
+        reply_first_only BOOLEAN DEFAULT 0,
+        minimize_window BOOLEAN DEFAULT 0,
+        time_limit_hours INTEGER DEFAULT 24,
+        time_limit_minutes INTEGER DEFAULT 0,
+        interval INTEGER DEFAULT 30,
+        reply_interval INTEGER DEFAULT 0,
+        schedule_enabled BOOLEAN DEFAULT 0,
+        start_time TEXT DEFAULT '09:00',
+        end_time TEXT DEFAULT '17:00',
+        schedule_days TEXT DEFAULT '0,1,2,3,4,5,6',
+        mode_id INTEGER DEFAULT 1,
+        target_keywords TEXT,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS account_stats (
+        profile_id TEXT PRIMARY KEY,
+        replies_sent INTEGER DEFAULT 0,
+        likes_given INTEGER DEFAULT 0,
+        follows_made INTEGER DEFAULT 0,
+        retweets INTEGER DEFAULT 0,
+        last_activity DATETIME,
+        total_runtime_minutes INTEGER DEFAULT 0,
+        success_rate REAL DEFAULT 0.0,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )""",
+    REPLIED_TWEETS_TABLE,
+    "CREATE INDEX IF NOT EXISTS idx_replied_tweets_profile ON replied_tweets (profile_id)",
+    POSTED_TWEETS_TABLE,
+]
+
+LEVELS = ["INFO"] * 12 + ["DEBUG"] * 4 + ["SUCCESS"] * 2 + ["WARNING", "ERROR"]
+MODULES = ["Bot", "System", "Database", "Account Manager", "Network"]
+WORDS = ("tweet reply like follow feed trending keyword timeout retry session profile "
+         "browser element selector scroll verified media response error success queue").split()
+
+# Tweet id dạng snowflake (khoảng năm 2024) để giống dữ liệu thật
+TWEET_ID_BASE = 1750000000000000000
+
+
+def profile_id_for(index):
+    return f"bench-profile-{index:04d}"
+
+
+def _sentence(rng, words=8):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _timestamps(rng, count, days, now):
+    """count mốc thời gian tăng dần rải đều trong days ngày gần nhất"""
+    start = now - timedelta(days=days)
+    span = days * 86400
+    for i in range(count):
+        offset = span * i / max(1, count) + rng.random()
+        yield (start + timedelta(seconds=offset)).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _batched(rows, size=5000):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate(db_path, accounts=20, logs=200000, replied_per_account=5000,
+             posted_per_account=200, days=90, seed=42):
+    """Tạo database tổng hợp (ghi đè dữ liệu bench cũ), trả về dict số dòng đã tạo"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    conn = sqlite3.connect(db_path)
+    try:
+        # Bảng logs trước: với database mới, auto_vacuum phải được đặt trước khi bật WAL
+        ensure_log_schema(conn)
+        conn.execute("PRAGMA journal_mode=WAL")
+        for statement in SCHEMA:
+            conn.execute(statement)
+
+        with conn:
+            profiles = [profile_id_for(i) for i in range(accounts)]
+            conn.executemany(
+                "INSERT OR REPLACE INTO accounts (profile_id, name, username, use_gemini) VALUES (?, ?, ?, ?)",
+                [(pid, f"Bench {i}", f"bench_user_{i}", i % 2) for i, pid in enumerate(profiles)]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO settings (profile_id, max_replies, interval) VALUES (?, ?, ?)",
+                [(pid, 50 + i, 30) for i, pid in enumerate(profiles)]
+            )
+            conn.executemany(
+                """INSERT OR REPLACE INTO account_stats (profile_id, replies_sent, likes_given, follows_made, retweets)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [(pid, replied_per_account, replied_per_account // 2, replied_per_account // 20, 0)
+                 for pid in profiles]
+            )
+
+        def replied_rows():
+            for i, pid in enumerate(profiles):
+                for n, replied_at in enumerate(_timestamps(rng, replied_per_account, days, now)):
+                    tweet_id = TWEET_ID_BASE + (n * accounts + i) * 4096 + rng.randrange(4096)
+                    yield (pid, str(tweet_id), f"user_{rng.randrange(100000)}", _sentence(rng, 12), replied_at)
+
+        for batch in _batched(replied_rows()):
+            with conn:
+                conn.executemany(
+                    """INSERT OR IGNORE INTO replied_tweets (profile_id, tweet_id, username, reply_text, replied_at)
+                       VALUES (?, ?, ?, ?, ?)""", batch
+                )
+
+        def posted_rows():
+            for pid in profiles:
+                for n, posted_at in enumerate(_timestamps(rng, posted_per_account, days, now)):
+                    yield (pid, str(TWEET_ID_BASE + n), _sentence(rng, 20), _sentence(rng, 20), posted_at)
+
+        for batch in _batched(posted_rows()):
+            with conn:
+                conn.executemany(
+                    """INSERT INTO posted_tweets (profile_id, original_id, original_content, posted_content, posted_at)
+                       VALUES (?, ?, ?, ?, ?)""", batch
+                )
+
+        def log_rows():
+            for timestamp in _timestamps(rng, logs, days, now):
+                account = f"bench_user_{rng.randrange(accounts)}" if rng.random() < 0.8 else None
+                yield (timestamp, rng.choice(LEVELS), rng.choice(MODULES), account, _sentence(rng), None)
+
+        for batch in _batched(log_rows()):
+            with conn:
+                conn.executemany(
+                    "INSERT INTO logs (timestamp, level, module, account, message, details) VALUES (?, ?, ?, ?, ?, ?)",
+                    batch
+                )
+    finally:
+        conn.close()
+
+    return {
+        'accounts': accounts,
+        'logs': logs,
+        'replied_tweets': accounts * replied_per_account,
+        'posted_tweets': accounts * posted_per_account,
+        'days': days,
+        'seed': seed,
+    }
@@ -0,0 +1,18 @@
+# Selenium, chỉ được import khi bot mở trình duyệt lần đầu
+from lazy_import import is_available, provider
+
+_EXPORTS = {
+    'webdriver': ('selenium.webdriver', None, 'selenium'),
+    'By': ('selenium.webdriver.common.by', 'By', 'selenium'),
+    'EC': ('selenium.webdriver.support.expected_conditions', None, 'selenium'),
+    'WebDriverWait': ('selenium.webdriver.support.ui', 'WebDriverWait', 'selenium'),
+    'Options': ('selenium.webdriver.chrome.options', 'Options', 'selenium'),
+    'Service': ('selenium.webdriver.chrome.service', 'Service', 'selenium'),
+    'NoSuchElementException': ('selenium.common.exceptions', 'NoSuchElementException', 'selenium'),
+}
+
+__getattr__ = provider(globals(), _EXPORTS)
+
+
+def available():
+    return is_available('selenium')
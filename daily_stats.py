@@ -0,0 +1,148 @@
+import threading
+from datetime import datetime
+
+from db_pool import DatabasePool
+from log_writer import LogWriter
+from profiler import profiled
+
+# Ngày dùng cho số liệu tích lũy trước khi có bảng tổng hợp (không tính vào bộ lọc thời gian)
+HISTORY_DAY = '0000-00-00'
+
+COUNTERS = ('replies', 'reply_failures', 'likes', 'follows', 'retweets', 'posts', 'response_ms_total')
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS account_daily_stats (
+        profile_id TEXT NOT NULL,
+        day TEXT NOT NULL,
+        replies INTEGER NOT NULL DEFAULT 0,
+        reply_failures INTEGER NOT NULL DEFAULT 0,
+        likes INTEGER NOT NULL DEFAULT 0,
+        follows INTEGER NOT NULL DEFAULT 0,
+        retweets INTEGER NOT NULL DEFAULT 0,
+        posts INTEGER NOT NULL DEFAULT 0,
+        response_ms_total INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (profile_id, day)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_account_daily_stats_day ON account_daily_stats (day)",
+]
+
+_UPSERT = f"""INSERT INTO account_daily_stats (profile_id, day, {', '.join(COUNTERS)})
+    VALUES (?, ?, {', '.join('?' * len(COUNTERS))})
+    ON CONFLICT (profile_id, day) DO UPDATE SET
+    {', '.join(f'{name} = {name} + excluded.{name}' for name in COUNTERS)}"""
+
+_SUMS = ', '.join(f"COALESCE(SUM({name}), 0)" for name in COUNTERS)
+
+
+def ensure_stats_schema(conn):
+    """Tạo bảng tổng hợp; lần đầu chuyển số liệu cũ của account_stats sang"""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'account_daily_stats'"
+    ).fetchone() is not None
+    with conn:
+        for statement in SCHEMA:
+            conn.execute(statement)
+        if not exists:
+            _seed_from_account_stats(conn)
+
+
+def _seed_from_account_stats(conn):
+    """Chuyển tổng số liệu cũ trong account_stats vào ngày HISTORY_DAY (chạy một lần)"""
+    try:
+        rows = conn.execute(
+            "SELECT profile_id, replies_sent, likes_given, follows_made, retweets FROM account_stats"
+        ).fetchall()
+    except Exception:
+        # Database chưa có account_stats
+        return
+    conn.executemany(
+        """INSERT OR IGNORE INTO account_daily_stats (profile_id, day, replies, likes, follows, retweets)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        [(profile_id, HISTORY_DAY, replies or 0, likes or 0, follows or 0, retweets or 0)
+         for profile_id, replies, likes, follows, retweets in rows]
+    )
+
+
+def _apply_deltas(conn, rows):
+    """Sink của LogWriter: cộng dồn các lô [profile_id, day, *COUNTERS], gộp theo (profile, ngày)"""
+    merged = {}
+    for profile_id, day, *values in rows:
+        key = (profile_id, day)
+        if key in merged:
+            merged[key] = [a + b for a, b in zip(merged[key], values)]
+        else:
+            merged[key] = values
+    conn.executemany(_UPSERT, [[profile_id, day] + values for (profile_id, day), values in merged.items()])
+
+
+# Đăng ký khi import để số liệu còn trong journal được phát lại ngay khi LogWriter khởi động
+LogWriter.register_sink('stats', _apply_deltas, prepare=ensure_stats_schema)
+
+
+class DailyStats:
+    """Bảng tổng hợp số liệu theo tài khoản và theo ngày.
+
+    record() ghi qua LogWriter (journal + ghi theo lô), số liệu xuất hiện trong
+    bảng sau tối đa một flush_interval.
+
+    Trang Accounts và Statistics chỉ đọc bảng này nên chi phí không phụ thuộc
+    vào kích thước replied_tweets/posted_tweets. Mỗi đường dẫn database có một
+    instance duy nhất.
+    """
+    _instances = {}
+    _lock = threading.Lock()
+
+    def __new__(cls, db_path='settings.db'):
+        with cls._lock:
+            instance = cls._instances.get(db_path)
+            if instance is None:
+                instance = super().__new__(cls)
+                instance.init_stats(db_path)
+                cls._instances[db_path] = instance
+            return instance
+
+    def init_stats(self, db_path):
+        self.db_path = db_path
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connection(self):
+        conn = DatabasePool(self.db_path).connection()
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    ensure_stats_schema(conn)
+                    self._schema_ready = True
+        return conn
+
+    @profiled("db.daily_stats_record")
+    def record(self, profile_id, day=None, **deltas):
+        """Cộng dồn số liệu cho profile trong ngày (mặc định hôm nay), không chờ ghi xuống database"""
+        unknown = set(deltas) - set(COUNTERS)
+        if unknown:
+            raise ValueError(f"Số liệu không hợp lệ: {', '.join(sorted(unknown))}")
+        day = day or datetime.now().strftime('%Y-%m-%d')
+        return LogWriter(self.db_path).submit('stats', [profile_id, day] + [int(deltas.get(name, 0)) for name in COUNTERS])
+
+    def totals(self, profile_id=None, since_day=None):
+        """Tổng số liệu của một profile (hoặc mọi profile) từ since_day tới nay"""
+        clauses = []
+        params = []
+        if profile_id:
+            clauses.append("profile_id = ?")
+            params.append(profile_id)
+        if since_day:
+            clauses.append("day >= ?")
+            params.append(since_day)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        row = self._connection().execute(f"SELECT {_SUMS} FROM account_daily_stats {where}", params).fetchone()
+        return dict(zip(COUNTERS, row))
+
+    def totals_by_account(self, since_day=None):
+        """Tổng số liệu của mọi profile trong một truy vấn: {profile_id: totals}"""
+        where = "WHERE day >= ?" if since_day else ""
+        params = [since_day] if since_day else []
+        rows = self._connection().execute(
+            f"SELECT profile_id, {_SUMS} FROM account_daily_stats {where} GROUP BY profile_id", params
+        ).fetchall()
+        return {row[0]: dict(zip(COUNTERS, row[1:])) for row in rows}
@@ -0,0 +1,73 @@
+import queue
+import threading
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from db_pool import DatabasePool
+
+
+class DataLoader(QThread):
+    """Chạy các truy vấn nạp dữ liệu cho GUI ở một thread riêng, trả kết quả qua signal.
+
+    request(key, fn, *args) xếp job theo key; nếu key đó đang chờ thì chỉ job mới nhất
+    được chạy. fn nhận đối tượng database của thread loader (tạo bằng db_factory ngay
+    trong thread này) làm tham số đầu. Kết quả được emit về thread GUI qua
+    loaded_signal(key, result) hoặc failed_signal(key, error).
+    """
+    loaded_signal = pyqtSignal(str, object)
+    failed_signal = pyqtSignal(str, str)
+
+    def __init__(self, db_factory, parent=None):
+        super().__init__(parent)
+        self.db_factory = db_factory
+        self._keys = queue.Queue()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._stopping = False
+
+    def request(self, key, fn, *args):
+        with self._pending_lock:
+            queued = key in self._pending
+            self._pending[key] = (fn, args)
+        if not queued:
+            self._keys.put(key)
+        if not self.isRunning() and not self._stopping:
+            self.start()
+
+    def is_pending(self, key):
+        with self._pending_lock:
+            return key in self._pending
+
+    def pending_count(self):
+        with self._pending_lock:
+            return len(self._pending)
+
+    def stop(self, timeout_ms=3000):
+        """Dừng thread sau job đang chạy; các job chưa chạy bị bỏ"""
+        self._stopping = True
+        self._keys.put(None)
+        return self.wait(timeout_ms)
+
+    def run(self):
+        db = None
+        try:
+            while not self._stopping:
+                key = self._keys.get()
+                if key is None:
+                    break
+                with self._pending_lock:
+                    job = self._pending.pop(key, None)
+                if job is None:
+                    continue
+                fn, args = job
+                try:
+                    if db is None:
+                        db = self.db_factory()
+                    result = fn(db, *args)
+                except Exception as e:
+                    self.failed_signal.emit(key, str(e))
+                else:
+                    self.loaded_signal.emit(key, result)
+        finally:
+            # Kết nối SQLite của pool gắn với thread này
+            DatabasePool().close_thread_connection()
@@ -0,0 +1,223 @@
+import os
+import sqlite3
+import threading
+import time
+
+# PRAGMA áp dụng cho mọi kết nối: WAL cho phép GUI đọc trong khi các writer
+# đang ghi, synchronous=NORMAL là đủ an toàn khi dùng WAL
+CONNECTION_PRAGMAS = [
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 134217728",
+]
+
+
+# Kết nối cho các thread không phải bot: GUI, LogWriter, DataLoader, retention, export,
+# status server. Mỗi bot chạy trên thread riêng nên cần thêm một kết nối.
+BASE_CONNECTIONS = 8
+
+
+def connections_for(accounts):
+    """Số kết nối cần khi `accounts` bot chạy song song"""
+    return BASE_CONNECTIONS + max(0, int(accounts))
+
+
+class PoolTimeout(Exception):
+    """Không lấy được kết nối trong thời gian chờ"""
+
+
+class DatabasePool:
+    """Pool kết nối SQLite dùng chung: mỗi thread một kết nối riêng, mở khi cần.
+
+    Mỗi đường dẫn database có một pool duy nhất. Số kết nối mở đồng thời bị
+    giới hạn bởi max_connections (mặc định DB_POOL_MAX_CONNECTIONS hoặc
+    connections_for(0)); size_for_accounts() nới giới hạn theo số bot. Kết nối
+    của các thread đã kết thúc được thu hồi.
+    """
+    _instances = {}
+    _lock = threading.Lock()
+
+    def __new__(cls, db_path='settings.db'):
+        with cls._lock:
+            instance = cls._instances.get(db_path)
+            if instance is None:
+                instance = super().__new__(cls)
+                instance.init_pool(db_path)
+                cls._instances[db_path] = instance
+            return instance
+
+    def init_pool(self, db_path, max_connections=None, timeout=10.0, busy_timeout_ms=5000):
+        if max_connections is None:
+            max_connections = int(os.environ.get('DB_POOL_MAX_CONNECTIONS', '0') or 0) or connections_for(0)
+        self.db_path = db_path
+        self.configured_max = max_connections
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._in_use = 0
+        self._slots = threading.Condition(threading.Lock())
+        self._state_lock = threading.Lock()
+        # Đổi journal_mode/auto_vacuum không chờ busy_timeout: các thread mở kết nối lần lượt
+        self._open_lock = threading.Lock()
+        self._connections = {}  # thread ident -> (thread, connection)
+        # Số liệu sử dụng
+        self.created = 0
+        self.closed = 0
+        self.close_errors = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.max_wait_time = 0.0
+
+    def _open(self):
+        # cached_statements: đủ chỗ cho các truy vấn có tên (queries.py) và truy vấn log;
+        # check_same_thread=False: kết nối của thread đã kết thúc được đóng từ thread khác
+        # (_reap_dead_threads, close_all). Mỗi kết nối vẫn chỉ được một thread sử dụng.
+        conn = sqlite3.connect(
+            self.db_path, timeout=self.busy_timeout_ms / 1000, cached_statements=256,
+            check_same_thread=False
+        )
+        with self._open_lock:
+            if conn.execute("PRAGMA page_count").fetchone()[0] == 0:
+                # auto_vacuum phải được đặt trước khi bật WAL trên database mới
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def set_max_connections(self, max_connections):
+        """Đổi giới hạn kết nối; giảm giới hạn không đóng các kết nối đang mở"""
+        with self._slots:
+            self.max_connections = max(1, int(max_connections))
+            self._slots.notify_all()
+
+    def size_for_accounts(self, accounts):
+        """Đủ kết nối cho `accounts` bot chạy song song, không thấp hơn giới hạn đã cấu hình"""
+        self.set_max_connections(max(self.configured_max, connections_for(accounts)))
+
+    def _acquire_slot(self, timeout=None):
+        with self._slots:
+            if timeout is None:
+                available = self._in_use < self.max_connections
+            else:
+                available = self._slots.wait_for(lambda: self._in_use < self.max_connections, timeout)
+            if available:
+                self._in_use += 1
+            return available
+
+    def _release_slot(self):
+        with self._slots:
+            self._in_use -= 1
+            self._slots.notify()
+
+    def _reap_dead_threads(self):
+        """Đóng kết nối của các thread đã kết thúc để trả lại slot"""
+        with self._state_lock:
+            dead = [ident for ident, (thread, _) in self._connections.items() if not thread.is_alive()]
+            entries = [self._connections.pop(ident) for ident in dead]
+        for _, conn in entries:
+            self._close(conn)
+        return len(entries)
+
+    def _close(self, conn):
+        """Đóng kết nối và trả lại slot; đóng lỗi thì giữ slot (kết nối có thể vẫn mở)"""
+        try:
+            conn.close()
+        except Exception as e:
+            self.close_errors += 1
+            print(f"DatabasePool: không đóng được kết nối tới {self.db_path}: {str(e)}")
+            return False
+        self.closed += 1
+        self._release_slot()
+        return True
+
+    def connection(self, timeout=None):
+        """Trả về kết nối của thread hiện tại, mở mới nếu chưa có"""
+        conn = getattr(self._local, 'conn', None)
+        self.checkouts += 1
+        if conn is not None:
+            return conn
+
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        acquired = self._acquire_slot()
+        if not acquired and self._reap_dead_threads():
+            acquired = self._acquire_slot()
+        if not acquired:
+            acquired = self._acquire_slot(timeout)
+        waited = time.monotonic() - started
+        self.wait_time_total += waited
+        self.max_wait_time = max(self.max_wait_time, waited)
+        if not acquired:
+            self.timeouts += 1
+            raise PoolTimeout(f"Không lấy được kết nối tới {self.db_path} sau {timeout}s")
+
+        try:
+            conn = self._open()
+        except Exception:
+            self._release_slot()
+            raise
+        self.created += 1
+        self._local.conn = conn
+        thread = threading.current_thread()
+        with self._state_lock:
+            self._connections[thread.ident] = (thread, conn)
+        return conn
+
+    # Giữ API cũ: get_connection/return_connection
+    def get_connection(self, timeout=None):
+        return self.connection(timeout)
+
+    def return_connection(self, conn):
+        """Kết nối thuộc về thread nên không cần trả lại; giữ để tương thích"""
+        pass
+
+    def close_thread_connection(self):
+        """Đóng kết nối của thread hiện tại (gọi trước khi một worker thread kết thúc)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._state_lock:
+            self._connections.pop(threading.get_ident(), None)
+        self._close(conn)
+
+    def close_all(self):
+        """Đóng mọi kết nối (khi thoát ứng dụng)"""
+        with self._state_lock:
+            entries = list(self._connections.values())
+            self._connections.clear()
+        for _, conn in entries:
+            self._close(conn)
+        self._local = threading.local()
+
+    def health_check(self):
+        """Chạy một truy vấn đơn giản trên kết nối của thread hiện tại"""
+        started = time.perf_counter()
+        try:
+            self.connection().execute("SELECT 1").fetchone()
+            return {'ok': True, 'latency_ms': (time.perf_counter() - started) * 1000}
+        except Exception as e:
+            return {'ok': False, 'error': str(e), 'latency_ms': (time.perf_counter() - started) * 1000}
+
+    def metrics(self):
+        """Số liệu sử dụng của pool"""
+        with self._state_lock:
+            threads = [thread.name for thread, _ in self._connections.values()]
+        return {
+            'db_path': self.db_path,
+            'open_connections': len(threads),
+            'max_connections': self.max_connections,
+            'threads': threads,
+            'created': self.created,
+            'closed': self.closed,
+            'close_errors': self.close_errors,
+            'checkouts': self.checkouts,
+            'timeouts': self.timeouts,
+            'wait_time_total_ms': self.wait_time_total * 1000,
+            'max_wait_time_ms': self.max_wait_time * 1000,
+        }
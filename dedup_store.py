@@ -0,0 +1,172 @@
+import bisect
+import math
+import re
+import sqlite3
+import threading
+import time
+from array import array
+
+from profiler import profiled
+from migrations import migrate
+from queries import QueryRepository
+
+_STATUS_ID = re.compile(r'/status/(\d+)')
+_MASK64 = (1 << 64) - 1
+_MAX_ID = (1 << 63) - 1  # lưu được trong array('q')
+
+
+def normalize_tweet_id(value):
+    """Chuẩn hóa tweet id (số, chuỗi số hoặc URL .../status/<id>) thành int64, None nếu không hợp lệ"""
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value if 0 <= value <= _MAX_ID else None
+    text = str(value).strip()
+    match = _STATUS_ID.search(text)
+    if match:
+        text = match.group(1)
+    else:
+        text = text.split('?')[0]
+    if not text.isdigit():
+        return None
+    number = int(text)
+    return number if number <= _MAX_ID else None
+
+
+def _mix64(value):
+    """splitmix64: băm một số nguyên 64-bit, đủ đều cho Bloom filter"""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+class BloomFilter:
+    """Bloom filter cho tweet id dạng int, kích thước cố định theo capacity và error_rate"""
+    def __init__(self, capacity=1000000, error_rate=0.01):
+        bits = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.size = max(8, bits)
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        # Double hashing: vị trí thứ i = h1 + i*h2 (mod size)
+        h1 = _mix64(value)
+        h2 = _mix64(h1) | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def add(self, value):
+        bits = self.bits
+        for position in self._positions(value):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        bits = self.bits
+        for position in self._positions(value):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class ReplyDedupStore:
+    """Kiểm tra tweet đã reply chưa mà không tải toàn bộ lịch sử vào bộ nhớ.
+
+    Thứ tự kiểm tra: các id vừa reply trong phiên (array int64 đã sắp xếp, có giới hạn)
+    -> Bloom filter (nếu đã đồng bộ xong) -> truy vấn có index trên replied_tweets.
+    Bloom filter được đồng bộ dần từ database (theo id tăng dần), mỗi lần kiểm tra chỉ
+    đọc tối đa sync_batch dòng, nên khởi tạo không tốn chi phí dù lịch sử lớn tới đâu.
+    """
+    def __init__(self, profile_id, db_path='settings.db', use_bloom=True,
+                 bloom_capacity=1000000, max_recent=50000, sync_batch=2000, sync_interval=60):
+        self.profile_id = profile_id
+        self.db_path = db_path
+        self.queries = QueryRepository(db_path)
+        self.max_recent = max_recent
+        self.sync_batch = sync_batch
+        self.sync_interval = sync_interval
+        self.bloom = BloomFilter(bloom_capacity) if use_bloom else None
+        self._recent = array('q')
+        self._synced_rowid = 0
+        self._bloom_ready = False
+        self._last_sync = 0.0
+        self._index_checked = False
+        self._lock = threading.Lock()
+        # Số liệu
+        self.db_lookups = 0
+        self.bloom_rejections = 0
+        self.bloom_false_positives = 0
+
+    def _ensure_schema(self):
+        if not self._index_checked:
+            # Index (profile_id, id, tweet_id) để đồng bộ theo id mà không sắp xếp cả lịch sử
+            migrate(self.db_path)
+            self._index_checked = True
+
+    def _sync_bloom(self):
+        """Nạp thêm tối đa sync_batch dòng mới từ database vào Bloom filter"""
+        self._ensure_schema()
+        rows = self.queries.fetch_all(
+            'replied_tweet_ids_since', (self.profile_id, self._synced_rowid, self.sync_batch)
+        )
+        for row in rows:
+            tweet_id = normalize_tweet_id(row['tweet_id'])
+            if tweet_id is not None:
+                self.bloom.add(tweet_id)
+            self._synced_rowid = row['id']
+        if len(rows) < self.sync_batch:
+            self._bloom_ready = True
+        self._last_sync = time.monotonic()
+
+    def _in_recent(self, tweet_id):
+        index = bisect.bisect_left(self._recent, tweet_id)
+        return index < len(self._recent) and self._recent[index] == tweet_id
+
+    @profiled("dedup.contains")
+    def __contains__(self, value):
+        tweet_id = normalize_tweet_id(value)
+        if tweet_id is None:
+            return False
+        with self._lock:
+            if self._in_recent(tweet_id):
+                return True
+            if self.bloom is not None:
+                # Chưa đồng bộ xong, hoặc đã lâu chưa lấy các dòng mới do nơi khác ghi
+                if not self._bloom_ready or time.monotonic() - self._last_sync > self.sync_interval:
+                    self._sync_bloom()
+                if self._bloom_ready and tweet_id not in self.bloom:
+                    self.bloom_rejections += 1
+                    return False
+            self.db_lookups += 1
+            found = self.queries.exists('replied_tweet_exists', (self.profile_id, str(tweet_id)))
+            if not found and self._bloom_ready:
+                self.bloom_false_positives += 1
+            return found
+
+    def add(self, value, username='', reply_text=None):
+        """Ghi nhận một tweet vừa reply: lưu vào replied_tweets và vào các cấu trúc trong bộ nhớ"""
+        tweet_id = normalize_tweet_id(value)
+        if tweet_id is None:
+            return
+        with self._lock:
+            self._ensure_schema()
+            try:
+                self.queries.execute('insert_replied_tweet',
+                                     (self.profile_id, str(tweet_id), username or '', reply_text))
+            except sqlite3.Error as e:
+                # Reply đã gửi: vẫn nhớ trong phiên dù không lưu được
+                print(f"ReplyDedupStore: không lưu được tweet {tweet_id}: {str(e)}")
+            if not self._in_recent(tweet_id):
+                bisect.insort(self._recent, tweet_id)
+            if len(self._recent) > self.max_recent:
+                # Id tăng theo thời gian: bỏ nửa cũ nhất, chúng đã có trong database/Bloom
+                del self._recent[:len(self._recent) // 2]
+            if self.bloom is not None:
+                self.bloom.add(tweet_id)
+
+    def memory_bytes(self):
+        """Bộ nhớ ước tính của các cấu trúc trong store"""
+        bloom_bytes = len(self.bloom.bits) if self.bloom is not None else 0
+        return bloom_bytes + self._recent.itemsize * len(self._recent)
@@ -0,0 +1,164 @@
+"""Chạy bot không có giao diện, trạng thái xem qua status endpoint chỉ đọc.
+
+    python headless.py --account <profile_id> [--account ...]   # các tài khoản chỉ định
+    python headless.py                                           # mọi tài khoản trong database
+    python headless.py --profile                                 # bật profiler (như GUI)
+    python headless.py --status-port 8765
+    python headless.py --status-socket /tmp/x2modern.sock
+
+Xem trạng thái:
+
+    curl http://127.0.0.1:8765/status
+    curl http://127.0.0.1:8765/metrics
+    curl --unix-socket /tmp/x2modern.sock http://localhost/status
+"""
+import argparse
+import signal
+import threading
+import time
+
+import browser_provider
+from database import DatabaseManager
+from db_pool import DatabasePool
+from log_pipeline import LogPipeline, ConsoleHandler, DatabaseHandler
+from log_writer import LogWriter
+from migrations import startup_check
+from resource_guard import ResourceGuard, THREAD
+from status_server import DEFAULT_PORT, StatusServer
+from twitter_bot import TwitterBot
+
+
+class HeadlessRunner:
+    """Chạy mỗi bot trong một thread, không tạo QApplication hay cửa sổ nào"""
+    def __init__(self, profile_ids=None):
+        self.profile_ids = list(profile_ids or [])
+        self.bots = {}     # profile_id -> TwitterBot
+        self.threads = {}  # profile_id -> Thread
+        self.started_at = {}
+        self.stopping = threading.Event()
+        self.logger = LogPipeline("System", handlers=[ConsoleHandler(), DatabaseHandler()])
+
+    def accounts(self, db):
+        if self.profile_ids:
+            accounts = []
+            for profile_id in self.profile_ids:
+                account = db.get_account(profile_id)
+                if account:
+                    accounts.append(account)
+                else:
+                    self.logger.error(f"Không tìm thấy thông tin tài khoản {profile_id}")
+            return accounts
+        return db.get_all_accounts() or []
+
+    def start(self):
+        db = DatabaseManager()
+        accounts = self.accounts(db)
+        # Mỗi bot chạy trên thread riêng với một kết nối database riêng
+        DatabasePool().size_for_accounts(len(accounts))
+        for account in accounts:
+            profile_id = account.get('profile_id', '')
+            credentials = {
+                'username': account.get('username', ''),
+                'profile_id': profile_id,
+                'use_gemini': account.get('use_gemini', True),
+                'gemini_key': account.get('gemini_key', ''),
+                'chatgpt_key': account.get('chatgpt_key', '')
+            }
+            try:
+                bot = TwitterBot(credentials)
+            except Exception as e:
+                self.logger.error(f"Không thể khởi tạo bot {profile_id}: {str(e)}")
+                continue
+            thread = threading.Thread(target=self.run_bot, args=(bot,), name=f"Bot-{profile_id}", daemon=True)
+            # bot.cleanup() join thread này trước khi giải phóng cache của bot
+            ResourceGuard().track(bot.resource_owner, THREAD, 'worker', thread)
+            self.bots[profile_id] = bot
+            self.threads[profile_id] = thread
+            self.started_at[profile_id] = time.time()
+            thread.start()
+        self.logger.info(f"Chế độ headless: đã khởi động {len(self.bots)} bot")
+        return len(self.bots)
+
+    def run_bot(self, bot):
+        """Thân thread của một bot"""
+        try:
+            bot.start()
+        finally:
+            # Kết nối database của thread bot chỉ đóng được đúng trên thread này
+            DatabasePool().close_thread_connection()
+
+    def stop(self, timeout=10.0):
+        """Dừng mọi bot; trả về {profile_id: tài nguyên chưa giải phóng} cho các bot dừng không sạch"""
+        self.stopping.set()
+        # Đặt cờ dừng cho mọi bot trước để chúng dừng song song, chung một hạn chờ
+        for bot in self.bots.values():
+            bot.request_stop()
+        deadline = time.monotonic() + timeout
+        leaks = {}
+        for profile_id, bot in self.bots.items():
+            leftovers = bot.cleanup(max(0.0, deadline - time.monotonic()))
+            if leftovers:
+                leaks[profile_id] = leftovers
+                self.logger.error(f"Bot {profile_id} chưa dừng hẳn: {leftovers}")
+        return leaks
+
+    def status(self):
+        """Trạng thái từng bot cho status endpoint"""
+        now = time.time()
+        return [
+            {
+                'profile_id': profile_id,
+                'username': bot.username,
+                'mode_id': bot.mode_id,
+                'running': self.threads[profile_id].is_alive(),
+                'paused': bot.is_paused,
+                'uptime_seconds': round(now - self.started_at[profile_id], 1),
+            }
+            for profile_id, bot in self.bots.items()
+        ]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Chạy bot không có giao diện với status endpoint chỉ đọc")
+    parser.add_argument('--account', action='append', dest='profiles', metavar='PROFILE_ID',
+                        help="Tài khoản cần chạy (lặp lại cho nhiều tài khoản); mặc định mọi tài khoản")
+    parser.add_argument('--status-port', type=int, default=DEFAULT_PORT, help="Cổng trên 127.0.0.1")
+    parser.add_argument('--status-socket', help="Dùng Unix socket thay cho cổng TCP")
+    # Profiler đọc cờ này từ sys.argv (profiler.profiling_requested); khai báo để argparse chấp nhận
+    parser.add_argument('--profile', action='store_true', help="Bật profiler từ đầu (xem /metrics)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if not browser_provider.available():
+        print("Chưa cài selenium, không thể chạy bot. Cài bằng: pip install selenium")
+        return 1
+
+    startup_check()
+    LogWriter().start()  # Phát lại log/số liệu còn trong journal của lần chạy trước
+    ResourceGuard().start()
+    runner = HeadlessRunner(args.profiles)
+    server = StatusServer(port=args.status_port, unix_socket=args.status_socket)
+    server.add_source('bots', runner.status)
+    print(f"Status endpoint: {server.start()}")
+
+    # SIGINT/SIGTERM chỉ đặt cờ; việc dừng chạy ở thread chính
+    signal.signal(signal.SIGINT, lambda *_: runner.stopping.set())
+    signal.signal(signal.SIGTERM, lambda *_: runner.stopping.set())
+    try:
+        runner.start()
+        while not runner.stopping.wait(1.0):
+            pass
+    finally:
+        runner.stop()
+        ResourceGuard().stop()
+        server.stop()
+        LogWriter().close()
+        DatabasePool().close_all()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
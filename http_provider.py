@@ -0,0 +1,13 @@
+# requests và BeautifulSoup, chỉ được import khi cần gọi HTTP/parse HTML
+from lazy_import import is_available, provider
+
+_EXPORTS = {
+    'requests': ('requests', None, 'requests'),
+    'BeautifulSoup': ('bs4', 'BeautifulSoup', 'beautifulsoup4'),
+}
+
+__getattr__ = provider(globals(), _EXPORTS)
+
+
+def available():
+    return is_available('requests')
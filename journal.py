@@ -0,0 +1,144 @@
+import json
+import os
+import threading
+
+SEGMENT_PREFIX = 'segment-'
+SEGMENT_SUFFIX = '.jsonl'
+
+# Encoder dùng lại cho mọi bản ghi (json.dumps với tham số riêng tạo encoder mới mỗi lần gọi)
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+# O_APPEND: mỗi os.write ghi trọn một dòng vào cuối file; O_BINARY: không đổi \n trên Windows
+_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, 'O_BINARY', 0)
+
+
+def journal_dir_for(db_path):
+    """Thư mục journal cạnh database (không trùng tên với file -journal/-wal của SQLite)"""
+    return f"{db_path}.pending"
+
+
+class Journal:
+    """Journal append-only của các bản ghi chưa được ghi xuống database.
+
+    Mỗi bản ghi là một dòng JSON [seq, kind, payload]. append() ghi ngay xuống
+    file bằng một lệnh write (không mất khi process bị kill), sync() fsync một lần cho cả lô
+    (không mất khi mất điện). Khi file vượt segment_bytes, segment được đóng và một
+    segment mới được mở; checkpoint(seq) xóa các segment đã được ghi hết vào database.
+    Một thư mục journal chỉ dành cho một process ghi.
+    """
+    def __init__(self, directory, segment_bytes=4 * 1024 * 1024):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.last_seq = 0
+        self.synced_seq = 0
+        self._lock = threading.Lock()
+        self._sealed = []  # [(đường dẫn, seq cuối)] các segment đã đóng, cũ nhất trước
+        self._segment_last = {}  # seq cuối của các segment cũ, biết được khi read()
+        self._fd = None
+        self._path = None
+        self._number = 0
+        self._size = 0
+
+    def _segments(self):
+        """[(số thứ tự, đường dẫn)] của các segment trong thư mục, cũ nhất trước"""
+        if not os.path.isdir(self.directory):
+            return []
+        segments = []
+        for name in os.listdir(self.directory):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                number = name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]
+                if number.isdigit():
+                    segments.append((int(number), os.path.join(self.directory, name)))
+        return sorted(segments)
+
+    def read(self, after_seq=0):
+        """Đọc các bản ghi có seq > after_seq: [(seq, kind, payload)] theo thứ tự ghi.
+
+        Dòng cuối bị ghi dở (process chết giữa chừng) được bỏ qua.
+        """
+        records = []
+        for _, path in self._segments():
+            segment_last = 0
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        seq, kind, payload = json.loads(line)
+                    except ValueError:
+                        continue
+                    segment_last = max(segment_last, seq)
+                    if seq > after_seq:
+                        records.append((seq, kind, payload))
+            self._segment_last[path] = segment_last
+            self.last_seq = max(self.last_seq, segment_last)
+        return records
+
+    def open(self, next_seq):
+        """Mở segment mới để ghi; seq tiếp theo không nhỏ hơn next_seq"""
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            segments = self._segments()
+            # Segment chưa được read() không bao giờ bị xóa
+            self._sealed = [(path, self._segment_last.get(path, float('inf'))) for _, path in segments]
+            self._number = segments[-1][0] if segments else 0
+            self.last_seq = max(self.last_seq, next_seq - 1)
+            self.synced_seq = self.last_seq
+            self._open_segment()
+
+    def _open_segment(self):
+        self._number += 1
+        self._path = os.path.join(self.directory, f"{SEGMENT_PREFIX}{self._number:06d}{SEGMENT_SUFFIX}")
+        self._fd = os.open(self._path, _OPEN_FLAGS, 0o600)
+        self._size = 0
+
+    def append(self, kind, payload):
+        """Ghi một bản ghi (chưa fsync), trả về seq của nó"""
+        with self._lock:
+            if self._fd is None:
+                raise RuntimeError("Journal chưa được mở")
+            self.last_seq += 1
+            data = (_encode([self.last_seq, kind, payload]) + '\n').encode('utf-8')
+            # Đưa xuống OS ngay: process bị kill vẫn không mất bản ghi
+            os.write(self._fd, data)
+            self._size += len(data)
+            if self._size >= self.segment_bytes:
+                os.fsync(self._fd)
+                self.synced_seq = self.last_seq
+                os.close(self._fd)
+                self._sealed.append((self._path, self.last_seq))
+                self._open_segment()
+            return self.last_seq
+
+    def sync(self):
+        """fsync các bản ghi đã append (một lần cho cả lô)"""
+        with self._lock:
+            if self._fd is None or self.synced_seq >= self.last_seq:
+                return
+            target = self.last_seq
+            # fsync ngoài lock để không chặn append(); fd nhân bản vẫn hợp lệ nếu segment bị đóng
+            fd = os.dup(self._fd)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        with self._lock:
+            self.synced_seq = max(self.synced_seq, target)
+
+    def checkpoint(self, committed_seq):
+        """Mọi bản ghi có seq <= committed_seq đã nằm trong database: xóa phần journal không còn cần"""
+        with self._lock:
+            remaining = []
+            for path, last_seq in self._sealed:
+                if last_seq <= committed_seq:
+                    os.remove(path)
+                else:
+                    remaining.append((path, last_seq))
+            self._sealed = remaining
+            if self._fd is not None and self._size and committed_seq >= self.last_seq:
+                os.ftruncate(self._fd, 0)
+                self._size = 0
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                os.fsync(self._fd)
+                os.close(self._fd)
+                self._fd = None
@@ -0,0 +1,76 @@
+import bisect
+import threading
+from contextlib import nullcontext
+
+# Biên trên của các bucket (mili giây), tăng theo cấp số ~2
+BUCKET_BOUNDS_MS = [
+    0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50,
+    100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000,
+]
+
+
+class LatencyHistogram:
+    """Histogram thời gian chạy với bucket cố định: bộ nhớ không đổi dù ghi bao nhiêu mẫu.
+
+    Percentile được ước lượng bằng biên trên của bucket chứa mẫu thứ p.
+    locked=False bỏ lock khi ghi, dùng cho histogram chỉ một thread ghi vào.
+    """
+    def __init__(self, bounds_ms=None, locked=True):
+        self.bounds_ms = list(bounds_ms or BUCKET_BOUNDS_MS)
+        self.buckets = [0] * (len(self.bounds_ms) + 1)  # bucket cuối: lớn hơn mọi biên
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = 0.0
+        self._lock = threading.Lock() if locked else nullcontext()
+
+    def record(self, seconds):
+        """Ghi một mẫu (tính bằng giây, như time.perf_counter)"""
+        ms = seconds * 1000
+        index = bisect.bisect_left(self.bounds_ms, ms)
+        with self._lock:
+            self.buckets[index] += 1
+            self.count += 1
+            self.total_ms += ms
+            self.max_ms = max(self.max_ms, ms)
+            self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+
+    def merge(self, other):
+        """Cộng dồn một histogram khác có cùng biên bucket"""
+        with self._lock:
+            for i, value in enumerate(other.buckets):
+                self.buckets[i] += value
+            self.count += other.count
+            self.total_ms += other.total_ms
+            self.max_ms = max(self.max_ms, other.max_ms)
+            if other.min_ms is not None:
+                self.min_ms = other.min_ms if self.min_ms is None else min(self.min_ms, other.min_ms)
+
+    def percentile(self, p):
+        """Ước lượng percentile p (0-100) theo mili giây"""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(round(p / 100 * self.count)))
+        seen = 0
+        for i, value in enumerate(self.buckets):
+            seen += value
+            if seen >= rank:
+                return min(self.bounds_ms[i], self.max_ms) if i < len(self.bounds_ms) else self.max_ms
+        return self.max_ms
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.count if self.count else 0.0
+
+    def snapshot(self):
+        """Tóm tắt dạng dict (dùng cho GUI/export)"""
+        return {
+            'count': self.count,
+            'total_ms': self.total_ms,
+            'mean_ms': self.mean_ms,
+            'min_ms': self.min_ms or 0.0,
+            'max_ms': self.max_ms,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+        }
@@ -0,0 +1,60 @@
+import importlib
+import importlib.util
+import threading
+import time
+
+
+class MissingDependencyError(ImportError):
+    """Thư viện tùy chọn chưa được cài đặt"""
+    def __init__(self, module_name, package):
+        super().__init__(f"Thiếu thư viện '{package}' (cần cho {module_name}). Cài bằng: pip install {package}")
+        self.module_name = module_name
+        self.package = package
+
+
+# Thời gian import (ms) của các module đã được nạp qua lazy_import
+IMPORT_TIMES = {}
+_import_lock = threading.Lock()
+
+
+def is_available(module_name):
+    """Kiểm tra module có cài đặt hay không mà không import nó"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def import_optional(module_name, package=None):
+    """Import module khi cần lần đầu, ghi lại thời gian import.
+
+    Thiếu thư viện thì báo MissingDependencyError kèm tên package cần cài.
+    """
+    with _import_lock:
+        started = time.perf_counter()
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            raise MissingDependencyError(module_name, package or module_name.split('.')[0]) from e
+        if module_name not in IMPORT_TIMES:
+            IMPORT_TIMES[module_name] = (time.perf_counter() - started) * 1000
+        return module
+
+
+def provider(module_globals, exports):
+    """Tạo __getattr__ cho module provider (PEP 562).
+
+    exports: {tên: (module, thuộc tính hoặc None, package pip)}. Thuộc tính được import ở lần truy cập
+    đầu tiên rồi lưu vào globals của provider nên các lần sau không qua __getattr__ nữa.
+    """
+    def __getattr__(name):
+        if name not in exports:
+            raise AttributeError(f"module {module_globals['__name__']!r} has no attribute {name!r}")
+        module_name, attribute, package = exports[name]
+        value = import_optional(module_name, package)
+        if attribute is not None:
+            value = getattr(value, attribute)
+        module_globals[name] = value
+        return value
+
+    return __getattr__
@@ -0,0 +1,108 @@
+import csv
+import itertools
+import json
+import os
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from log_retention import LogRetention
+from log_store import LogStore
+
+EXPORT_HEADERS = ["id", "timestamp", "level", "module", "account", "message", "details"]
+
+
+def export_format(file_path):
+    """Chọn định dạng theo phần mở rộng: csv, jsonl (cho .json/.jsonl) hoặc txt"""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.json', '.jsonl'):
+        return 'jsonl'
+    return 'txt'
+
+
+def stream_export(store, file_path, filters=None, page_size=1000, progress=None, is_cancelled=None,
+                  archive=None):
+    """Ghi log ra file theo từng trang, không bao giờ giữ toàn bộ kết quả trong bộ nhớ.
+
+    archive (LogRetention, tùy chọn): ghi thêm các log đã archive sau log trong bảng logs.
+    Trả về số dòng đã ghi, hoặc None nếu bị hủy (file dở dang sẽ bị xóa).
+    """
+    fmt = export_format(file_path)
+    written = 0
+    cancelled = False
+    with open(file_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f) if fmt == 'csv' else None
+        if writer:
+            writer.writerow(EXPORT_HEADERS)
+        pages = store.iter_filtered(filters, page_size=page_size)
+        if archive is not None:
+            pages = itertools.chain(pages, archive.iter_archive_pages(filters, page_size=page_size))
+        for page in pages:
+            if is_cancelled and is_cancelled():
+                cancelled = True
+                break
+            if fmt == 'csv':
+                writer.writerows(page)
+            elif fmt == 'jsonl':
+                f.writelines(
+                    json.dumps(dict(zip(EXPORT_HEADERS, row)), ensure_ascii=False) + '\n'
+                    for row in page
+                )
+            else:
+                f.writelines(
+                    f"{row[1]} [{row[2]}] {row[3]}{' @' + row[4] if row[4] else ''}: {row[5]}\n"
+                    for row in page
+                )
+            written += len(page)
+            if progress:
+                progress(written)
+
+    if cancelled:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+        return None
+    return written
+
+
+class LogExportWorker(QThread):
+    """Export log ở thread riêng, báo tiến trình qua signal và hỗ trợ hủy"""
+    progress_signal = pyqtSignal(int, int)   # số dòng đã ghi, tổng số dòng
+    finished_signal = pyqtSignal(str, int)   # đường dẫn file, số dòng
+    cancelled_signal = pyqtSignal()
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, file_path, filters=None, db_path='settings.db', parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.filters = filters
+        self.db_path = db_path
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        # Kết nối SQLite phải được tạo trong chính thread này
+        store = LogStore(self.db_path)
+        archive = LogRetention(self.db_path)
+        try:
+            # Số dòng đã archive chỉ lọc theo level nên tổng là giới hạn trên
+            total = store.count(self.filters) + archive.archived_count((self.filters or {}).get('level'))
+            self.progress_signal.emit(0, total)
+            written = stream_export(
+                store, self.file_path, self.filters,
+                progress=lambda count: self.progress_signal.emit(count, total),
+                is_cancelled=lambda: self._cancelled,
+                archive=archive
+            )
+            if written is None:
+                self.cancelled_signal.emit()
+            else:
+                self.finished_signal.emit(self.file_path, written)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+        finally:
+            store.close()
@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from log_writer import LogWriter
+from profiler import profiled
+
+# Mức log, SUCCESS nằm giữa INFO và WARNING như trên trang Log
+LEVELS = {
+    'DEBUG': 10,
+    'INFO': 20,
+    'SUCCESS': 25,
+    'WARNING': 30,
+    'ERROR': 40,
+}
+
+
+# Số bản ghi theo level của mọi LogPipeline trong process (cho status endpoint)
+_level_counts = Counter()
+_level_counts_lock = threading.Lock()
+
+
+def level_counts():
+    """{level: số bản ghi} kể từ khi process khởi động"""
+    with _level_counts_lock:
+        return dict(_level_counts)
+
+
+def level_value(level):
+    """Chuyển tên level (hoặc số) thành giá trị số"""
+    if isinstance(level, int):
+        return level
+    return LEVELS.get(str(level).upper(), LEVELS['INFO'])
+
+
+class LogRecord:
+    """Một bản ghi log có cấu trúc, được tạo đúng một lần cho mỗi message"""
+    __slots__ = ('level', 'levelno', 'module', 'account', 'message', 'details', 'created')
+
+    def __init__(self, level, module, account, message, details=None):
+        self.level = level
+        self.levelno = level_value(level)
+        self.module = module
+        self.account = account
+        self.message = message
+        self.details = details
+        self.created = time.time()
+
+    @property
+    def timestamp(self):
+        return datetime.fromtimestamp(self.created).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class LogHandler:
+    """Handler cơ sở: lọc theo level rồi gọi emit()"""
+    def __init__(self, level='DEBUG'):
+        self.level = level_value(level)
+
+    def handle(self, record):
+        if record.levelno >= self.level:
+            try:
+                self.emit(record)
+            except Exception as e:
+                print(f"{type(self).__name__}: lỗi khi xử lý log: {str(e)}")
+
+    def emit(self, record):
+        raise NotImplementedError
+
+
+class ConsoleHandler(LogHandler):
+    """In log ra console"""
+    def emit(self, record):
+        if record.levelno >= LEVELS['ERROR']:
+            print(f"ERROR: {record.message}")
+        else:
+            print(record.message)
+
+
+class DatabaseHandler(LogHandler):
+    """Đưa log vào LogWriter để ghi xuống database theo lô"""
+    def emit(self, record):
+        # Thời điểm tạo record, không phải lúc handler chạy
+        LogWriter().write(record.level, record.module, record.account, record.message, record.details,
+                          created=record.created)
+
+
+class SignalHandler(LogHandler):
+    """Phát log lên GUI qua signal (log_signal cho log thường, error_signal cho lỗi)"""
+    def __init__(self, log_signal, error_signal=None, level='DEBUG'):
+        super().__init__(level)
+        self.log_signal = log_signal
+        self.error_signal = error_signal
+
+    def emit(self, record):
+        if self.error_signal is not None and record.levelno >= LEVELS['ERROR']:
+            self.error_signal.emit(record.message)
+        else:
+            self.log_signal.emit(record.message)
+
+
+class LogPipeline:
+    """Pipeline log duy nhất: một LogRecord được phân phát tới từng handler đúng một lần"""
+    def __init__(self, module, handlers=None, level=None):
+        self.module = module
+        self.handlers = list(handlers or [])
+        self.level = level_value(level or os.getenv('LOG_LEVEL', 'INFO'))
+
+    def add_handler(self, handler):
+        self.handlers.append(handler)
+
+    def is_enabled_for(self, level):
+        return level_value(level) >= self.level
+
+    @profiled("log.pipeline")
+    def log(self, level, message, account=None, details=None):
+        # Lọc level trước khi tạo record
+        if level_value(level) < self.level:
+            return None
+        record = LogRecord(str(level).upper(), self.module, account, message, details)
+        with _level_counts_lock:
+            _level_counts[record.level] += 1
+        for handler in self.handlers:
+            handler.handle(record)
+        return record
+
+    def info(self, message, account=None, details=None):
+        return self.log('INFO', message, account, details)
+
+    def error(self, message, account=None, details=None):
+        return self.log('ERROR', message, account, details)
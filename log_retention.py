@@ -0,0 +1,286 @@
+import json
+import os
+import sys
+import threading
+import zlib
+from datetime import datetime, timedelta
+
+from db_pool import DatabasePool
+from log_store import DATE_RANGES, LOG_COLUMNS, MODULE_ALIASES, ensure_log_schema
+
+# Chính sách giữ log theo level: tuổi tối đa (ngày) và số dòng tối đa trong bảng logs.
+# Log vượt quá được chuyển sang các segment nén trong log_archive.
+DEFAULT_POLICIES = {
+    'DEBUG': {'max_age_days': 3, 'max_rows': 200000},
+    'INFO': {'max_age_days': 30, 'max_rows': 2000000},
+    'SUCCESS': {'max_age_days': 30, 'max_rows': 500000},
+    'WARNING': {'max_age_days': 90, 'max_rows': 500000},
+    'ERROR': {'max_age_days': 180, 'max_rows': 500000},
+}
+
+ARCHIVE_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS log_archive (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        level TEXT NOT NULL,
+        first_id INTEGER NOT NULL,
+        last_id INTEGER NOT NULL,
+        start_ts TEXT NOT NULL,
+        end_ts TEXT NOT NULL,
+        row_count INTEGER NOT NULL,
+        data BLOB NOT NULL,
+        archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_log_archive_level_ts ON log_archive (level, start_ts, end_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_log_archive_ts ON log_archive (start_ts, end_ts)",
+]
+
+
+def retention_requested(argv=None):
+    """Dọn log chỉ chạy khi bật bằng --log-retention hoặc biến môi trường LOG_RETENTION=1"""
+    argv = sys.argv if argv is None else argv
+    return '--log-retention' in argv or os.environ.get('LOG_RETENTION') == '1'
+
+
+def policies_from_env(value=None):
+    """DEFAULT_POLICIES với tuổi tối đa theo level ghi đè bằng LOG_RETENTION_DAYS.
+
+    Ví dụ LOG_RETENTION_DAYS="INFO=90,DEBUG=7"; 0 nghĩa là không archive theo tuổi.
+    """
+    value = os.environ.get('LOG_RETENTION_DAYS', '') if value is None else value
+    policies = {level: dict(policy) for level, policy in DEFAULT_POLICIES.items()}
+    for item in value.split(','):
+        level, _, days = item.partition('=')
+        level = level.strip().upper()
+        if not level:
+            continue
+        try:
+            policies.setdefault(level, {})['max_age_days'] = int(days)
+        except ValueError:
+            print(f"LogRetention: bỏ qua cấu hình không hợp lệ '{item}' trong LOG_RETENTION_DAYS")
+    return policies
+
+
+def _compress_rows(rows):
+    payload = '\n'.join(json.dumps(row, ensure_ascii=False) for row in rows)
+    return zlib.compress(payload.encode('utf-8'), 6)
+
+
+def _decompress_rows(data):
+    payload = zlib.decompress(data).decode('utf-8')
+    return [tuple(json.loads(line)) for line in payload.split('\n') if line]
+
+
+class LogRetention:
+    """Dọn bảng logs ở background: chuyển log cũ sang segment nén rồi incremental VACUUM.
+
+    Mỗi lô archive + xóa là một transaction ngắn, giữa các lô có nghỉ để
+    LogWriter và các truy vấn của GUI không bị chặn lâu. Mặc định tắt (xem
+    retention_requested); log đã archive vẫn được export cùng log trong bảng logs.
+    Mỗi đường dẫn database có một instance duy nhất.
+    """
+    _instances = {}
+    _lock = threading.Lock()
+
+    def __new__(cls, db_path='settings.db', policies=None, interval=600, batch_size=5000):
+        with cls._lock:
+            instance = cls._instances.get(db_path)
+            if instance is None:
+                instance = super().__new__(cls)
+                instance.init_retention(db_path, policies, interval, batch_size)
+                cls._instances[db_path] = instance
+            return instance
+
+    def init_retention(self, db_path, policies, interval, batch_size):
+        self.db_path = db_path
+        self.policies = policies or policies_from_env()
+        self.interval = interval
+        self.batch_size = batch_size
+        self.pause_between_batches = 0.05
+        self.vacuum_pages = 500
+        self.last_run = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Chạy dọn dẹp định kỳ trên thread riêng"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="LogRetention", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _connect(self):
+        conn = DatabasePool(self.db_path).connection()
+        ensure_log_schema(conn)
+        for statement in ARCHIVE_SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+        return conn
+
+    def _run(self):
+        # Đợi một chút sau khi khởi động để không tranh tài nguyên với lúc mở app
+        try:
+            if self._stop.wait(30):
+                return
+            try:
+                self.enable_incremental_vacuum()
+            except Exception as e:
+                print(f"LogRetention: không chuyển được sang auto_vacuum=INCREMENTAL: {str(e)}")
+            while not self._stop.is_set():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    print(f"LogRetention: lỗi khi dọn log: {str(e)}")
+                if self._stop.wait(self.interval):
+                    return
+        finally:
+            DatabasePool(self.db_path).close_thread_connection()
+
+    def run_once(self):
+        """Áp dụng mọi chính sách một lần. Trả về số dòng đã archive theo level"""
+        conn = self._connect()
+        archived = {}
+        for level, policy in self.policies.items():
+            if self._stop.is_set():
+                break
+            archived[level] = self._apply_policy(conn, level, policy)
+        self._incremental_vacuum(conn)
+        self.last_run = datetime.now()
+        return archived
+
+    def _apply_policy(self, conn, level, policy):
+        total = 0
+        max_age_days = policy.get('max_age_days')
+        if max_age_days:
+            cutoff = (datetime.now() - timedelta(days=max_age_days)).strftime('%Y-%m-%d %H:%M:%S')
+            while not self._stop.is_set():
+                rows = conn.execute(
+                    f"""SELECT {LOG_COLUMNS} FROM logs WHERE level = ? AND timestamp < ?
+                        ORDER BY timestamp, id LIMIT ?""",
+                    (level, cutoff, self.batch_size)
+                ).fetchall()
+                if not rows:
+                    break
+                total += self._archive_batch(conn, level, rows)
+
+        max_rows = policy.get('max_rows')
+        if max_rows:
+            excess = conn.execute("SELECT COUNT(*) FROM logs WHERE level = ?", (level,)).fetchone()[0] - max_rows
+            while excess > 0 and not self._stop.is_set():
+                rows = conn.execute(
+                    f"""SELECT {LOG_COLUMNS} FROM logs WHERE level = ?
+                        ORDER BY timestamp, id LIMIT ?""",
+                    (level, min(excess, self.batch_size))
+                ).fetchall()
+                if not rows:
+                    break
+                excess -= self._archive_batch(conn, level, rows)
+                total += len(rows)
+        return total
+
+    def _archive_batch(self, conn, level, rows):
+        """Ghi một segment nén và xóa các dòng tương ứng trong cùng một transaction"""
+        ids = [row[0] for row in rows]
+        with conn:
+            conn.execute(
+                """INSERT INTO log_archive (level, first_id, last_id, start_ts, end_ts, row_count, data)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (level, min(ids), max(ids), rows[0][1], rows[-1][1], len(rows), _compress_rows(rows))
+            )
+            conn.executemany("DELETE FROM logs WHERE id = ?", ((row_id,) for row_id in ids))
+        # Nhường database cho writer giữa các lô
+        self._stop.wait(self.pause_between_batches)
+        return len(rows)
+
+    def _incremental_vacuum(self, conn):
+        """Trả lại các trang trống cho hệ điều hành theo từng phần nhỏ"""
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            # Database cũ chưa được enable_incremental_vacuum chuyển đổi
+            return
+        while not self._stop.is_set():
+            free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if free_pages == 0:
+                break
+            conn.execute(f"PRAGMA incremental_vacuum({self.vacuum_pages})").fetchall()
+            self._stop.wait(self.pause_between_batches)
+
+    def enable_incremental_vacuum(self):
+        """Chuyển database cũ sang auto_vacuum=INCREMENTAL một lần.
+
+        Cần một VACUUM toàn phần (chặn ghi trong lúc chạy) nên chỉ gọi từ thread
+        dọn log. Trả về True nếu đã chuyển, False nếu database đã ở chế độ này.
+        """
+        conn = self._connect()
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return True
+
+    def iter_archive(self, level=None, since=None, until=None, search_text=None):
+        """Duyệt các log đã archive (cũ tới mới), chỉ giải nén các segment nằm trong khoảng thời gian"""
+        clauses = []
+        params = []
+        if level:
+            clauses.append("level = ?")
+            params.append(level.upper())
+        if since:
+            clauses.append("end_ts >= ?")
+            params.append(since)
+        if until:
+            clauses.append("start_ts <= ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        needle = search_text.lower() if search_text else None
+
+        conn = self._connect()
+        segments = conn.execute(
+            f"SELECT data FROM log_archive {where} ORDER BY start_ts, id", params
+        )
+        for (data,) in segments:
+            for row in _decompress_rows(data):
+                if since and row[1] < since:
+                    continue
+                if until and row[1] > until:
+                    continue
+                if needle and needle not in (row[5] or '').lower():
+                    continue
+                yield row
+
+    def iter_archive_pages(self, filters=None, page_size=1000):
+        """Log đã archive thỏa bộ lọc của LogStore (module, level, account, date_range,
+        search_text), mỗi lần yield một list tối đa page_size dòng"""
+        filters = filters or {}
+        delta = DATE_RANGES.get(filters.get('date_range'))
+        since = (datetime.now() - delta).strftime('%Y-%m-%d %H:%M:%S') if delta else None
+        module = filters.get('module')
+        modules = MODULE_ALIASES.get(module, (module,)) if module else None
+        account = (filters.get('account') or '').lstrip('@') or None
+        page = []
+        for row in self.iter_archive(filters.get('level'), since=since,
+                                     search_text=(filters.get('search_text') or '').strip() or None):
+            if modules and row[3] not in modules:
+                continue
+            if account and row[4] != account:
+                continue
+            page.append(row)
+            if len(page) >= page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def archived_count(self, level=None):
+        """Số dòng đã archive (tối đa, trước khi lọc) để hiển thị tiến trình export"""
+        conn = self._connect()
+        if level:
+            row = conn.execute("SELECT SUM(row_count) FROM log_archive WHERE level = ?", (level.upper(),))
+        else:
+            row = conn.execute("SELECT SUM(row_count) FROM log_archive")
+        return row.fetchone()[0] or 0
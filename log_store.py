@@ -0,0 +1,227 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+from db_pool import DatabasePool
+
+# Thứ tự cột trả về cho mọi truy vấn log
+LOG_COLUMNS = "id, timestamp, level, module, account, message, details"
+
+# Tên module trên bộ lọc GUI -> giá trị module thực tế trong bảng logs
+MODULE_ALIASES = {
+    'Bot': ('TwitterBot', 'Bot'),
+}
+
+# Khoảng thời gian của bộ lọc "Date Range"
+DATE_RANGES = {
+    'Last Hour': timedelta(hours=1),
+    'Last 24 Hours': timedelta(days=1),
+    'Last 7 Days': timedelta(days=7),
+    'Last 30 Days': timedelta(days=30),
+}
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        level TEXT NOT NULL,
+        module TEXT NOT NULL,
+        account TEXT,
+        message TEXT NOT NULL,
+        details TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs (timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_logs_account_level_ts ON logs (account, level, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_logs_level_ts ON logs (level, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_logs_module_ts ON logs (module, timestamp)",
+]
+
+# Index full-text cho message, đồng bộ với bảng logs qua trigger
+FTS_SCHEMA = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5(message, content='logs', content_rowid='id')",
+    """CREATE TRIGGER IF NOT EXISTS logs_fts_ai AFTER INSERT ON logs BEGIN
+        INSERT INTO logs_fts(rowid, message) VALUES (new.id, new.message);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS logs_fts_ad AFTER DELETE ON logs BEGIN
+        INSERT INTO logs_fts(logs_fts, rowid, message) VALUES ('delete', old.id, old.message);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS logs_fts_au AFTER UPDATE OF message ON logs BEGIN
+        INSERT INTO logs_fts(logs_fts, rowid, message) VALUES ('delete', old.id, old.message);
+        INSERT INTO logs_fts(rowid, message) VALUES (new.id, new.message);
+    END""",
+]
+
+
+def has_log_fts(conn):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'logs_fts'"
+    ).fetchone() is not None
+
+
+def create_log_fts(conn, rebuild=True):
+    """Tạo logs_fts và các trigger; rebuild đánh index các log đã có. Trả về True nếu có FTS5"""
+    try:
+        for statement in FTS_SCHEMA:
+            conn.execute(statement)
+        if rebuild:
+            conn.execute("INSERT INTO logs_fts(logs_fts) VALUES ('rebuild')")
+        return True
+    except sqlite3.OperationalError as e:
+        # SQLite build không có FTS5 thì dùng LIKE
+        print(f"LogStore: không bật được FTS5: {str(e)}")
+        return False
+
+
+def ensure_log_schema(conn):
+    """Tạo bảng logs, các index và FTS5 nếu chưa có. Trả về True nếu có FTS5.
+
+    FTS chỉ được tạo ở đây khi bảng logs còn trống; với bảng đã có log, migration
+    đánh index (rebuild) ngoài thread GUI và trong lúc chờ tìm kiếm dùng LIKE.
+    """
+    if conn.execute("PRAGMA page_count").fetchone()[0] == 0:
+        # Database mới: bật incremental vacuum trước khi tạo bảng (xem log_retention)
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    for statement in SCHEMA:
+        conn.execute(statement)
+    has_fts = has_log_fts(conn)
+    if not has_fts and conn.execute("SELECT 1 FROM logs LIMIT 1").fetchone() is None:
+        has_fts = create_log_fts(conn, rebuild=False)
+    conn.commit()
+    return has_fts
+
+
+def _fts_query(search_text):
+    """Chuyển chuỗi tìm kiếm thành truy vấn FTS5 (mỗi từ là một prefix, nối bằng AND)"""
+    terms = [term.replace('"', '""') for term in search_text.split()]
+    return ' '.join(f'"{term}"*' for term in terms if term)
+
+
+class LogStore:
+    """Đọc bảng logs theo trang, không bao giờ tải toàn bộ bảng.
+
+    filters là dict với các khóa tùy chọn: module, level, account,
+    date_range (tên trong DATE_RANGES) và search_text.
+    """
+    def __init__(self, db_path='settings.db'):
+        self.db_path = db_path
+        self.has_fts = False
+        self._schema_ready = False
+
+    def _connection(self):
+        # Kết nối lấy từ pool (mỗi thread một kết nối), schema chỉ kiểm tra một lần
+        conn = DatabasePool(self.db_path).connection()
+        if not self._schema_ready:
+            self.has_fts = ensure_log_schema(conn)
+            self._schema_ready = True
+        elif not self.has_fts:
+            # Migration có thể vừa đánh index FTS ở thread khác
+            self.has_fts = has_log_fts(conn)
+        return conn
+
+    def close(self):
+        """Đóng kết nối của thread hiện tại (dùng khi store chạy trong worker thread)"""
+        DatabasePool(self.db_path).close_thread_connection()
+
+    def _build_where(self, filters, include_search=True):
+        clauses = []
+        params = []
+        if not filters:
+            return clauses, params
+
+        module = filters.get('module')
+        if module:
+            modules = MODULE_ALIASES.get(module, (module,))
+            clauses.append(f"module IN ({', '.join('?' * len(modules))})")
+            params.extend(modules)
+
+        level = filters.get('level')
+        if level:
+            clauses.append("level = ?")
+            params.append(level.upper())
+
+        account = filters.get('account')
+        if account:
+            clauses.append("account = ?")
+            params.append(account.lstrip('@'))
+
+        delta = DATE_RANGES.get(filters.get('date_range'))
+        if delta:
+            clauses.append("timestamp >= ?")
+            params.append((datetime.now() - delta).strftime('%Y-%m-%d %H:%M:%S'))
+
+        search_text = (filters.get('search_text') or '').strip()
+        if search_text and include_search:
+            if self.has_fts:
+                clauses.append("id IN (SELECT rowid FROM logs_fts WHERE logs_fts MATCH ?)")
+                params.append(_fts_query(search_text))
+            else:
+                clauses.append("message LIKE ?")
+                params.append(f"%{search_text}%")
+
+        return clauses, params
+
+    def fetch_page(self, before=None, limit=200, filters=None):
+        """Lấy tối đa `limit` log mới nhất thỏa filters, nằm sau con trỏ before=(timestamp, id).
+
+        Sắp xếp theo (timestamp, id) giảm dần để đi theo thứ tự của các index.
+        Khi có search_text thì đi theo FTS5 theo rowid giảm dần để không phải
+        gom toàn bộ kết quả khớp trước khi sắp xếp.
+        """
+        conn = self._connection()
+        search_text = ((filters or {}).get('search_text') or '').strip()
+        if search_text and self.has_fts:
+            clauses, params = self._build_where(filters, include_search=False)
+            clauses.insert(0, "logs_fts MATCH ?")
+            params.insert(0, _fts_query(search_text))
+            if before is not None:
+                clauses.append("logs_fts.rowid < ?")
+                params.append(before[1])
+            columns = ', '.join(f"logs.{column.strip()}" for column in LOG_COLUMNS.split(','))
+            cursor = conn.execute(
+                f"""SELECT {columns} FROM logs_fts JOIN logs ON logs.id = logs_fts.rowid
+                    WHERE {' AND '.join(clauses)} ORDER BY logs_fts.rowid DESC LIMIT ?""",
+                params + [limit]
+            )
+            return cursor.fetchall()
+
+        clauses, params = self._build_where(filters)
+        if before is not None:
+            clauses.append("(timestamp, id) < (?, ?)")
+            params.extend(before)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = conn.execute(
+            f"SELECT {LOG_COLUMNS} FROM logs {where} ORDER BY timestamp DESC, id DESC LIMIT ?",
+            params + [limit]
+        )
+        return cursor.fetchall()
+
+    def iter_filtered(self, filters=None, page_size=500):
+        """Duyệt toàn bộ kết quả lọc theo từng trang, mỗi lần yield một list"""
+        before = None
+        while True:
+            page = self.fetch_page(before=before, limit=page_size, filters=filters)
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            last = page[-1]
+            before = (last[1], last[0])
+
+    def fetch_since(self, last_id, limit=5000, filters=None):
+        """Lấy các log có id > last_id (tăng dần), chi phí tỉ lệ với số log mới"""
+        conn = self._connection()
+        clauses, params = self._build_where(filters)
+        clauses.insert(0, "id > ?")
+        params.insert(0, last_id or 0)
+        cursor = conn.execute(
+            f"SELECT {LOG_COLUMNS} FROM logs WHERE {' AND '.join(clauses)} ORDER BY id ASC LIMIT ?",
+            params + [limit]
+        )
+        return cursor.fetchall()
+
+    def count(self, filters=None):
+        """Đếm số log thỏa filters (dùng cho thanh tiến trình)"""
+        conn = self._connection()
+        clauses, params = self._build_where(filters)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return conn.execute(f"SELECT COUNT(*) FROM logs {where}", params).fetchone()[0]
@@ -0,0 +1,156 @@
+import json
+from datetime import datetime
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QBrush, QColor
+
+# Vị trí các trường trong một dòng log (xem log_store.LOG_COLUMNS)
+ID, TIMESTAMP, LEVEL, MODULE, ACCOUNT, MESSAGE, DETAILS = range(7)
+
+LEVEL_COLORS = {
+    'ERROR': QBrush(QColor("#FF3B30")),
+    'WARNING': QBrush(QColor("#FF9500")),
+    'SUCCESS': QBrush(QColor("#4CD964")),
+    'DEBUG': QBrush(QColor("#8E8E93")),
+}
+
+
+def _format_timestamp(timestamp):
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.fromisoformat(timestamp)
+        except ValueError:
+            return timestamp
+    if isinstance(timestamp, datetime):
+        return timestamp.strftime('%Y-%m-%d %H:%M:%S')
+    return str(timestamp or '')
+
+
+def _format_details(details, pretty=False):
+    if not details:
+        return ''
+    try:
+        if isinstance(details, str):
+            details = json.loads(details)
+        return json.dumps(details, indent=2 if pretty else None, ensure_ascii=False)
+    except (ValueError, TypeError):
+        return str(details)
+
+
+class LogTableModel(QAbstractTableModel):
+    """Model cho bảng log: tải theo trang khi cuộn, chỉ định dạng các ô đang hiển thị"""
+    HEADERS = ["Timestamp", "Level", "Module", "Account", "Message", "Details"]
+
+    def __init__(self, store, page_size=200, max_refresh_rows=5000, max_rows=20000, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.page_size = page_size
+        self.max_refresh_rows = max_refresh_rows
+        # Auto-refresh chèn log mới liên tục: giữ tối đa max_rows dòng mới nhất trong bộ nhớ
+        self.max_rows = max_rows
+        self.filters = None
+        self._rows = []          # Sắp xếp (timestamp, id) giảm dần, mới nhất ở trên
+        self._has_more = False
+        self._max_id = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return _format_timestamp(row[TIMESTAMP])
+            if column == 1:
+                return row[LEVEL] or 'INFO'
+            if column == 2:
+                return row[MODULE] or ''
+            if column == 3:
+                return f"@{row[ACCOUNT]}" if row[ACCOUNT] else ''
+            if column == 4:
+                return row[MESSAGE] or ''
+            if column == 5:
+                return _format_details(row[DETAILS])
+        elif role == Qt.ItemDataRole.ForegroundRole and column == 1:
+            return LEVEL_COLORS.get((row[LEVEL] or '').upper())
+        elif role == Qt.ItemDataRole.ToolTipRole and column == 5 and row[DETAILS]:
+            return _format_details(row[DETAILS], pretty=True)
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Tải trang log cũ hơn khi người dùng cuộn xuống cuối"""
+        if parent.isValid() or not self._rows:
+            return
+        last = self._rows[-1]
+        page = self.store.fetch_page(before=(last[TIMESTAMP], last[ID]),
+                                     limit=self.page_size, filters=self.filters)
+        self._has_more = len(page) == self.page_size
+        if page:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+            self._rows.extend(page)
+            self.endInsertRows()
+
+    def reload(self):
+        """Tải lại trang đầu tiên"""
+        self.beginResetModel()
+        self._rows = list(self.store.fetch_page(limit=self.page_size, filters=self.filters))
+        self._has_more = len(self._rows) == self.page_size
+        self._max_id = max((row[ID] for row in self._rows), default=0)
+        self.endResetModel()
+
+    def set_filters(self, filters):
+        """Áp dụng bộ lọc (lọc trong SQL) và tải lại trang đầu"""
+        self.filters = filters or None
+        self.reload()
+
+    def refresh(self):
+        """Chỉ chèn các log mới hơn dòng mới nhất đang hiển thị"""
+        if not self._rows:
+            self.reload()
+            return len(self._rows)
+        new_rows = self.store.fetch_since(self.last_id, limit=self.max_refresh_rows,
+                                          filters=self.filters)
+        if len(new_rows) == self.max_refresh_rows:
+            # Quá nhiều log mới trong một lần, tải lại trang đầu thay vì chèn hết
+            self.reload()
+            return len(new_rows)
+        if new_rows:
+            self._max_id = new_rows[-1][ID]
+            new_rows.reverse()
+            self.beginInsertRows(QModelIndex(), 0, len(new_rows) - 1)
+            self._rows[0:0] = new_rows
+            self.endInsertRows()
+            self.trim(self.max_rows)
+        return len(new_rows)
+
+    def trim(self, max_rows):
+        """Bỏ các dòng cũ nhất vượt quá max_rows; chúng vẫn tải lại được bằng fetchMore"""
+        if len(self._rows) <= max_rows:
+            return 0
+        removed = len(self._rows) - max_rows
+        self.beginRemoveRows(QModelIndex(), max_rows, len(self._rows) - 1)
+        del self._rows[max_rows:]
+        self.endRemoveRows()
+        self._has_more = True
+        return removed
+
+    @property
+    def last_id(self):
+        """High-water mark: id lớn nhất đã hiển thị"""
+        return self._max_id
@@ -0,0 +1,340 @@
+import queue
+import threading
+import time
+from datetime import datetime
+
+from db_pool import DatabasePool
+from journal import Journal, journal_dir_for
+from log_store import ensure_log_schema
+from profiler import profiled
+
+# seq lớn nhất trong journal đã nằm trong database, cập nhật cùng transaction với mỗi lô
+JOURNAL_STATE_SCHEMA = """CREATE TABLE IF NOT EXISTS journal_state (
+    name TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+)"""
+_SAVE_SEQ = """INSERT INTO journal_state (name, seq) VALUES ('log_writer', ?)
+    ON CONFLICT (name) DO UPDATE SET seq = excluded.seq"""
+# Số lần ghi lại một lô lỗi trước khi ghi từng bản ghi và bỏ bản ghi không ghi được
+MAX_WRITE_ATTEMPTS = 5
+MAX_RETRY_DELAY = 10.0
+
+
+class _FlushMarker:
+    """Đánh dấu điểm flush trong hàng đợi"""
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class LogWriter:
+    """Ghi log (và các bản ghi khác qua register_sink, ví dụ số liệu) vào database theo lô.
+
+    Các bot chỉ đẩy bản ghi vào hàng đợi (không chặn), thread writer gom
+    lại và ghi bằng một transaction khi đủ batch_size hoặc hết flush_interval.
+    Mỗi bản ghi được append vào journal trước khi vào hàng đợi; bản ghi chưa kịp
+    ghi khi ứng dụng đóng hoặc crash được phát lại vào database ở lần khởi động sau.
+
+    Mỗi đường dẫn database có một writer duy nhất; các tham số khác chỉ có tác dụng
+    ở lần tạo đầu tiên.
+    """
+    _instances = {}
+    _lock = threading.Lock()
+    # kind -> (apply(conn, payloads), prepare(conn)) cho các bản ghi không phải log
+    _sinks = {}
+
+    def __new__(cls, db_path='settings.db', max_queue=10000, batch_size=200, flush_interval=0.5,
+                use_journal=True):
+        with cls._lock:
+            instance = cls._instances.get(db_path)
+            if instance is None:
+                instance = super().__new__(cls)
+                instance.init_writer(db_path, max_queue, batch_size, flush_interval, use_journal)
+                cls._instances[db_path] = instance
+            return instance
+
+    def init_writer(self, db_path, max_queue, batch_size, flush_interval, use_journal):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Giới hạn max_queue chỉ áp dụng cho bản ghi (xem submit); marker flush/dừng luôn vào được
+        self.max_queue = max_queue
+        self.queue = queue.Queue()
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.retries = 0
+        self.replayed = 0
+        self.journal = Journal(journal_dir_for(db_path)) if use_journal else None
+        self.committed_seq = 0
+        self._journal_open = False
+        self._replay = []
+        self._last_sync = 0.0
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._submit_lock = threading.Lock()
+        self._closing = threading.Event()
+
+    @classmethod
+    def register_sink(cls, kind, apply, prepare=None):
+        """Ghi bản ghi loại kind bằng apply(conn, payloads) trong transaction của lô.
+
+        prepare(conn) chạy một lần khi thread writer kết nối (tạo bảng...). Cần đăng ký
+        khi import module để bản ghi trong journal phát lại được ngay khi khởi động.
+        """
+        cls._sinks[kind] = (apply, prepare)
+
+    def start(self):
+        """Khởi động thread writer nếu chưa chạy (mở journal và phát lại bản ghi còn sót)"""
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                if self.journal is not None and not self._journal_open:
+                    self._open_journal()
+                self._closing.clear()
+                self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+                self._thread.start()
+
+    def _open_journal(self):
+        """Đọc bản ghi chưa ghi của lần chạy trước; seq mới tiếp nối seq đã ghi trong database"""
+        conn = DatabasePool(self.db_path).connection()
+        conn.execute(JOURNAL_STATE_SCHEMA)
+        row = conn.execute("SELECT seq FROM journal_state WHERE name = 'log_writer'").fetchone()
+        self.committed_seq = row[0] if row else 0
+        self._replay = self.journal.read(after_seq=self.committed_seq)
+        self.journal.open(next_seq=max(self.committed_seq, self.journal.last_seq) + 1)
+        self._journal_open = True
+
+    def write(self, level, module, account, message, details=None, created=None):
+        """Đưa một bản ghi log vào hàng đợi, không chờ ghi xuống database.
+
+        created là thời điểm tạo log (time.time()); mặc định là lúc gọi write.
+        """
+        created = datetime.now() if created is None else datetime.fromtimestamp(created)
+        return self.submit('log', [
+            created.strftime('%Y-%m-%d %H:%M:%S'),
+            level, module, account, message, details
+        ])
+
+    def submit(self, kind, payload):
+        """Ghi payload (list giá trị JSON được) vào journal rồi đưa vào hàng đợi.
+
+        Hàng đợi đầy thì bỏ bản ghi trước khi ghi journal (không chặn thread của bot),
+        nên bản ghi đã bỏ không bao giờ được phát lại.
+        """
+        self.start()
+        # Giữ lock để thứ tự seq trong hàng đợi trùng thứ tự trong journal
+        with self._submit_lock:
+            if self.queue.qsize() >= self.max_queue:
+                self.dropped += 1
+                return False
+            seq = self.journal.append(kind, payload) if self.journal is not None else 0
+            self.queue.put_nowait((seq, kind, payload))
+        return True
+
+    def flush(self, timeout=5.0):
+        """Chờ tới khi mọi bản ghi đã đưa vào trước đó được ghi xuống database"""
+        if self._thread is None or not self._thread.is_alive():
+            return self.queue.empty()
+        marker = _FlushMarker()
+        self.queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Ghi nốt hàng đợi rồi dừng thread writer"""
+        with self._thread_lock:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                return
+            self._closing.set()
+            self.queue.put(None)
+        thread.join(timeout)
+        if self.journal is not None and self._journal_open and not thread.is_alive():
+            self.journal.close()
+            self._journal_open = False
+
+    def stats(self):
+        """Độ sâu hàng đợi và số bản ghi đã ghi/bỏ/lỗi"""
+        stats = {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'queue_depth': self.queue.qsize(),
+            'queue_max': self.max_queue,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'retries': self.retries,
+            'replayed': self.replayed,
+        }
+        if self.journal is not None:
+            stats['journal_pending'] = max(0, self.journal.last_seq - self.committed_seq)
+            stats['journal_unsynced'] = max(0, self.journal.last_seq - self.journal.synced_seq)
+        return stats
+
+    def _connect(self):
+        conn = DatabasePool(self.db_path).connection()
+        ensure_log_schema(conn)
+        conn.execute(JOURNAL_STATE_SCHEMA)
+        for _, prepare in list(self._sinks.values()):
+            if prepare is not None:
+                prepare(conn)
+        return conn
+
+    @profiled("db.log_write_batch")
+    def _write_batch(self, conn, batch):
+        """Ghi một lô [(seq, kind, payload)] và seq cuối của lô trong cùng một transaction.
+
+        Trả về False nếu lỗi (transaction đã rollback, committed_seq không đổi).
+        """
+        if not batch:
+            return True
+        logs = []
+        others = {}
+        for seq, kind, payload in batch:
+            if kind == 'log':
+                logs.append(payload)
+            else:
+                others.setdefault(kind, []).append(payload)
+        last_seq = max(seq for seq, _, _ in batch)
+        try:
+            with conn:
+                if logs:
+                    conn.executemany(
+                        """INSERT INTO logs (timestamp, level, module, account, message, details)
+                           VALUES (?, ?, ?, ?, ?, ?)""",
+                        logs
+                    )
+                for kind, payloads in others.items():
+                    sink = self._sinks.get(kind)
+                    if sink is None:
+                        print(f"LogWriter: bỏ {len(payloads)} bản ghi loại '{kind}' (không có sink)")
+                        continue
+                    sink[0](conn, payloads)
+                if last_seq:
+                    conn.execute(_SAVE_SEQ, (last_seq,))
+            self.written += len(batch)
+            self.committed_seq = max(self.committed_seq, last_seq)
+            return True
+        except Exception as e:
+            print(f"LogWriter: lỗi khi ghi {len(batch)} bản ghi: {str(e)}")
+            return False
+
+    def _write_each(self, conn, batch):
+        """Ghi từng bản ghi của một lô đã lỗi nhiều lần; trả về phần cần ghi lại.
+
+        Bản ghi lỗi trong khi database vẫn ghi được bị bỏ (và đếm): seq của bản ghi
+        sau được lưu nên nó không được phát lại. Database không ghi được thì giữ lại
+        toàn bộ phần còn lại để ghi lại sau.
+        """
+        for index, record in enumerate(batch):
+            if self._write_batch(conn, [record]):
+                continue
+            if not self._writable(conn):
+                return batch[index:]
+            self.failed += 1
+            print(f"LogWriter: bỏ bản ghi seq {record[0]} loại '{record[1]}' sau {MAX_WRITE_ATTEMPTS} lần lỗi")
+        return []
+
+    def _writable(self, conn):
+        """Thử ghi lại seq đã lưu: phân biệt bản ghi lỗi với database lỗi"""
+        try:
+            with conn:
+                conn.execute(_SAVE_SEQ, (self.committed_seq,))
+            return True
+        except Exception:
+            return False
+
+    def _checkpoint(self):
+        """Bỏ phần journal đã nằm trong database; fsync phần còn lại tối đa một lần mỗi flush_interval"""
+        if self.journal is None or not self._journal_open:
+            return
+        self.journal.checkpoint(self.committed_seq)
+        # Khi tải cao các lô nối tiếp nhau: fsync theo thời gian chứ không theo từng lô
+        now = time.monotonic()
+        if now - self._last_sync >= self.flush_interval:
+            self.journal.sync()
+            self._last_sync = now
+
+    def _replay_journal(self, conn):
+        """Phát lại bản ghi của lần chạy trước; trả về phần chưa ghi được (ghi lại trước bản ghi mới)"""
+        records, self._replay = self._replay, []
+        for start in range(0, len(records), self.batch_size):
+            chunk = records[start:start + self.batch_size]
+            if not self._write_batch(conn, chunk):
+                return records[start:]
+            self.replayed += len(chunk)
+        if records:
+            print(f"LogWriter: đã phát lại {len(records)} bản ghi từ journal")
+        return []
+
+    def _run(self):
+        conn = self._connect()
+        batch = self._replay_journal(conn)
+        self._checkpoint()
+        # Lô ghi lỗi được ghi lại trước mọi bản ghi mới: seq lưu trong database chỉ tăng
+        # khi mọi bản ghi trước nó đã được ghi (hoặc đã bị bỏ có đếm), nên checkpoint
+        # không bao giờ xóa khỏi journal bản ghi chưa ghi
+        attempts = 1 if batch else 0
+        markers = []
+        stopping = False
+        try:
+            while not stopping:
+                if attempts:
+                    # Không lấy thêm từ hàng đợi khi đang ghi lại: hàng đợi đầy thì submit() bỏ bản ghi
+                    self.retries += 1
+                    closing = self._closing.wait(min(self.flush_interval * 2 ** attempts, MAX_RETRY_DELAY))
+                    if self._write_batch(conn, batch):
+                        attempts = 0
+                    elif closing:
+                        # Lô chưa ghi vẫn nằm trong journal và được phát lại ở lần chạy sau
+                        break
+                    elif attempts >= MAX_WRITE_ATTEMPTS:
+                        batch = self._write_each(conn, batch)
+                        attempts = attempts if batch else 0
+                    else:
+                        attempts += 1
+                    if not attempts:
+                        batch = []
+                        for marker in markers:
+                            marker.done.set()
+                        markers = []
+                    self._checkpoint()
+                    continue
+
+                deadline = time.monotonic() + self.flush_interval
+                # Gom bản ghi cho tới khi đủ batch hoặc hết thời gian
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self.queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    if isinstance(item, _FlushMarker):
+                        markers.append(item)
+                        break
+                    batch.append(item)
+
+                if stopping:
+                    # Lấy nốt những gì còn trong hàng đợi
+                    while True:
+                        try:
+                            item = self.queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if isinstance(item, _FlushMarker):
+                            markers.append(item)
+                        elif item is not None:
+                            batch.append(item)
+
+                if self._write_batch(conn, batch):
+                    batch = []
+                    for marker in markers:
+                        marker.done.set()
+                    markers = []
+                else:
+                    attempts = 1
+                self._checkpoint()
+        finally:
+            DatabasePool(self.db_path).close_thread_connection()
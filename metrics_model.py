@@ -0,0 +1,144 @@
+import threading
+
+
+class StreamingMean:
+    """Trung bình cộng dồn, O(1) mỗi mẫu"""
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+
+    def add(self, value):
+        self.count += 1
+        self.mean += (value - self.mean) / self.count
+
+
+class P2Quantile:
+    """Ước lượng percentile theo thuật toán P² (Jain & Chlamtac): 5 marker, O(1) bộ nhớ và thời gian"""
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, value):
+        self.count += 1
+        if self.count <= 5:
+            self.heights.append(value)
+            self.heights.sort()
+            return
+
+        heights = self.heights
+        if value < heights[0]:
+            heights[0] = value
+            k = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            k = 3
+        else:
+            k = 0
+            while value >= heights[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            self.positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Điều chỉnh 3 marker giữa
+        for i in range(1, 4):
+            delta = self.desired[i] - self.positions[i]
+            if (delta >= 1 and self.positions[i + 1] - self.positions[i] > 1) or \
+               (delta <= -1 and self.positions[i - 1] - self.positions[i] < -1):
+                step = 1 if delta > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                self.positions[i] += step
+
+    def _parabolic(self, i, step):
+        n, q = self.positions, self.heights
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i, step):
+        n, q = self.positions, self.heights
+        return q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+
+    @property
+    def value(self):
+        if self.count == 0:
+            return 0.0
+        if self.count <= 5:
+            # Chưa đủ 5 mẫu: lấy trực tiếp từ các mẫu đã sắp xếp
+            index = min(len(self.heights) - 1, int(round(self.p * (len(self.heights) - 1))))
+            return self.heights[index]
+        return self.heights[2]
+
+
+class MetricsModel:
+    """Số liệu chạy của phiên làm việc: bộ đếm, trung bình và percentile dạng streaming.
+
+    record_tweet() là O(1); GUI đọc snapshot() trên timer khi dirty, nên một
+    loạt sự kiện liên tiếp chỉ gây một lần vẽ lại.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.total_processed = 0
+            self.successes = 0
+            self.likes = 0
+            self.follows = 0
+            self.verified_users = 0
+            self.media_tweets = 0
+            self.response_mean = StreamingMean()
+            self.response_p50 = P2Quantile(0.5)
+            self.response_p95 = P2Quantile(0.95)
+            self.interactions_mean = StreamingMean()
+            self.dirty = True
+
+    def record_tweet(self, success, response_time_ms=0, like=False, follow=False,
+                     is_verified=False, has_media=False, interaction_count=0):
+        with self._lock:
+            self.total_processed += 1
+            self.successes += int(bool(success))
+            self.likes += int(bool(like))
+            self.follows += int(bool(follow))
+            self.verified_users += int(bool(is_verified))
+            self.media_tweets += int(bool(has_media))
+            response_time_ms = float(response_time_ms or 0)
+            self.response_mean.add(response_time_ms)
+            self.response_p50.add(response_time_ms)
+            self.response_p95.add(response_time_ms)
+            self.interactions_mean.add(float(interaction_count or 0))
+            self.dirty = True
+
+    @property
+    def success_rate(self):
+        return self.successes / self.total_processed * 100 if self.total_processed else 0.0
+
+    def snapshot(self, clear_dirty=True):
+        """Giá trị hiện tại dạng dict; mặc định đánh dấu model đã được vẽ"""
+        with self._lock:
+            data = {
+                'total_processed': self.total_processed,
+                'success_rate': self.success_rate,
+                'likes': self.likes,
+                'follows': self.follows,
+                'verified_users': self.verified_users,
+                'media_tweets': self.media_tweets,
+                'avg_response': self.response_mean.mean,
+                'p50_response': self.response_p50.value,
+                'p95_response': self.response_p95.value,
+                'avg_interactions': self.interactions_mean.mean,
+            }
+            if clear_dirty:
+                self.dirty = False
+            return data
@@ -0,0 +1,156 @@
+import sqlite3
+import threading
+
+from db_pool import DatabasePool
+from log_store import SCHEMA as LOG_SCHEMA, create_log_fts, has_log_fts
+from queries import QUERIES
+
+# Bảng do DatabaseManager tạo; migration tạo nếu chưa có để có thể chạy trên database mới
+REPLIED_TWEETS_TABLE = """CREATE TABLE IF NOT EXISTS replied_tweets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    profile_id TEXT NOT NULL,
+    tweet_id TEXT NOT NULL,
+    username TEXT NOT NULL,
+    reply_text TEXT,
+    replied_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(profile_id, tweet_id)
+)"""
+
+POSTED_TWEETS_TABLE = """CREATE TABLE IF NOT EXISTS posted_tweets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    profile_id TEXT NOT NULL,
+    original_id TEXT,
+    original_content TEXT,
+    posted_content TEXT,
+    posted_at DATETIME DEFAULT CURRENT_TIMESTAMP
+)"""
+
+# posted_at lưu giờ địa phương dạng chuỗi; modifier 'utc' đổi sang UTC trước khi lấy epoch
+_EPOCH_FROM_POSTED_AT = "CAST(strftime('%s', {column}, 'utc') AS INTEGER)"
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _replied_tweets_indexes(conn):
+    conn.execute(REPLIED_TWEETS_TABLE)
+    # Đồng bộ Bloom filter của ReplyDedupStore: đọc (id, tweet_id) theo profile, id tăng dần,
+    # chỉ từ index (không đọc bảng, không sắp xếp tạm)
+    conn.execute("DROP INDEX IF EXISTS idx_replied_tweets_profile_rowid")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_replied_tweets_profile_id_tweet ON replied_tweets (profile_id, id, tweet_id)"
+    )
+
+
+def _posted_tweets_epoch(conn):
+    conn.execute(POSTED_TWEETS_TABLE)
+    if 'posted_at_epoch' not in _columns(conn, 'posted_tweets'):
+        conn.execute("ALTER TABLE posted_tweets ADD COLUMN posted_at_epoch INTEGER")
+    conn.execute(
+        f"UPDATE posted_tweets SET posted_at_epoch = {_EPOCH_FROM_POSTED_AT.format(column='posted_at')} "
+        "WHERE posted_at_epoch IS NULL AND posted_at IS NOT NULL"
+    )
+    # Dòng được ghi bởi code cũ (chỉ có posted_at) vẫn có epoch
+    conn.execute(f"""CREATE TRIGGER IF NOT EXISTS posted_tweets_fill_epoch AFTER INSERT ON posted_tweets
+        WHEN NEW.posted_at_epoch IS NULL AND NEW.posted_at IS NOT NULL
+        BEGIN
+            UPDATE posted_tweets SET posted_at_epoch = {_EPOCH_FROM_POSTED_AT.format(column='NEW.posted_at')}
+            WHERE rowid = NEW.rowid;
+        END""")
+    # posted_content_exists dùng phần profile_id của các index này rồi lọc, không index nội dung dài
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_posted_tweets_profile_epoch ON posted_tweets (profile_id, posted_at_epoch)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_posted_tweets_profile_original ON posted_tweets (profile_id, original_id)"
+    )
+
+
+def _logs_fts(conn):
+    for statement in LOG_SCHEMA:
+        conn.execute(statement)
+    # Đánh index FTS cho log có sẵn: rebuild đọc toàn bộ bảng logs nên chạy ở đây
+    # (thread DataLoader / bot / headless), không chạy khi LogStore mở trên thread GUI
+    if not has_log_fts(conn):
+        create_log_fts(conn)
+
+
+# (version, mô tả, hàm). Chỉ thêm vào cuối, không sửa migration đã phát hành
+MIGRATIONS = [
+    (1, "replied_tweets: covering index (profile_id, id, tweet_id)", _replied_tweets_indexes),
+    (2, "posted_tweets: posted_at_epoch và các index theo profile", _posted_tweets_epoch),
+    (3, "logs: index FTS5 cho message của các log đã có", _logs_fts),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+_migrated = set()
+_migrate_lock = threading.Lock()
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(db_path='settings.db'):
+    """Nâng cấp database lên SCHEMA_VERSION, mỗi migration trong một transaction.
+
+    Phiên bản lưu trong PRAGMA user_version. Chỉ chạy một lần cho mỗi db_path
+    trong process; trả về danh sách mô tả các migration vừa chạy.
+    """
+    with _migrate_lock:
+        if db_path in _migrated:
+            return []
+        conn = DatabasePool(db_path).connection()
+        applied = []
+        for version, description, apply in MIGRATIONS:
+            if schema_version(conn) >= version:
+                continue
+            # BEGIN IMMEDIATE: process khác đang migrate thì chờ, rồi kiểm tra lại phiên bản
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if schema_version(conn) < version:
+                    apply(conn)
+                    conn.execute(f"PRAGMA user_version = {version}")
+                    applied.append(description)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        _migrated.add(db_path)
+        return applied
+
+
+def hot_queries():
+    """Các truy vấn SELECT trên đường nóng cần được kiểm tra query plan"""
+    return {name: sql for name, sql in QUERIES.items() if sql.lstrip().upper().startswith('SELECT')}
+
+
+def find_full_scans(conn, queries=None):
+    """Chạy EXPLAIN QUERY PLAN, trả về [(tên truy vấn, chi tiết)] cho các bước quét toàn bộ bảng/index"""
+    scans = []
+    for name, sql in (queries or hot_queries()).items():
+        params = [None] * sql.count('?')
+        try:
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        except sqlite3.OperationalError as e:
+            # Thiếu bảng/cột: database chưa được migrate
+            scans.append((name, f"lỗi: {str(e)}"))
+            continue
+        for row in plan:
+            detail = row[-1]
+            if detail.startswith('SCAN') and 'CONSTANT ROW' not in detail:
+                scans.append((name, detail))
+    return scans
+
+
+def startup_check(db_path='settings.db'):
+    """Migrate rồi kiểm tra query plan của các truy vấn nóng; in cảnh báo nếu có full scan"""
+    applied = migrate(db_path)
+    for description in applied:
+        print(f"Migration: {description}")
+    scans = find_full_scans(DatabasePool(db_path).connection())
+    for name, detail in scans:
+        print(f"Cảnh báo: truy vấn '{name}' quét toàn bộ ({detail})")
+    return scans
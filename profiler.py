@@ -0,0 +1,138 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from latency import LatencyHistogram
+
+
+def profiling_requested(argv=None):
+    """Bật profiler từ đầu bằng --profile hoặc biến môi trường PROFILE=1"""
+    argv = sys.argv if argv is None else argv
+    return '--profile' in argv or os.environ.get('PROFILE') == '1'
+
+
+class Profiler:
+    """Đo thời gian các đoạn code nóng, mặc định tắt.
+
+    Mỗi thread ghi vào histogram riêng của nó (không tranh chấp lock giữa các thread);
+    snapshot() gộp histogram của mọi thread khi cần đọc.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance.init_profiler()
+            return cls._instance
+
+    def init_profiler(self):
+        self.enabled = profiling_requested()
+        self.started_at = time.time()
+        self._local = threading.local()
+        self._thread_tables = []  # [(tên thread, {tên đoạn code: LatencyHistogram})]
+        self._tables_lock = threading.Lock()
+
+    def _table(self):
+        table = getattr(self._local, 'table', None)
+        if table is None:
+            table = self._local.table = {}
+            with self._tables_lock:
+                self._thread_tables.append((threading.current_thread().name, table))
+        return table
+
+    def record(self, name, seconds):
+        if not self.enabled:
+            return
+        table = self._table()
+        histogram = table.get(name)
+        if histogram is None:
+            # Chỉ thread này ghi vào histogram nên không cần lock
+            histogram = table[name] = LatencyHistogram(locked=False)
+        histogram.record(seconds)
+
+    def timed(self, name):
+        """Context manager: with Profiler().timed("bot.reply"): ..."""
+        return _Timer(self, name)
+
+    def reset(self):
+        """Xóa mọi số liệu đã ghi (histogram của các thread được tạo lại khi ghi tiếp)"""
+        with self._tables_lock:
+            for _, table in self._thread_tables:
+                table.clear()
+        self.started_at = time.time()
+
+    def merged(self):
+        """{tên đoạn code: LatencyHistogram} gộp từ mọi thread"""
+        with self._tables_lock:
+            tables = [table for _, table in self._thread_tables]
+        merged = {}
+        for table in tables:
+            for name, histogram in list(table.items()):
+                if name not in merged:
+                    merged[name] = LatencyHistogram()
+                merged[name].merge(histogram)
+        return merged
+
+    def snapshot(self):
+        """Số liệu theo đoạn code, tốn nhiều thời gian nhất đứng đầu"""
+        rows = [dict(name=name, **histogram.snapshot()) for name, histogram in self.merged().items()]
+        return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+    def export_json(self, file_path):
+        """Ghi snapshot ra file JSON, trả về số đoạn code đã ghi"""
+        rows = self.snapshot()
+        with self._tables_lock:
+            threads = sorted({name for name, table in self._thread_tables if table})
+        data = {
+            'exported_at': datetime.now().isoformat(timespec='seconds'),
+            'since': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+            'threads': threads,
+            'timings': rows,
+        }
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return len(rows)
+
+
+class _Timer:
+    __slots__ = ('profiler', 'name', 'started')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.started = None
+
+    def __enter__(self):
+        if self.profiler.enabled:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.started is not None:
+            self.profiler.record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def profiled(name=None):
+    """Decorator đo thời gian mỗi lần gọi hàm; khi profiler tắt chỉ tốn một lần kiểm tra cờ"""
+    def decorator(func):
+        label = name or func.__qualname__
+        profiler = Profiler()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record(label, time.perf_counter() - started)
+        return wrapper
+    return decorator
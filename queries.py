@@ -0,0 +1,87 @@
+import sqlite3
+import threading
+import time
+
+from db_pool import DatabasePool
+from latency import LatencyHistogram
+from profiler import Profiler
+
+# Các truy vấn có tên. SQL là chuỗi cố định nên statement đã compile được
+# dùng lại từ cache của mỗi kết nối (sqlite3 cache theo nội dung câu lệnh).
+# Cột và index mà các truy vấn cần được tạo bởi migrations.py.
+QUERIES = {
+    'replied_tweet_exists': """SELECT 1 FROM replied_tweets
+        WHERE profile_id = ? AND tweet_id = ? LIMIT 1""",
+    'replied_tweet_ids_since': """SELECT id, tweet_id FROM replied_tweets
+        WHERE profile_id = ? AND id > ? ORDER BY id LIMIT ?""",
+    'last_posted_epoch': """SELECT posted_at_epoch FROM posted_tweets
+        WHERE profile_id = ? ORDER BY posted_at_epoch DESC LIMIT 1""",
+    'posted_original_exists': """SELECT 1 FROM posted_tweets
+        WHERE profile_id = ? AND original_id = ? LIMIT 1""",
+    'posted_content_exists': """SELECT 1 FROM posted_tweets
+        WHERE profile_id = ? AND posted_content = ? LIMIT 1""",
+    'insert_replied_tweet': """INSERT OR IGNORE INTO replied_tweets
+        (profile_id, tweet_id, username, reply_text) VALUES (?, ?, ?, ?)""",
+    'insert_posted_tweet': """INSERT INTO posted_tweets
+        (profile_id, original_id, original_content, posted_content, posted_at, posted_at_epoch)
+        VALUES (?, ?, ?, ?, ?, ?)""",
+}
+
+
+class QueryRepository:
+    """Chạy các truy vấn có tên trên kết nối của pool và đo thời gian từng truy vấn.
+
+    Kết quả đọc trả về sqlite3.Row (truy cập theo tên cột hoặc chỉ số).
+    Mỗi đường dẫn database có một repository duy nhất.
+    """
+    _instances = {}
+    _lock = threading.Lock()
+
+    def __new__(cls, db_path='settings.db'):
+        with cls._lock:
+            instance = cls._instances.get(db_path)
+            if instance is None:
+                instance = super().__new__(cls)
+                instance.init_repository(db_path)
+                cls._instances[db_path] = instance
+            return instance
+
+    def init_repository(self, db_path):
+        self.db_path = db_path
+        self.histograms = {name: LatencyHistogram() for name in QUERIES}
+        self.profiler = Profiler()
+
+    def _run(self, name, params, fetch):
+        sql = QUERIES[name]
+        conn = DatabasePool(self.db_path).connection()
+        started = time.perf_counter()
+        try:
+            cursor = conn.cursor()
+            # row_factory đặt trên cursor để không ảnh hưởng người dùng khác của kết nối
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(sql, params)
+            return fetch(cursor)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.histograms[name].record(elapsed)
+            self.profiler.record(f"db.{name}", elapsed)
+
+    def fetch_one(self, name, params=()):
+        return self._run(name, params, lambda cursor: cursor.fetchone())
+
+    def fetch_all(self, name, params=()):
+        return self._run(name, params, lambda cursor: cursor.fetchall())
+
+    def exists(self, name, params=()):
+        return self.fetch_one(name, params) is not None
+
+    def execute(self, name, params=()):
+        """Chạy câu lệnh ghi trong một transaction, trả về số dòng bị ảnh hưởng"""
+        conn = DatabasePool(self.db_path).connection()
+        with conn:
+            return self._run(name, params, lambda cursor: cursor.rowcount)
+
+    def stats(self):
+        """Thống kê thời gian theo truy vấn, truy vấn tốn nhiều thời gian nhất đứng đầu"""
+        rows = [dict(name=name, **histogram.snapshot()) for name, histogram in self.histograms.items()]
+        return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
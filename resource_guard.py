@@ -0,0 +1,243 @@
+import os
+import threading
+import time
+from collections import deque
+
+from lazy_import import is_available
+
+# Loại tài nguyên được theo dõi
+THREAD = 'thread'
+EXECUTOR = 'executor'
+CACHE = 'cache'
+TABLE = 'table'
+
+
+def rss_bytes():
+    """RSS hiện tại của process (byte); None nếu không đọc được"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    # Windows/macOS: cần psutil (tùy chọn)
+    if is_available('psutil'):
+        import psutil
+        return psutil.Process().memory_info().rss
+    return None
+
+
+def _default_size(kind, obj):
+    if kind == THREAD:
+        is_alive = getattr(obj, 'is_alive', None) or getattr(obj, 'isRunning')
+        return 1 if is_alive() else 0
+    if kind == EXECUTOR:
+        return sum(1 for thread in getattr(obj, '_threads', ()) if thread.is_alive())
+    return len(obj)
+
+
+def _default_close(kind, obj, timeout):
+    if kind == THREAD:
+        # Thread không thể tự join chính nó
+        if obj is not threading.current_thread() and hasattr(obj, 'join'):
+            obj.join(timeout)
+    elif kind == EXECUTOR:
+        obj.shutdown(wait=True, cancel_futures=True)
+    elif kind == CACHE:
+        clear = getattr(obj, 'clear', None) or getattr(obj, 'invalidate')
+        clear()
+
+
+class _Resource:
+    __slots__ = ('owner', 'kind', 'name', 'obj', 'size', 'cap', 'trim', 'close')
+
+    def __init__(self, owner, kind, name, obj, size, cap, trim, close):
+        self.owner = owner
+        self.kind = kind
+        self.name = name
+        self.obj = obj
+        self.size = size
+        self.cap = cap
+        self.trim = trim
+        self.close = close
+
+    def measure(self):
+        return self.size(self.obj) if self.size else _default_size(self.kind, self.obj)
+
+
+class ResourceGuard:
+    """Sổ tài nguyên của process: thread, executor, cache và bảng của từng owner.
+
+    Mỗi owner (ví dụ "bot:<profile_id>", "gui") đăng ký tài nguyên bằng track();
+    release(owner) đóng chúng theo thứ tự ngược lại và trả về danh sách tài nguyên
+    còn sót (rỗng nghĩa là đã dọn sạch). sample() đo RSS và kích thước, enforce()
+    cắt các tài nguyên vượt giới hạn. Cả hai chạy ở thread gọi chúng: GUI gọi từ
+    QTimer, chế độ headless dùng start() để chạy ở thread riêng.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance.init_guard()
+            return cls._instance
+
+    def init_guard(self):
+        # RESOURCE_MAX_RSS_MB=0: không giới hạn RSS
+        self.max_rss_mb = int(os.environ.get('RESOURCE_MAX_RSS_MB', '0') or 0)
+        self.sample_interval = float(os.environ.get('RESOURCE_SAMPLE_SECONDS', '60') or 60)
+        self.caps = {}  # tên tài nguyên -> giới hạn, ghi đè giới hạn lúc track()
+        self.samples = deque(maxlen=1440)  # (thời điểm, RSS); 1 ngày với chu kỳ 60 giây
+        self.last_snapshot = None
+        self.trims = 0
+        self.cap_violations = 0
+        self.pressure_events = 0
+        self._resources = []
+        self._pressure_handlers = []
+        self._state_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def configure(self, max_rss_mb=None, caps=None):
+        if max_rss_mb is not None:
+            self.max_rss_mb = max_rss_mb
+        if caps:
+            self.caps.update(caps)
+
+    def track(self, owner, kind, name, obj, size=None, cap=None, trim=None, close=None):
+        """Đăng ký tài nguyên, trả về obj.
+
+        size(obj) -> số phần tử (mặc định len(), hoặc số thread còn sống);
+        trim(obj, cap) cắt bớt khi vượt cap; close(obj, timeout) giải phóng khi release().
+        """
+        resource = _Resource(owner, kind, name, obj, size, cap, trim, close)
+        with self._state_lock:
+            self._resources.append(resource)
+        return obj
+
+    def on_memory_pressure(self, handler):
+        """handler() được gọi khi RSS vượt max_rss_mb (ví dụ xóa cache)"""
+        self._pressure_handlers.append(handler)
+
+    def resources(self, owner=None):
+        with self._state_lock:
+            return [r for r in self._resources if owner is None or r.owner == owner]
+
+    def release(self, owner, timeout=5.0):
+        """Giải phóng mọi tài nguyên của owner theo thứ tự ngược lúc đăng ký.
+
+        Trả về [(kind, name, kích thước còn lại)] cho tài nguyên chưa được giải phóng
+        (thread còn chạy, executor còn worker, cache còn phần tử).
+        """
+        with self._state_lock:
+            owned = [r for r in self._resources if r.owner == owner]
+            self._resources = [r for r in self._resources if r.owner != owner]
+        leftovers = []
+        for resource in reversed(owned):
+            try:
+                if resource.close:
+                    resource.close(resource.obj, timeout)
+                else:
+                    _default_close(resource.kind, resource.obj, timeout)
+                remaining = resource.measure() if resource.kind != TABLE else 0
+            except Exception as e:
+                remaining = f"lỗi: {str(e)}"
+            if remaining:
+                leftovers.append((resource.kind, resource.name, remaining))
+        return leftovers
+
+    def _cap(self, resource):
+        return self.caps.get(resource.name, resource.cap)
+
+    def sample(self):
+        """Đo RSS và kích thước mọi tài nguyên; kết quả lưu ở last_snapshot"""
+        rss = rss_bytes()
+        now = time.time()
+        if rss is not None:
+            self.samples.append((now, rss))
+        rows = []
+        totals = {}
+        for resource in self.resources():
+            try:
+                size = resource.measure()
+            except Exception as e:
+                size = None
+                print(f"ResourceGuard: không đo được {resource.name}: {str(e)}")
+            rows.append({
+                'owner': resource.owner,
+                'kind': resource.kind,
+                'name': resource.name,
+                'size': size,
+                'cap': self._cap(resource),
+            })
+            if size is not None:
+                totals[resource.kind] = totals.get(resource.kind, 0) + size
+        self.last_snapshot = {
+            'sampled_at': now,
+            'rss_bytes': rss,
+            'max_rss_mb': self.max_rss_mb,
+            'rss_growth_mb_per_hour': self.rss_growth_per_hour(),
+            'live_threads': threading.active_count(),
+            'totals': totals,
+            'resources': rows,
+            'trims': self.trims,
+            'cap_violations': self.cap_violations,
+            'pressure_events': self.pressure_events,
+        }
+        return self.last_snapshot
+
+    def rss_growth_per_hour(self):
+        """Tốc độ tăng RSS (MB/giờ) giữa mẫu cũ nhất và mới nhất"""
+        if len(self.samples) < 2:
+            return None
+        (t0, rss0), (t1, rss1) = self.samples[0], self.samples[-1]
+        if t1 <= t0:
+            return None
+        return (rss1 - rss0) / (1024 * 1024) / ((t1 - t0) / 3600)
+
+    def enforce(self):
+        """Cắt các tài nguyên vượt giới hạn; gọi các handler nếu RSS vượt max_rss_mb"""
+        for resource in self.resources():
+            cap = self._cap(resource)
+            if cap is None:
+                continue
+            try:
+                if resource.measure() <= cap:
+                    continue
+                self.cap_violations += 1
+                if resource.trim:
+                    resource.trim(resource.obj, cap)
+                    self.trims += 1
+            except Exception as e:
+                print(f"ResourceGuard: lỗi khi cắt {resource.name}: {str(e)}")
+        if self.max_rss_mb and self.samples and self.samples[-1][1] > self.max_rss_mb * 1024 * 1024:
+            self.pressure_events += 1
+            print(f"ResourceGuard: RSS {self.samples[-1][1] / (1024 * 1024):.0f} MB vượt giới hạn {self.max_rss_mb} MB")
+            for handler in self._pressure_handlers:
+                try:
+                    handler()
+                except Exception as e:
+                    print(f"ResourceGuard: lỗi trong handler memory pressure: {str(e)}")
+
+    def start(self, interval=None):
+        """Chạy sample() + enforce() định kỳ ở thread riêng (chế độ không có GUI)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        interval = interval or self.sample_interval
+
+        def run():
+            while True:
+                self.sample()
+                self.enforce()
+                if self._stop.wait(interval):
+                    break
+
+        self._thread = threading.Thread(target=run, name="ResourceGuard", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,139 @@
+import threading
+
+from db_pool import DatabasePool
+from profiler import profiled
+
+# Giá trị mặc định và kiểu của từng cấu hình trong bảng settings
+FILTER_DEFAULTS = {
+    'max_replies': 50,
+    'min_views': 0,
+    'skip_replies': True,
+    'skip_retweets': True,
+    'skip_japanese': False,
+    'auto_like': True,
+    'auto_follow_verified': False,
+    'auto_retweet': False,
+    'japanese_only': False,
+    'reply_first_only': False,
+    'minimize_window': False,
+    'time_limit_hours': 24,
+    'time_limit_minutes': 0,
+    'interval': 30,
+    'reply_interval': 0,
+}
+
+SCHEDULE_DEFAULTS = {
+    'schedule_enabled': False,
+    'start_time': '09:00',
+    'end_time': '17:00',
+    'schedule_days': ['0', '1', '2', '3', '4', '5', '6'],
+}
+
+
+def _to_bool(value, default):
+    if value is None or value == '':
+        return default
+    try:
+        return bool(int(value))
+    except (TypeError, ValueError):
+        return str(value).lower() in ('true', 'yes', 'on')
+
+
+def _to_int(value, default):
+    if value is None or value == '':
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_settings(raw):
+    """Chuyển một dòng settings (dict giá trị thô từ database) thành snapshot đã đúng kiểu.
+
+    Snapshot gồm 'filters' (dùng cho filter_settings của bot) và các khóa lịch chạy.
+    """
+    raw = raw or {}
+    filters = {}
+    for key, default in FILTER_DEFAULTS.items():
+        if isinstance(default, bool):
+            filters[key] = _to_bool(raw.get(key), default)
+        else:
+            filters[key] = _to_int(raw.get(key), default)
+
+    schedule_days = raw.get('schedule_days') or ','.join(SCHEDULE_DEFAULTS['schedule_days'])
+    return {
+        'filters': filters,
+        'schedule_enabled': _to_bool(raw.get('schedule_enabled'), SCHEDULE_DEFAULTS['schedule_enabled']),
+        'start_time': raw.get('start_time') or SCHEDULE_DEFAULTS['start_time'],
+        'end_time': raw.get('end_time') or SCHEDULE_DEFAULTS['end_time'],
+        'schedule_days': [day.strip() for day in str(schedule_days).split(',') if day.strip()],
+        'found': bool(raw),
+    }
+
+
+class SettingsCache:
+    """Cache cấu hình theo profile_id trong bộ nhớ.
+
+    Snapshot được đọc từ database một lần rồi dùng lại; GUI gọi invalidate()
+    khi lưu cấu hình để lần đọc sau lấy giá trị mới. Mỗi lần invalidate tăng
+    version của profile để bot biết cần áp dụng lại cấu hình.
+    Mỗi đường dẫn database có một cache duy nhất.
+    """
+    _instances = {}
+    _lock = threading.Lock()
+
+    def __new__(cls, db_path='settings.db'):
+        with cls._lock:
+            instance = cls._instances.get(db_path)
+            if instance is None:
+                instance = super().__new__(cls)
+                instance.init_cache(db_path)
+                cls._instances[db_path] = instance
+            return instance
+
+    def init_cache(self, db_path):
+        self.db_path = db_path
+        self._snapshots = {}
+        self._versions = {}
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @profiled("db.settings_load")
+    def _load(self, profile_id):
+        conn = DatabasePool(self.db_path).connection()
+        cursor = conn.execute("SELECT * FROM settings WHERE profile_id = ?", (profile_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return {}
+        # Dòng sqlite3 mặc định là tuple: ghép với tên cột để thành dict
+        return dict(zip([column[0] for column in cursor.description], row))
+
+    def get(self, profile_id):
+        """Trả về snapshot cấu hình (không được sửa trực tiếp) của profile"""
+        snapshot = self._snapshots.get(profile_id)
+        if snapshot is not None:
+            self.hits += 1
+            return snapshot
+        self.misses += 1
+        version = self.version(profile_id)
+        snapshot = parse_settings(self._load(profile_id))
+        with self._cache_lock:
+            # Bỏ qua kết quả nếu cấu hình vừa bị invalidate trong lúc đang đọc
+            if self._versions.get(profile_id, 0) == version:
+                self._snapshots[profile_id] = snapshot
+        return snapshot
+
+    def version(self, profile_id):
+        return self._versions.get(profile_id, 0)
+
+    def invalidate(self, profile_id=None):
+        """Báo cấu hình đã thay đổi (None = mọi profile)"""
+        with self._cache_lock:
+            profile_ids = [profile_id] if profile_id is not None else list(
+                set(self._snapshots) | set(self._versions)
+            )
+            for pid in profile_ids:
+                self._snapshots.pop(pid, None)
+                self._versions[pid] = self._versions.get(pid, 0) + 1
@@ -0,0 +1,74 @@
+import os
+import sys
+import time
+
+from lazy_import import IMPORT_TIMES, is_available
+
+# Ngân sách thời gian từ lúc bắt đầu import tới khung hình đầu tiên của cửa sổ chính
+STARTUP_BUDGET_MS = 1500
+
+# Thư viện tùy chọn: {module: package pip}
+OPTIONAL_PACKAGES = {
+    'selenium': 'selenium',
+    'google.generativeai': 'google-generativeai',
+    'openai': 'openai',
+    'langdetect': 'langdetect',
+    'requests': 'requests',
+    'bs4': 'beautifulsoup4',
+    'dotenv': 'python-dotenv',
+}
+
+
+def timing_enabled(argv=None):
+    """Bật đo thời gian khởi động bằng --startup-timing hoặc biến môi trường STARTUP_TIMING=1"""
+    argv = sys.argv if argv is None else argv
+    return '--startup-timing' in argv or os.environ.get('STARTUP_TIMING') == '1'
+
+
+def missing_packages():
+    """Các package tùy chọn chưa được cài"""
+    return [package for module, package in OPTIONAL_PACKAGES.items() if not is_available(module)]
+
+
+class StartupTimer:
+    """Đánh dấu các mốc khởi động (ms kể từ khi tạo timer) và báo cáo khi có khung hình đầu tiên"""
+    def __init__(self, enabled=None, budget_ms=STARTUP_BUDGET_MS):
+        self.started = time.perf_counter()
+        self.enabled = timing_enabled() if enabled is None else enabled
+        self.budget_ms = budget_ms
+        self.marks = []
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def mark(self, label):
+        self.marks.append((label, self.elapsed_ms()))
+
+    def first_frame(self):
+        """Gọi khi cửa sổ chính đã hiện; in báo cáo nếu bật đo hoặc vượt ngân sách"""
+        self.mark("first frame")
+        total_ms = self.marks[-1][1]
+        if self.enabled:
+            print(self.report())
+        elif total_ms > self.budget_ms:
+            print(f"Khởi động chậm: {total_ms:.0f} ms (ngân sách {self.budget_ms} ms), "
+                  f"chạy với --startup-timing để xem chi tiết")
+        return total_ms
+
+    def report(self):
+        lines = ["Startup timing:"]
+        previous = 0.0
+        for label, at_ms in self.marks:
+            lines.append(f"  {label:<24} {at_ms:8.1f} ms  (+{at_ms - previous:.1f})")
+            previous = at_ms
+        total_ms = self.marks[-1][1] if self.marks else self.elapsed_ms()
+        status = "OK" if total_ms <= self.budget_ms else "VƯỢT NGÂN SÁCH"
+        lines.append(f"  Tổng: {total_ms:.1f} ms / {self.budget_ms} ms [{status}]")
+        if IMPORT_TIMES:
+            lines.append("  Lazy imports:")
+            for module, import_ms in sorted(IMPORT_TIMES.items(), key=lambda item: -item[1]):
+                lines.append(f"    {module:<40} {import_ms:8.1f} ms")
+        missing = missing_packages()
+        if missing:
+            lines.append(f"  Chưa cài (tính năng tương ứng bị tắt): {', '.join(missing)}")
+        return "\n".join(lines)
@@ -0,0 +1,173 @@
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from db_pool import DatabasePool
+from log_pipeline import level_counts
+from log_writer import LogWriter
+from profiler import Profiler
+from queries import QueryRepository
+from resource_guard import ResourceGuard
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+def _arg_value(argv, flag):
+    if flag in argv:
+        index = argv.index(flag)
+        if index + 1 < len(argv):
+            return argv[index + 1]
+    return None
+
+
+def status_endpoint_requested(argv=None):
+    """Cổng/Unix socket của status endpoint từ --status-port/--status-socket
+    hoặc biến môi trường STATUS_PORT/STATUS_SOCKET; (None, None) nếu không bật"""
+    argv = sys.argv if argv is None else argv
+    port = _arg_value(argv, '--status-port') or os.environ.get('STATUS_PORT')
+    unix_socket = _arg_value(argv, '--status-socket') or os.environ.get('STATUS_SOCKET')
+    return (int(port) if port else None), unix_socket
+
+
+def collect_status(started_at, sources=None, db_path='settings.db'):
+    """Tình trạng tóm tắt: uptime, độ sâu hàng đợi và số lỗi. Chỉ đọc số liệu trong bộ nhớ"""
+    counts = level_counts()
+    log_writer = LogWriter(db_path).stats()
+    pool = DatabasePool(db_path).metrics()
+    status = {
+        'pid': os.getpid(),
+        'started_at': datetime.fromtimestamp(started_at).isoformat(timespec='seconds'),
+        'uptime_seconds': round(time.time() - started_at, 1),
+        'queues': {
+            'log_writer': {key: log_writer[key] for key in ('queue_depth', 'queue_max', 'running')},
+            'journal_pending': log_writer.get('journal_pending', 0),
+        },
+        'errors': {
+            'log_error': counts.get('ERROR', 0),
+            'log_warning': counts.get('WARNING', 0),
+            'log_write_failed': log_writer['failed'],
+            'log_dropped': log_writer['dropped'],
+            'db_pool_timeouts': pool['timeouts'],
+        },
+        'log_levels': counts,
+    }
+    for name, source in (sources or {}).items():
+        try:
+            status[name] = source()
+        except Exception as e:
+            status[name] = {'error': str(e)}
+    return status
+
+
+def collect_metrics(started_at, sources=None, db_path='settings.db'):
+    """Tình trạng tóm tắt cộng histogram thời gian truy vấn, pool kết nối, profiler và tài nguyên"""
+    metrics = collect_status(started_at, sources, db_path)
+    metrics['log_writer'] = LogWriter(db_path).stats()
+    metrics['db'] = {
+        'pool': DatabasePool(db_path).metrics(),
+        # Truy vấn chưa chạy lần nào không có số liệu
+        'queries': [row for row in QueryRepository(db_path).stats() if row['count']],
+    }
+    profiler = Profiler()
+    metrics['profiler'] = {
+        'enabled': profiler.enabled,
+        'timings': profiler.snapshot() if profiler.enabled else [],
+    }
+    # Lần đo gần nhất (do timer GUI hoặc thread ResourceGuard thực hiện)
+    metrics['resources'] = ResourceGuard().last_snapshot
+    return metrics
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    """Chỉ đọc: GET /status, /metrics và /health; phương thức khác trả về 501"""
+    server_version = "X2ModernStatus/1.0"
+
+    def do_GET(self):
+        status_server = self.server.status_server
+        path = self.path.split('?', 1)[0].rstrip('/') or '/'
+        if path in ('/', '/status'):
+            body = collect_status(status_server.started_at, status_server.sources, status_server.db_path)
+        elif path == '/metrics':
+            body = collect_metrics(status_server.started_at, status_server.sources, status_server.db_path)
+        elif path == '/health':
+            body = {'ok': True}
+        else:
+            self.send_error(404)
+            return
+        data = json.dumps(body, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Không ghi log cho mỗi request: endpoint được poll thường xuyên
+        pass
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class StatusServer:
+    """Endpoint trạng thái chỉ đọc trên localhost hoặc Unix socket, chạy ở thread riêng.
+
+    add_source(name, fn) thêm một mục vào /status (ví dụ danh sách bot); fn được gọi
+    ở thread của server nên chỉ nên đọc các giá trị sẵn có trong bộ nhớ.
+    """
+    def __init__(self, port=DEFAULT_PORT, unix_socket=None, host=DEFAULT_HOST, db_path='settings.db'):
+        self.port = port
+        self.unix_socket = unix_socket
+        self.host = host
+        self.db_path = db_path
+        self.started_at = time.time()
+        self.sources = {}
+        self._server = None
+        self._thread = None
+
+    def add_source(self, name, fn):
+        self.sources[name] = fn
+
+    @property
+    def address(self):
+        if self._server is None:
+            return None
+        if self.unix_socket:
+            return self.unix_socket
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        if self._server is not None:
+            return self.address
+        if self.unix_socket:
+            # Socket còn sót lại từ lần chạy trước
+            if os.path.exists(self.unix_socket):
+                os.unlink(self.unix_socket)
+            server = _UnixHTTPServer(self.unix_socket, _StatusHandler)
+            os.chmod(self.unix_socket, 0o600)
+        else:
+            server = ThreadingHTTPServer((self.host, self.port), _StatusHandler)
+        server.status_server = self
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, name="StatusServer", daemon=True)
+        self._thread.start()
+        return self.address
+
+    def stop(self):
+        server, self._server = self._server, None
+        if server is None:
+            return
+        server.shutdown()
+        server.server_close()
+        self._thread.join(2.0)
+        if self.unix_socket and os.path.exists(self.unix_socket):
+            os.unlink(self.unix_socket)
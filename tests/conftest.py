@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+# Các module nằm phẳng ở thư mục gốc của repo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Đường dẫn database tạm. Các singleton gắn với db_path (pool, writer, cache...)
+    của database tạm được đóng và bỏ đi sau test"""
+    import migrations
+    from daily_stats import DailyStats
+    from db_pool import DatabasePool
+    from log_retention import LogRetention
+    from log_writer import LogWriter
+    from queries import QueryRepository
+    from settings_cache import SettingsCache
+    path = str(tmp_path / "settings.db")
+    yield path
+    DailyStats._instances.pop(path, None)
+    QueryRepository._instances.pop(path, None)
+    migrations._migrated.discard(path)
+    SettingsCache._instances.pop(path, None)
+    retention = LogRetention._instances.pop(path, None)
+    if retention is not None:
+        retention.stop()
+    writer = LogWriter._instances.pop(path, None)
+    if writer is not None:
+        writer.close()
+    pool = DatabasePool._instances.pop(path, None)
+    if pool is not None:
+        pool.close_all()
+
+
+@pytest.fixture
+def writers():
+    """Tạo LogWriter mới cho db_path (thay writer cũ của đường dẫn đó) và đóng chúng sau test"""
+    from log_writer import LogWriter
+    created = []
+
+    def factory(db_path, **kwargs):
+        LogWriter._instances.pop(db_path, None)
+        writer = LogWriter(db_path, **kwargs)
+        created.append(writer)
+        return writer
+
+    yield factory
+    for writer in created:
+        writer.close()
+        LogWriter._instances.pop(writer.db_path, None)
@@ -0,0 +1,52 @@
+import json
+import sqlite3
+
+import pytest
+
+from benchmarks import run_benchmarks, synthetic_data
+
+SMALL = ['--accounts', '3', '--logs', '300', '--replied', '40', '--posted', '5', '--days', '3',
+         '--inserts', '200', '--repeat', '2', '--lookups', '20']
+
+
+def test_generate_creates_requested_volumes(db_path):
+    volumes = synthetic_data.generate(db_path, accounts=2, logs=50, replied_per_account=10,
+                                      posted_per_account=3, days=2)
+
+    conn = sqlite3.connect(db_path)
+    counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+              for table in ('accounts', 'logs', 'replied_tweets', 'posted_tweets')}
+    conn.close()
+    assert counts == {'accounts': 2, 'logs': 50, 'replied_tweets': 20, 'posted_tweets': 6}
+    assert volumes['replied_tweets'] == 20
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = {'log_query': {
+        'p50_ms': {'value': 10.0}, 'p95_ms': {'value': 10.0}, 'ops_per_s': {'value': 100.0},
+    }}
+    results = {'log_query': {
+        'p50_ms': {'value': 11.0, 'better': 'lower'},
+        'p95_ms': {'value': 13.0, 'better': 'lower'},
+        'ops_per_s': {'value': 70.0, 'better': 'higher'},
+        'rows': {'value': 5, 'better': None},
+    }}
+
+    lines, regressions = run_benchmarks.compare(results, baseline, tolerance=20)
+    assert regressions == 2
+    assert sum('REGRESSION' in line for line in lines) == 2
+    assert len(lines) == 4
+
+
+def test_main_saves_baseline_and_compares(db_path, tmp_path):
+    baseline = str(tmp_path / "baseline.json")
+    args = SMALL + ['--db', db_path, '--baseline', baseline]
+
+    assert run_benchmarks.main(args + ['--save-baseline']) == 0
+    with open(baseline, encoding='utf-8') as f:
+        saved = json.load(f)
+    assert saved['volumes']['accounts'] == 3
+    assert saved['results']['startup_load']['accounts_loaded']['value'] == 3
+    assert 'search.p50_ms' in saved['results']['log_query']
+
+    assert run_benchmarks.main(args + ['--reuse-db', '--tolerance', '100000']) == 0
@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+pytest.importorskip('PyQt6')
+pytest.importorskip('database')
+
+from PyQt6.QtCore import QObject
+
+from log_writer import LogWriter
+from resource_guard import CACHE, THREAD, ResourceGuard
+from twitter_bot import TwitterBot
+
+
+class StubDriver:
+    current_url = "https://twitter.com/home"
+
+
+def make_bot(profile_id):
+    """TwitterBot không chạy __init__ (không cần database hay trình duyệt)"""
+    bot = TwitterBot.__new__(TwitterBot)
+    QObject.__init__(bot)
+    bot.profile_id = profile_id
+    bot.username = profile_id
+    bot.resource_owner = f"bot:{profile_id}"
+    bot.should_run = True
+    bot.force_stop = False
+    bot.driver = StubDriver()
+    bot.wait = object()
+    bot.seen_tweets = {'1': True}
+    ResourceGuard().track(bot.resource_owner, CACHE, 'seen_tweets', bot.seen_tweets)
+    return bot
+
+
+def bot_loop(bot, seen_driver):
+    # Vòng lặp của bot dùng driver cho tới khi thấy cờ dừng
+    while bot.should_run:
+        seen_driver.append(bot.driver.current_url)
+    seen_driver.append(bot.driver.current_url)
+
+
+def test_cleanup_joins_thread_before_dropping_driver():
+    bot = make_bot('cleanup-ok')
+    seen_driver = []
+    thread = threading.Thread(target=bot_loop, args=(bot, seen_driver))
+    ResourceGuard().track(bot.resource_owner, THREAD, 'worker', thread)
+    thread.start()
+
+    assert bot.cleanup(timeout=5) == []
+    assert not thread.is_alive()
+    # Thread không bao giờ thấy driver = None
+    assert seen_driver and None not in seen_driver
+    assert bot.driver is None and bot.wait is None
+    assert bot.seen_tweets == {}
+    assert ResourceGuard().resources(bot.resource_owner) == []
+
+
+def test_cleanup_keeps_driver_while_thread_still_runs():
+    bot = make_bot('cleanup-stuck')
+    release = threading.Event()
+    thread = threading.Thread(target=release.wait)
+    ResourceGuard().track(bot.resource_owner, THREAD, 'worker', thread)
+    thread.start()
+    try:
+        leftovers = bot.cleanup(timeout=0.05)
+        assert (THREAD, 'worker', 1) in leftovers
+        assert bot.driver is not None
+        assert not bot.should_run and bot.force_stop
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_cleanup_does_not_wait_for_log_flush(monkeypatch):
+    # cleanup() chạy trên thread GUI (finishStopBot): chỉ yêu cầu flush, không chờ
+    timeouts = []
+    monkeypatch.setattr(LogWriter, 'flush', lambda writer, timeout=5.0: timeouts.append(timeout))
+    bot = make_bot('cleanup-flush')
+
+    assert bot.cleanup(timeout=1) == []
+    assert timeouts == [0]
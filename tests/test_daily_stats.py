@@ -0,0 +1,90 @@
+import pytest
+
+from daily_stats import COUNTERS, HISTORY_DAY, DailyStats, _apply_deltas, ensure_stats_schema
+from db_pool import DatabasePool
+
+
+def test_record_is_written_through_log_writer(db_path, writers):
+    writer = writers(db_path, flush_interval=0.01)
+    stats = DailyStats(db_path)
+    stats.record('p1', day='2024-05-01', replies=2, likes=1)
+    stats.record('p1', day='2024-05-01', replies=1, reply_failures=1)
+    stats.record('p1', day='2024-05-02', posts=3, retweets=3)
+    stats.record('p2', day='2024-05-02', replies=5)
+    assert writer.flush()
+    totals = stats.totals('p1')
+    assert totals['replies'] == 3
+    assert totals['reply_failures'] == 1
+    assert totals['posts'] == 3
+    assert totals['retweets'] == 3
+    assert stats.totals('p1', since_day='2024-05-02')['replies'] == 0
+    by_account = stats.totals_by_account()
+    assert by_account['p2']['replies'] == 5
+    assert set(by_account) == {'p1', 'p2'}
+
+
+def test_record_rejects_unknown_counters(db_path):
+    with pytest.raises(ValueError):
+        DailyStats(db_path).record('p1', clicks=1)
+
+
+def test_apply_deltas_merges_rows_per_day(db_path):
+    conn = DatabasePool(db_path).connection()
+    ensure_stats_schema(conn)
+    zeros = [0] * (len(COUNTERS) - 1)
+    with conn:
+        _apply_deltas(conn, [
+            ['p1', '2024-05-01', 1] + zeros,
+            ['p1', '2024-05-01', 2] + zeros,
+            ['p1', '2024-05-02', 4] + zeros,
+        ])
+        _apply_deltas(conn, [['p1', '2024-05-01', 10] + zeros])
+    rows = dict(conn.execute("SELECT day, replies FROM account_daily_stats WHERE profile_id = 'p1'"))
+    assert rows == {'2024-05-01': 13, '2024-05-02': 4}
+
+
+def test_schema_seeds_history_from_account_stats_once(db_path):
+    conn = DatabasePool(db_path).connection()
+    with conn:
+        conn.execute(
+            "CREATE TABLE account_stats (profile_id TEXT, replies_sent INTEGER, likes_given INTEGER, "
+            "follows_made INTEGER, retweets INTEGER)"
+        )
+        conn.execute("INSERT INTO account_stats VALUES ('p1', 7, 3, 1, NULL)")
+    ensure_stats_schema(conn)
+    ensure_stats_schema(conn)
+    row = conn.execute(
+        "SELECT day, replies, likes, follows, retweets FROM account_daily_stats WHERE profile_id = 'p1'"
+    ).fetchall()
+    assert row == [(HISTORY_DAY, 7, 3, 1, 0)]
+
+
+def test_stats_in_journal_are_replayed(db_path, writers, monkeypatch):
+    writer = writers(db_path)
+    monkeypatch.setattr(writer, 'start', lambda: None)
+    writer._open_journal()
+    DailyStats(db_path).record('p1', day='2024-05-01', replies=4)
+    # Process "chết" trước khi số liệu được ghi
+    writer.journal.close()
+    writer._journal_open = False
+
+    restarted = writers(db_path, flush_interval=0.01)
+    restarted.start()
+    assert restarted.flush()
+    assert DailyStats(db_path).totals('p1')['replies'] == 4
+
+
+def test_one_instance_per_database(db_path, tmp_path, writers):
+    other_path = str(tmp_path / "other.db")
+    writers(db_path, flush_interval=0.01)
+    other_writer = writers(other_path, flush_interval=0.01)
+    try:
+        assert DailyStats(db_path) is DailyStats(db_path)
+        DailyStats(other_path).record('p1', day='2024-05-01', replies=2)
+        assert other_writer.flush()
+        assert DailyStats(other_path).totals('p1')['replies'] == 2
+        assert DailyStats(db_path).totals('p1')['replies'] == 0
+    finally:
+        other_writer.close()
+        DailyStats._instances.pop(other_path, None)
+        DatabasePool._instances.pop(other_path).close_all()
@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('PyQt6')
+
+from PyQt6.QtCore import QCoreApplication
+
+from data_loader import DataLoader
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def loader(app):
+    created = []
+
+    def db_factory():
+        created.append(threading.get_ident())
+        return 'db'
+
+    loader = DataLoader(db_factory)
+    loader.created = created
+    loader.loaded, loader.failed = [], []
+    loader.loaded_signal.connect(lambda key, result: loader.loaded.append((key, result)))
+    loader.failed_signal.connect(lambda key, error: loader.failed.append((key, error)))
+    yield loader
+    loader.stop()
+
+
+def process_events_until(app, condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+def test_jobs_run_on_loader_thread_with_its_own_db(app, loader):
+    ran_on = []
+
+    def job(db, value):
+        ran_on.append(threading.get_ident())
+        return (db, value * 2)
+
+    loader.request('double', job, 21)
+    assert process_events_until(app, lambda: loader.loaded)
+    assert loader.loaded == [('double', ('db', 42))]
+    assert ran_on == loader.created
+    assert ran_on[0] != threading.get_ident()
+
+
+def test_only_latest_request_per_key_runs(app, loader):
+    release = threading.Event()
+    calls = []
+
+    def blocking(db):
+        release.wait(2)
+        return 'first'
+
+    def job(db, value):
+        calls.append(value)
+        return value
+
+    loader.request('busy', blocking)
+    assert process_events_until(app, lambda: not loader.is_pending('busy'))
+    for value in range(3):
+        loader.request('accounts', job, value)
+    assert loader.is_pending('accounts')
+    release.set()
+
+    assert process_events_until(app, lambda: len(loader.loaded) == 2)
+    assert calls == [2]
+    assert loader.loaded == [('busy', 'first'), ('accounts', 2)]
+    assert len(loader.created) == 1
+
+
+def test_errors_are_reported_through_failed_signal(app, loader):
+    def broken(db):
+        raise ValueError("no such table: accounts")
+
+    loader.request('accounts', broken)
+    loader.request('ok', lambda db: 'fine')
+
+    assert process_events_until(app, lambda: loader.loaded)
+    assert loader.failed == [('accounts', "no such table: accounts")]
+    assert loader.loaded == [('ok', 'fine')]
+
+
+def test_stop_ends_thread(app, loader):
+    loader.request('ok', lambda db: 'fine')
+    assert process_events_until(app, lambda: loader.loaded)
+
+    assert loader.stop()
+    assert loader.isFinished()
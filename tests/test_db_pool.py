@@ -0,0 +1,158 @@
+import threading
+
+import pytest
+
+from db_pool import BASE_CONNECTIONS, DatabasePool, PoolTimeout, connections_for
+
+
+def _run_in_thread(fn):
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault('value', fn()))
+    thread.start()
+    thread.join()
+    return result.get('value')
+
+
+def test_connection_is_per_thread(db_path):
+    pool = DatabasePool(db_path)
+    main_conn = pool.connection()
+    assert pool.connection() is main_conn
+    other_conn = _run_in_thread(pool.connection)
+    assert other_conn is not main_conn
+    assert pool.created == 2
+
+
+def test_close_all_closes_other_threads_connections(db_path):
+    pool = DatabasePool(db_path)
+    pool.connection()
+    started, finish = threading.Event(), threading.Event()
+
+    def worker():
+        pool.connection().execute("SELECT 1")
+        started.set()
+        finish.wait(5)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    started.wait(5)
+    # Kết nối của worker được đóng từ thread chính
+    pool.close_all()
+    finish.set()
+    thread.join()
+    assert pool.closed == 2
+    assert pool.close_errors == 0
+    assert pool.metrics()['open_connections'] == 0
+
+
+def test_dead_thread_connections_are_reaped(db_path):
+    pool = DatabasePool(db_path)
+    pool.init_pool(db_path, max_connections=1, timeout=0.5)
+    _run_in_thread(lambda: pool.connection().execute("SELECT 1"))
+    # Slot duy nhất thuộc về thread đã kết thúc: connection() phải thu hồi nó
+    pool.connection().execute("SELECT 1")
+    assert pool.closed == 1
+    assert pool.close_errors == 0
+
+
+def test_failed_close_keeps_slot(db_path):
+    pool = DatabasePool(db_path)
+    pool.init_pool(db_path, max_connections=1, timeout=0.1)
+
+    class BrokenConnection:
+        def close(self):
+            raise RuntimeError("boom")
+
+    assert pool._acquire_slot()
+    assert pool._close(BrokenConnection()) is False
+    assert pool.closed == 0
+    assert pool.close_errors == 1
+    # Slot không được trả lại nên không thể mở thêm kết nối
+    assert not pool._acquire_slot()
+
+
+def test_close_thread_connection(db_path):
+    pool = DatabasePool(db_path)
+    pool.connection()
+    pool.close_thread_connection()
+    assert pool.metrics()['open_connections'] == 0
+    assert pool.closed == 1
+
+
+def _hold_connections(pool, count):
+    """count thread, mỗi thread giữ một kết nối tới khi release được set"""
+    opened, release = threading.Barrier(count + 1, timeout=5), threading.Event()
+    errors = []
+
+    def worker():
+        try:
+            pool.connection().execute("SELECT 1")
+        except PoolTimeout as e:
+            errors.append(e)
+        opened.wait()
+        release.wait(5)
+        pool.close_thread_connection()
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    opened.wait()
+    return threads, release, errors
+
+
+def test_default_cap_from_env(db_path, monkeypatch):
+    pool = DatabasePool(db_path)
+    monkeypatch.delenv('DB_POOL_MAX_CONNECTIONS', raising=False)
+    pool.init_pool(db_path)
+    assert pool.max_connections == BASE_CONNECTIONS
+    monkeypatch.setenv('DB_POOL_MAX_CONNECTIONS', '40')
+    pool.init_pool(db_path)
+    assert pool.max_connections == 40
+
+
+def test_size_for_accounts_fits_every_bot_thread(db_path):
+    pool = DatabasePool(db_path)
+    pool.init_pool(db_path, timeout=0.2)
+    pool.size_for_accounts(12)
+    assert pool.max_connections == connections_for(12)
+
+    threads, release, errors = _hold_connections(pool, 12)
+    pool.connection().execute("SELECT 1")  # thread GUI vẫn lấy được kết nối
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert pool.timeouts == 0
+
+
+def test_size_for_accounts_never_lowers_configured_cap(db_path):
+    pool = DatabasePool(db_path)
+    pool.init_pool(db_path, max_connections=50)
+    pool.size_for_accounts(3)
+    assert pool.max_connections == 50
+
+
+def test_raising_the_cap_wakes_waiting_threads(db_path):
+    pool = DatabasePool(db_path)
+    pool.init_pool(db_path, max_connections=1, timeout=5)
+    threads, release, errors = _hold_connections(pool, 1)
+    waiter = threading.Thread(target=lambda: pool.connection().execute("SELECT 1"))
+    waiter.start()
+    pool.set_max_connections(2)
+    waiter.join(2)
+    release.set()
+    threads[0].join()
+    assert not waiter.is_alive()
+    assert errors == []
+
+
+def test_timeout_when_cap_is_reached(db_path):
+    pool = DatabasePool(db_path)
+    pool.init_pool(db_path, max_connections=1, timeout=0.05)
+    threads, release, _ = _hold_connections(pool, 1)
+    try:
+        with pytest.raises(PoolTimeout):
+            pool.connection()
+        assert pool.timeouts == 1
+    finally:
+        release.set()
+        threads[0].join()
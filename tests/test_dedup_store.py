@@ -0,0 +1,79 @@
+import pytest
+
+from db_pool import DatabasePool
+from dedup_store import BloomFilter, ReplyDedupStore, normalize_tweet_id
+from migrations import migrate
+
+
+def insert_replied(db_path, profile_id, tweet_ids):
+    migrate(db_path)
+    conn = DatabasePool(db_path).connection()
+    with conn:
+        conn.executemany(
+            "INSERT INTO replied_tweets (profile_id, tweet_id, username) VALUES (?, ?, 'user')",
+            [(profile_id, str(tweet_id)) for tweet_id in tweet_ids]
+        )
+
+
+@pytest.mark.parametrize('value, expected', [
+    (123, 123),
+    ('123', 123),
+    (' 456?s=20 ', 456),
+    ('https://twitter.com/user/status/789?s=20', 789),
+    ('abc', None),
+    (None, None),
+    (-1, None),
+    (1 << 63, None),
+])
+def test_normalize_tweet_id(value, expected):
+    assert normalize_tweet_id(value) == expected
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for value in range(0, 2000, 2):
+        bloom.add(value)
+    assert all(value in bloom for value in range(0, 2000, 2))
+    false_positives = sum(1 for value in range(1, 2000, 2) if value in bloom)
+    assert false_positives < 50
+
+
+def test_lookup_reads_history_from_database(db_path):
+    insert_replied(db_path, 'p1', [100, 200, 300])
+    insert_replied(db_path, 'p2', [400])
+    store = ReplyDedupStore('p1', db_path=db_path, bloom_capacity=1000, sync_batch=2)
+    assert 100 in store
+    assert 'https://twitter.com/u/status/300' in store
+    # Tweet của profile khác không được tính
+    assert 400 not in store
+    assert 999 not in store
+    assert store.bloom_rejections >= 1
+
+
+def test_added_ids_are_found_without_database(db_path):
+    migrate(db_path)
+    store = ReplyDedupStore('p1', db_path=db_path, bloom_capacity=1000)
+    store.add('555')
+    lookups = store.db_lookups
+    assert 555 in store
+    assert store.db_lookups == lookups
+
+
+def test_added_ids_are_persisted(db_path):
+    store = ReplyDedupStore('p1', db_path=db_path, bloom_capacity=1000)
+    store.add('https://twitter.com/u/status/777', 'alice', 'hello')
+    store.add(777, 'alice', 'hello')
+    conn = DatabasePool(db_path).connection()
+    rows = conn.execute("SELECT profile_id, tweet_id, username, reply_text FROM replied_tweets").fetchall()
+    assert rows == [('p1', '777', 'alice', 'hello')]
+    # Store mới (process khởi động lại) đọc được từ database
+    assert 777 in ReplyDedupStore('p1', db_path=db_path, bloom_capacity=1000)
+
+
+def test_recent_ids_stay_bounded(db_path):
+    migrate(db_path)
+    store = ReplyDedupStore('p1', db_path=db_path, use_bloom=False, max_recent=10)
+    for tweet_id in range(25):
+        store.add(tweet_id)
+    assert len(store._recent) <= 10
+    assert list(store._recent) == sorted(store._recent)
@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip('PyQt6')
+pytest.importorskip('database')
+
+from headless import parse_args
+from profiler import profiling_requested
+
+
+def test_account_selection_does_not_enable_profiler():
+    argv = ['--account', 'p1', '--account', 'p2']
+    args = parse_args(argv)
+
+    assert args.profiles == ['p1', 'p2']
+    assert not args.profile
+    assert not profiling_requested(['headless.py'] + argv)
+
+
+def test_profile_flag_enables_profiler():
+    argv = ['--profile']
+    args = parse_args(argv)
+
+    assert args.profile
+    assert args.profiles is None
+    assert profiling_requested(['headless.py'] + argv)
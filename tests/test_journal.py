@@ -0,0 +1,72 @@
+import os
+
+from journal import Journal
+
+
+def test_append_read_roundtrip(tmp_path):
+    journal = Journal(str(tmp_path / 'pending'))
+    journal.open(next_seq=1)
+    assert journal.append('log', ['a']) == 1
+    assert journal.append('stats', ['p1', 1]) == 2
+    journal.close()
+    records = Journal(str(tmp_path / 'pending')).read()
+    assert records == [(1, 'log', ['a']), (2, 'stats', ['p1', 1])]
+
+
+def test_read_skips_committed_and_torn_lines(tmp_path):
+    directory = str(tmp_path / 'pending')
+    journal = Journal(directory)
+    journal.open(next_seq=1)
+    for i in range(3):
+        journal.append('log', [i])
+    journal.close()
+    # Process chết giữa lúc ghi dòng cuối
+    with open(os.path.join(directory, 'segment-000001.jsonl'), 'a', encoding='utf-8') as f:
+        f.write('[4,"log",[')
+    reader = Journal(directory)
+    assert [seq for seq, _, _ in reader.read(after_seq=1)] == [2, 3]
+    assert reader.last_seq == 3
+
+
+def test_seq_continues_after_reopen(tmp_path):
+    directory = str(tmp_path / 'pending')
+    journal = Journal(directory)
+    journal.open(next_seq=1)
+    journal.append('log', ['a'])
+    journal.close()
+    reopened = Journal(directory)
+    reopened.read()
+    reopened.open(next_seq=1)
+    assert reopened.append('log', ['b']) == 2
+    reopened.close()
+
+
+def test_checkpoint_removes_only_committed_segments(tmp_path):
+    directory = str(tmp_path / 'pending')
+    journal = Journal(directory, segment_bytes=64)
+    journal.open(next_seq=1)
+    for i in range(10):
+        journal.append('log', [f"message {i}"])
+    segments = sorted(os.listdir(directory))
+    assert len(segments) > 2
+    journal.checkpoint(committed_seq=5)
+    # Bản ghi chưa ghi vào database vẫn còn trong journal
+    assert [seq for seq, _, _ in Journal(directory).read(after_seq=5)] == list(range(6, 11))
+    assert len(os.listdir(directory)) < len(segments)
+    journal.checkpoint(committed_seq=10)
+    assert Journal(directory).read() == []
+    journal.close()
+
+
+def test_unread_segments_survive_checkpoint(tmp_path):
+    directory = str(tmp_path / 'pending')
+    old = Journal(directory)
+    old.open(next_seq=1)
+    old.append('log', ['old'])
+    old.close()
+    # Mở mà không read(): segment cũ chưa biết seq cuối nên không được xóa
+    journal = Journal(directory)
+    journal.open(next_seq=100)
+    journal.checkpoint(committed_seq=50)
+    journal.close()
+    assert [payload for _, _, payload in Journal(directory).read()] == [['old']]
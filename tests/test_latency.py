@@ -0,0 +1,35 @@
+from latency import LatencyHistogram
+
+
+def test_percentiles_use_bucket_upper_bounds():
+    histogram = LatencyHistogram(bounds_ms=[1, 10, 100])
+    for ms in [0.5] * 50 + [5] * 45 + [50] * 5:
+        histogram.record(ms / 1000)
+
+    assert histogram.count == 100
+    assert histogram.percentile(50) == 1
+    assert histogram.percentile(95) == 10
+    assert histogram.percentile(99) == 50     # không vượt quá giá trị lớn nhất
+    assert histogram.min_ms == 0.5
+
+
+def test_samples_above_last_bound_report_max():
+    histogram = LatencyHistogram(bounds_ms=[1, 10])
+    histogram.record(0.5)
+
+    assert histogram.percentile(100) == 500
+    assert LatencyHistogram().percentile(50) == 0.0
+
+
+def test_merge_adds_counts():
+    first = LatencyHistogram()
+    second = LatencyHistogram()
+    first.record(0.001)
+    second.record(0.002)
+    second.record(0.003)
+    first.merge(second)
+
+    snapshot = first.snapshot()
+    assert snapshot['count'] == 3
+    assert round(snapshot['total_ms'], 6) == 6.0
+    assert round(snapshot['max_ms'], 6) == 3.0
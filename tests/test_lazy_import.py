@@ -0,0 +1,68 @@
+import sys
+import types
+
+import pytest
+
+import browser_provider
+import lazy_import
+from lazy_import import IMPORT_TIMES, MissingDependencyError, import_optional, is_available, provider
+
+
+@pytest.fixture
+def heavy_module(tmp_path, monkeypatch):
+    """Một module 'nặng' giả, chỉ import được qua sys.path của test"""
+    (tmp_path / "lazy_heavy.py").write_text("LOADS = 1\n\ndef parse(text):\n    return text.upper()\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield 'lazy_heavy'
+    sys.modules.pop('lazy_heavy', None)
+    IMPORT_TIMES.pop('lazy_heavy', None)
+
+
+def make_provider(exports):
+    module = types.ModuleType('fake_provider')
+    module.__getattr__ = provider(module.__dict__, exports)
+    return module
+
+
+def test_provider_imports_on_first_access_and_caches(heavy_module):
+    module = make_provider({'parse': (heavy_module, 'parse', 'lazy-heavy')})
+    assert heavy_module not in sys.modules
+
+    assert module.parse('x') == 'X'
+    assert heavy_module in sys.modules
+    assert heavy_module in IMPORT_TIMES
+    # Lần truy cập sau đọc thẳng từ globals của provider
+    assert module.__dict__['parse'] is module.parse
+
+
+def test_unknown_attribute_raises_attribute_error():
+    module = make_provider({})
+    with pytest.raises(AttributeError):
+        module.missing
+
+
+def test_missing_package_names_what_to_install():
+    module = make_provider({'thing': ('lazy_not_installed.sub', 'thing', 'lazy-pkg')})
+    with pytest.raises(MissingDependencyError) as error:
+        module.thing
+    assert error.value.package == 'lazy-pkg'
+    assert 'pip install lazy-pkg' in str(error.value)
+    assert isinstance(error.value, ImportError)
+
+
+def test_import_optional_defaults_package_to_top_level_name():
+    with pytest.raises(MissingDependencyError) as error:
+        import_optional('lazy_not_installed.sub')
+    assert error.value.package == 'lazy_not_installed'
+
+
+def test_is_available_does_not_import(heavy_module):
+    assert is_available(heavy_module)
+    assert heavy_module not in sys.modules
+    assert not is_available('lazy_not_installed.sub')
+
+
+def test_providers_do_not_import_at_module_load():
+    # Provider chỉ khai báo, chưa thuộc tính nào được nạp
+    assert not set(browser_provider._EXPORTS) & set(vars(browser_provider))
+    assert browser_provider.available() == lazy_import.is_available('selenium')
@@ -0,0 +1,67 @@
+import csv
+import json
+import os
+import sqlite3
+
+import pytest
+
+pytest.importorskip('PyQt6')
+
+from log_export import export_format, stream_export
+from log_store import LogStore, ensure_log_schema
+
+
+@pytest.fixture
+def store(db_path):
+    conn = sqlite3.connect(db_path)
+    ensure_log_schema(conn)
+    with conn:
+        conn.executemany(
+            "INSERT INTO logs (timestamp, level, module, account, message) VALUES (?, ?, ?, ?, ?)",
+            [(f"2024-01-01 00:00:{i:02d}", 'ERROR' if i % 3 == 0 else 'INFO', 'Bot', 'alice', f"log {i}")
+             for i in range(25)]
+        )
+    conn.close()
+    store = LogStore(db_path)
+    yield store
+    store.close()
+
+
+def test_export_format_from_extension():
+    assert export_format('logs.CSV') == 'csv'
+    assert export_format('logs.json') == 'jsonl'
+    assert export_format('logs.jsonl') == 'jsonl'
+    assert export_format('logs.txt') == 'txt'
+
+
+def test_csv_export_writes_every_row_in_pages(store, tmp_path):
+    path = str(tmp_path / "logs.csv")
+    progress = []
+
+    assert stream_export(store, path, page_size=10, progress=progress.append) == 25
+    assert progress == [10, 20, 25]
+    with open(path, encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0][:3] == ["id", "timestamp", "level"]
+    assert len(rows) == 26
+
+
+def test_jsonl_export_applies_filters(store, tmp_path):
+    path = str(tmp_path / "errors.jsonl")
+
+    assert stream_export(store, path, filters={'level': 'ERROR'}, page_size=4) == 9
+    with open(path, encoding='utf-8') as f:
+        logs = [json.loads(line) for line in f]
+    assert len(logs) == 9
+    assert {log['level'] for log in logs} == {'ERROR'}
+
+
+def test_cancel_stops_between_pages_and_removes_file(store, tmp_path):
+    path = str(tmp_path / "logs.txt")
+    progress = []
+
+    written = stream_export(store, path, page_size=10, progress=progress.append,
+                            is_cancelled=lambda: len(progress) >= 1)
+    assert written is None
+    assert progress == [10]
+    assert not os.path.exists(path)
@@ -0,0 +1,117 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from db_pool import DatabasePool
+from log_retention import LogRetention, policies_from_env, retention_requested
+from log_store import LogStore, ensure_log_schema
+
+
+@pytest.fixture
+def retention(db_path):
+    retention = LogRetention(db_path, batch_size=2)
+    retention.pause_between_batches = 0
+    return retention
+
+
+def insert_logs(db_path, rows):
+    conn = DatabasePool(db_path).connection()
+    ensure_log_schema(conn)
+    with conn:
+        conn.executemany(
+            "INSERT INTO logs (timestamp, level, module, account, message) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+
+
+def days_ago(days):
+    return (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def test_retention_is_opt_in(monkeypatch):
+    monkeypatch.delenv('LOG_RETENTION', raising=False)
+    assert not retention_requested([])
+    assert retention_requested(['app', '--log-retention'])
+    monkeypatch.setenv('LOG_RETENTION', '1')
+    assert retention_requested([])
+
+
+def test_policies_from_env_overrides_max_age():
+    policies = policies_from_env("info=90, DEBUG=0,bad")
+    assert policies['INFO']['max_age_days'] == 90
+    assert policies['DEBUG']['max_age_days'] == 0
+    # Giới hạn số dòng giữ nguyên mặc định
+    assert policies['INFO']['max_rows'] == 2000000
+
+
+def test_old_logs_are_archived_and_still_exportable(db_path, retention):
+    insert_logs(db_path, [
+        (days_ago(40), 'INFO', 'TwitterBot', 'alice', 'old reply sent'),
+        (days_ago(35), 'INFO', 'System', None, 'old startup'),
+        (days_ago(31), 'INFO', 'TwitterBot', 'bob', 'old reply sent'),
+        (days_ago(1), 'INFO', 'TwitterBot', 'alice', 'new reply sent'),
+    ])
+    archived = retention.run_once()
+    assert archived['INFO'] == 3
+    assert LogStore(db_path).count() == 1
+    assert retention.archived_count() == 3
+    assert retention.archived_count('ERROR') == 0
+
+    rows = [row for page in retention.iter_archive_pages(page_size=2) for row in page]
+    assert [row[5] for row in rows] == ['old reply sent', 'old startup', 'old reply sent']
+
+    filtered = [row for page in retention.iter_archive_pages({'module': 'Bot', 'account': '@alice'})
+                for row in page]
+    assert [(row[4], row[5]) for row in filtered] == [('alice', 'old reply sent')]
+    assert not list(retention.iter_archive_pages({'date_range': 'Last 7 Days'}))
+
+
+def test_stream_export_includes_archive(db_path, retention, tmp_path):
+    log_export = pytest.importorskip('log_export')
+    insert_logs(db_path, [
+        (days_ago(40), 'INFO', 'System', None, 'archived'),
+        (days_ago(1), 'INFO', 'System', None, 'live'),
+    ])
+    retention.run_once()
+    path = str(tmp_path / 'logs.txt')
+    assert log_export.stream_export(LogStore(db_path), path, archive=retention) == 2
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert [line.rsplit(': ', 1)[1] for line in lines] == ['live', 'archived']
+
+
+def test_one_instance_per_database(retention, db_path, tmp_path):
+    other_path = str(tmp_path / "other.db")
+    try:
+        assert LogRetention(db_path) is retention
+        assert LogRetention(other_path).db_path == other_path
+    finally:
+        LogRetention._instances.pop(other_path, None)
+
+
+def test_existing_database_is_converted_to_incremental_vacuum(db_path, retention):
+    # Database tạo trước khi có auto_vacuum=INCREMENTAL
+    old = sqlite3.connect(db_path)
+    old.execute("CREATE TABLE settings (key TEXT PRIMARY KEY, value TEXT)")
+    old.close()
+    insert_logs(db_path, [(days_ago(40), 'INFO', 'System', None, 'archived')])
+    conn = DatabasePool(db_path).connection()
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+
+    assert retention.enable_incremental_vacuum()
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    # Lần sau không VACUUM lại
+    assert not retention.enable_incremental_vacuum()
+
+    retention.run_once()
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+
+def test_background_thread_converts_before_first_run(db_path, retention, monkeypatch):
+    calls = []
+    monkeypatch.setattr(retention._stop, 'wait', lambda timeout: bool(calls))
+    monkeypatch.setattr(retention, 'enable_incremental_vacuum', lambda: calls.append('convert'))
+    monkeypatch.setattr(retention, 'run_once', lambda: calls.append('run'))
+    retention._run()
+    assert calls == ['convert', 'run']
@@ -0,0 +1,116 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('PyQt6')
+
+from PyQt6.QtCore import Qt
+
+from log_store import LogStore
+from log_table_model import ID, LogTableModel
+
+START = datetime(2024, 1, 1)
+
+
+def insert_logs(db_path, count, level='INFO'):
+    """Thêm `count` log, timestamp tăng dần theo id"""
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                level TEXT NOT NULL,
+                module TEXT NOT NULL,
+                account TEXT,
+                message TEXT NOT NULL,
+                details TEXT
+            )
+        """)
+        first = conn.execute("SELECT COALESCE(MAX(id), 0) FROM logs").fetchone()[0] + 1
+        conn.executemany(
+            "INSERT INTO logs (timestamp, level, module, account, message) VALUES (?, ?, ?, ?, ?)",
+            [((START + timedelta(seconds=i)).isoformat(' '), level, 'Bot', 'alice', f"log {i}")
+             for i in range(first, first + count)]
+        )
+    conn.close()
+
+
+@pytest.fixture
+def store(db_path):
+    store = LogStore(db_path)
+    yield store
+    store.close()
+
+
+def ids(model):
+    return [model._rows[row][ID] for row in range(model.rowCount())]
+
+
+def test_reload_loads_only_first_page(db_path, store):
+    insert_logs(db_path, 25)
+    model = LogTableModel(store, page_size=10)
+    model.reload()
+
+    assert ids(model) == list(range(25, 15, -1))
+    assert model.canFetchMore()
+
+
+def test_fetch_more_pages_until_exhausted(db_path, store):
+    insert_logs(db_path, 25)
+    model = LogTableModel(store, page_size=10)
+    model.reload()
+
+    model.fetchMore()
+    assert model.rowCount() == 20
+    model.fetchMore()
+    assert ids(model) == list(range(25, 0, -1))
+    assert not model.canFetchMore()
+
+
+def test_data_formats_visible_cells(db_path, store):
+    insert_logs(db_path, 1, level='ERROR')
+    model = LogTableModel(store)
+    model.reload()
+
+    assert model.data(model.index(0, 0)) == '2024-01-01 00:00:01'
+    assert model.data(model.index(0, 1)) == 'ERROR'
+    assert model.data(model.index(0, 3)) == '@alice'
+    assert model.data(model.index(0, 1), Qt.ItemDataRole.ForegroundRole) is not None
+
+
+def test_refresh_inserts_new_logs_on_top(db_path, store):
+    insert_logs(db_path, 5)
+    model = LogTableModel(store, page_size=10)
+    model.reload()
+    insert_logs(db_path, 3)
+
+    assert model.refresh() == 3
+    assert ids(model) == list(range(8, 0, -1))
+    assert model.refresh() == 0
+
+
+def test_refresh_reads_only_rows_above_last_id(db_path, store):
+    insert_logs(db_path, 30)
+    model = LogTableModel(store, page_size=10)
+    model.reload()
+    assert model.last_id == 30
+    insert_logs(db_path, 2)
+
+    # fetch_since chỉ trả về các log mới, không đọc lại trang đầu
+    assert [row[ID] for row in store.fetch_since(model.last_id)] == [31, 32]
+    assert model.refresh() == 2
+    assert model.last_id == 32
+    assert model.rowCount() == 12
+
+
+def test_refresh_reloads_when_too_many_new_logs(db_path, store):
+    insert_logs(db_path, 5)
+    model = LogTableModel(store, page_size=10, max_refresh_rows=4)
+    model.reload()
+    insert_logs(db_path, 6)
+
+    model.refresh()
+    assert ids(model) == list(range(11, 1, -1))
+    assert model.last_id == 11
@@ -0,0 +1,198 @@
+from datetime import datetime
+
+from db_pool import DatabasePool
+from journal import Journal, journal_dir_for
+from log_writer import LogWriter
+
+
+def log_messages(db_path):
+    conn = DatabasePool(db_path).connection()
+    return [row[0] for row in conn.execute("SELECT message FROM logs ORDER BY id")]
+
+
+def committed_seq(db_path):
+    conn = DatabasePool(db_path).connection()
+    row = conn.execute("SELECT seq FROM journal_state WHERE name = 'log_writer'").fetchone()
+    return row[0] if row else 0
+
+
+def test_records_are_written_in_batches(db_path, writers):
+    writer = writers(db_path, batch_size=10, flush_interval=0.05)
+    for i in range(25):
+        writer.write('INFO', 'test', 'acc', f"message {i}")
+    assert writer.flush()
+    assert log_messages(db_path) == [f"message {i}" for i in range(25)]
+    assert committed_seq(db_path) == 25
+    assert writer.stats()['journal_pending'] == 0
+
+
+def test_write_keeps_record_creation_time(db_path, writers):
+    writer = writers(db_path, flush_interval=0.01)
+    created = datetime(2024, 5, 1, 12, 30, 5).timestamp()
+    writer.write('INFO', 'test', 'acc', "late", created=created)
+    assert writer.flush()
+    conn = DatabasePool(db_path).connection()
+    assert conn.execute("SELECT timestamp FROM logs").fetchone()[0] == '2024-05-01 12:30:05'
+
+
+def test_full_queue_drops_before_journaling(db_path, writers, monkeypatch):
+    writer = writers(db_path, max_queue=3)
+    # Không chạy thread writer để hàng đợi không được lấy ra
+    monkeypatch.setattr(writer, 'start', lambda: None)
+    writer._open_journal()
+    results = [writer.write('INFO', 'test', 'acc', f"message {i}") for i in range(5)]
+    assert results == [True, True, True, False, False]
+    assert writer.dropped == 2
+    writer.journal.close()
+    writer._journal_open = False
+    # Journal chỉ chứa các bản ghi đã vào hàng đợi
+    records = Journal(journal_dir_for(db_path)).read()
+    assert [seq for seq, _, _ in records] == [1, 2, 3]
+
+
+def test_journal_replayed_after_crash(db_path, writers, monkeypatch):
+    writer = writers(db_path)
+    monkeypatch.setattr(writer, 'start', lambda: None)
+    writer._open_journal()
+    for i in range(3):
+        writer.write('INFO', 'test', 'acc', f"message {i}")
+    # Process "chết" trước khi thread writer ghi lô
+    writer.journal.close()
+    writer._journal_open = False
+
+    restarted = writers(db_path, flush_interval=0.05)
+    restarted.start()
+    assert restarted.flush()
+    assert log_messages(db_path) == ["message 0", "message 1", "message 2"]
+    assert restarted.replayed == 3
+    # Phát lại lần nữa không ghi trùng
+    restarted.close()
+    again = writers(db_path, flush_interval=0.05)
+    again.start()
+    assert again.flush()
+    assert again.replayed == 0
+    assert len(log_messages(db_path)) == 3
+
+
+class FlakyConnection:
+    """Bọc kết nối SQLite để giả lập lỗi ghi.
+
+    fail_writes: số lần INSERT vào logs sẽ lỗi; broken: mọi lệnh INSERT đều lỗi
+    (database không ghi được); fail_message: bản ghi log chứa chuỗi này luôn lỗi.
+    """
+    def __init__(self, conn):
+        self._conn = conn
+        self.fail_writes = 0
+        self.broken = False
+        self.fail_message = None
+
+    def _maybe_fail(self, sql, rows):
+        if not sql.lstrip().upper().startswith('INSERT'):
+            return
+        if self.broken:
+            raise RuntimeError("disk I/O error")
+        if 'INTO LOGS' not in sql.upper():
+            return
+        if self.fail_writes:
+            self.fail_writes -= 1
+            raise RuntimeError("disk I/O error")
+        if self.fail_message is not None and any(self.fail_message in str(row) for row in rows):
+            raise RuntimeError("poison record")
+
+    def execute(self, sql, params=()):
+        self._maybe_fail(sql, [params])
+        return self._conn.execute(sql, params)
+
+    def executemany(self, sql, rows):
+        rows = list(rows)
+        self._maybe_fail(sql, rows)
+        return self._conn.executemany(sql, rows)
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, *args):
+        return self._conn.__exit__(*args)
+
+
+def start_flaky(writer, monkeypatch):
+    flaky = {}
+    connect = writer._connect
+
+    def flaky_connect():
+        flaky['conn'] = FlakyConnection(connect())
+        return flaky['conn']
+
+    monkeypatch.setattr(writer, '_connect', flaky_connect)
+    monkeypatch.setattr('log_writer.MAX_RETRY_DELAY', 0.01)
+    return flaky
+
+
+def test_failed_batch_is_retried_before_newer_records(db_path, writers, monkeypatch):
+    writer = writers(db_path, batch_size=5, flush_interval=0.01)
+    flaky = start_flaky(writer, monkeypatch)
+    writer.start()
+    assert writer.flush()
+    flaky['conn'].fail_writes = 2
+    for i in range(5):
+        writer.write('INFO', 'test', 'acc', f"first {i}")
+    for i in range(5):
+        writer.write('INFO', 'test', 'acc', f"second {i}")
+    assert writer.flush()
+    messages = log_messages(db_path)
+    # Lô lỗi không bị mất và không bị lô sau vượt qua
+    assert messages == [f"first {i}" for i in range(5)] + [f"second {i}" for i in range(5)]
+    assert writer.failed == 0
+    assert writer.retries >= 2
+    assert committed_seq(db_path) == 10
+
+
+def test_failed_batch_is_kept_in_journal_until_written(db_path, writers, monkeypatch):
+    monkeypatch.setattr('log_writer.MAX_WRITE_ATTEMPTS', 2)
+    writer = writers(db_path, batch_size=5, flush_interval=0.01)
+    flaky = start_flaky(writer, monkeypatch)
+    writer.start()
+    assert writer.flush()
+    flaky['conn'].broken = True
+    writer.write('INFO', 'test', 'acc', "lost?")
+    assert not writer.flush(timeout=0.2)
+    writer.close()
+    assert committed_seq(db_path) == 0
+    records = Journal(journal_dir_for(db_path)).read()
+    assert [payload[4] for _, _, payload in records] == ["lost?"]
+
+    # Lần chạy sau phát lại bản ghi
+    restarted = writers(db_path, flush_interval=0.01)
+    restarted.start()
+    assert restarted.flush()
+    assert log_messages(db_path) == ["lost?"]
+
+
+def test_poison_record_is_dropped_after_retries(db_path, writers, monkeypatch):
+    monkeypatch.setattr('log_writer.MAX_WRITE_ATTEMPTS', 2)
+    writer = writers(db_path, batch_size=5, flush_interval=0.01)
+    flaky = start_flaky(writer, monkeypatch)
+    writer.start()
+    assert writer.flush()
+    flaky['conn'].fail_message = "poison"
+    for message in ("ok 1", "poison", "ok 2"):
+        writer.write('INFO', 'test', 'acc', message)
+    assert writer.flush()
+    assert log_messages(db_path) == ["ok 1", "ok 2"]
+    assert writer.failed == 1
+    assert committed_seq(db_path) == 3
+
+
+def test_one_writer_per_database(db_path, tmp_path, writers):
+    other_path = str(tmp_path / "other.db")
+    writer = writers(db_path, flush_interval=0.01)
+    other = writers(other_path, flush_interval=0.01)
+
+    assert LogWriter(db_path) is writer
+    assert LogWriter(other_path) is other
+    LogWriter(other_path).write('INFO', 'Test', None, "other")
+    assert other.flush()
+    assert log_messages(other_path) == ["other"]
+    assert writer.written == 0
+    other.close()
+    DatabasePool._instances.pop(other_path).close_all()
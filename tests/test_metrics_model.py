@@ -0,0 +1,76 @@
+import random
+import statistics
+
+import pytest
+
+from metrics_model import MetricsModel, P2Quantile, StreamingMean
+
+
+def exact_quantile(values, p):
+    ordered = sorted(values)
+    return ordered[int(round(p * (len(ordered) - 1)))]
+
+
+@pytest.mark.parametrize('p', [0.5, 0.95])
+@pytest.mark.parametrize('distribution', ['uniform', 'exponential', 'lognormal'])
+def test_p2_quantile_tracks_exact_quantile(p, distribution):
+    rng = random.Random(42)
+    sample = {
+        'uniform': lambda: rng.uniform(0, 1000),
+        'exponential': lambda: rng.expovariate(1 / 200),
+        'lognormal': lambda: rng.lognormvariate(5, 0.75),
+    }[distribution]
+    values = [sample() for _ in range(20000)]
+    estimator = P2Quantile(p)
+    for value in values:
+        estimator.add(value)
+
+    exact = exact_quantile(values, p)
+    assert estimator.value == pytest.approx(exact, rel=0.05)
+
+
+def test_p2_quantile_with_few_samples_uses_sorted_values():
+    estimator = P2Quantile(0.5)
+    assert estimator.value == 0.0
+    for value in [30, 10, 20]:
+        estimator.add(value)
+    assert estimator.value == 20
+
+
+def test_streaming_mean():
+    mean = StreamingMean()
+    values = [3, 5, 10, 2]
+    for value in values:
+        mean.add(value)
+    assert mean.mean == pytest.approx(statistics.mean(values))
+
+
+def test_metrics_model_counts_and_rates():
+    model = MetricsModel()
+    model.record_tweet(True, response_time_ms=100, like=True, interaction_count=4)
+    model.record_tweet(False, response_time_ms=300, follow=True, is_verified=True, has_media=True)
+
+    snapshot = model.snapshot()
+    assert snapshot['total_processed'] == 2
+    assert snapshot['success_rate'] == 50.0
+    assert (snapshot['likes'], snapshot['follows']) == (1, 1)
+    assert (snapshot['verified_users'], snapshot['media_tweets']) == (1, 1)
+    assert snapshot['avg_response'] == 200.0
+    assert snapshot['avg_interactions'] == 2.0
+
+
+def test_snapshot_clears_dirty_flag():
+    model = MetricsModel()
+    model.snapshot()
+    assert not model.dirty
+
+    model.record_tweet(True)
+    assert model.dirty
+    model.snapshot(clear_dirty=False)
+    assert model.dirty
+    model.snapshot()
+    assert not model.dirty
+
+    model.reset()
+    assert model.dirty
+    assert model.snapshot()['total_processed'] == 0
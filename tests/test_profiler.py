@@ -0,0 +1,86 @@
+import json
+import threading
+import time
+
+import pytest
+
+from profiler import Profiler, profiled, profiling_requested
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    profiler = Profiler()
+    monkeypatch.setattr(profiler, 'enabled', True)
+    profiler.reset()
+    yield profiler
+    profiler.reset()
+
+
+def test_profiling_is_off_unless_requested(monkeypatch):
+    monkeypatch.delenv('PROFILE', raising=False)
+    assert not profiling_requested(['app'])
+    assert profiling_requested(['app', '--profile'])
+    monkeypatch.setenv('PROFILE', '1')
+    assert profiling_requested(['app'])
+
+
+def test_disabled_profiler_records_nothing(profiler, monkeypatch):
+    monkeypatch.setattr(profiler, 'enabled', False)
+    with profiler.timed('bot.reply'):
+        pass
+    profiler.record('db.query', 0.01)
+
+    assert profiler.snapshot() == []
+
+
+def test_timed_and_profiled_record_calls(profiler):
+    @profiled('work')
+    def work():
+        return 'done'
+
+    with profiler.timed('block'):
+        time.sleep(0.002)
+    assert work() == 'done'
+    assert work() == 'done'
+
+    rows = {row['name']: row for row in profiler.snapshot()}
+    assert rows['work']['count'] == 2
+    assert rows['block']['count'] == 1
+    assert rows['block']['total_ms'] >= 2
+    assert profiler.snapshot()[0]['name'] == 'block'
+
+
+def test_profiled_records_when_function_raises(profiler):
+    @profiled()
+    def broken():
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        broken()
+    assert [row['name'] for row in profiler.snapshot()] == [broken.__qualname__]
+
+
+def test_snapshot_merges_threads(profiler):
+    def worker():
+        for _ in range(10):
+            profiler.record('db.query', 0.001)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    (row,) = profiler.snapshot()
+    assert row['count'] == 40
+    assert row['total_ms'] == pytest.approx(40.0)
+
+
+def test_export_json(profiler, tmp_path):
+    profiler.record('db.query', 0.005)
+    path = tmp_path / "profile.json"
+
+    assert profiler.export_json(str(path)) == 1
+    data = json.loads(path.read_text(encoding='utf-8'))
+    assert data['timings'][0]['name'] == 'db.query'
+    assert threading.current_thread().name in data['threads']
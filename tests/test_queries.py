@@ -0,0 +1,80 @@
+import sqlite3
+
+import pytest
+
+import queries
+from db_pool import DatabasePool
+from queries import QueryRepository
+
+
+@pytest.fixture
+def repository(db_path, monkeypatch):
+    monkeypatch.setitem(queries.QUERIES, 'insert_note',
+                        "INSERT INTO notes (profile_id, body) VALUES (?, ?)")
+    monkeypatch.setitem(queries.QUERIES, 'notes',
+                        "SELECT id, body FROM notes WHERE profile_id = ? ORDER BY id")
+    conn = DatabasePool(db_path).connection()
+    with conn:
+        conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, profile_id TEXT, body TEXT)")
+    return QueryRepository(db_path)
+
+
+def test_execute_commits_and_returns_rowcount(repository, db_path):
+    assert repository.execute('insert_note', ('p1', 'hello')) == 1
+
+    # Một kết nối khác thấy dòng vừa ghi: transaction đã được commit
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT body FROM notes").fetchall() == [('hello',)]
+    conn.close()
+
+
+def test_reads_return_rows_by_column_name(repository):
+    repository.execute('insert_note', ('p1', 'first'))
+    repository.execute('insert_note', ('p1', 'second'))
+
+    rows = repository.fetch_all('notes', ('p1',))
+    assert [row['body'] for row in rows] == ['first', 'second']
+    assert repository.fetch_one('notes', ('p1',))[1] == 'first'
+    assert repository.exists('notes', ('p1',))
+    assert not repository.exists('notes', ('p2',))
+
+
+def test_row_factory_does_not_leak_into_pool_connection(repository, db_path):
+    repository.execute('insert_note', ('p1', 'hello'))
+    repository.fetch_all('notes', ('p1',))
+
+    row = DatabasePool(db_path).connection().execute("SELECT body FROM notes").fetchone()
+    assert type(row) is tuple
+
+
+def test_stats_record_every_query(repository):
+    repository.execute('insert_note', ('p1', 'hello'))
+    for _ in range(3):
+        repository.fetch_all('notes', ('p1',))
+
+    stats = {row['name']: row for row in repository.stats()}
+    assert stats['notes']['count'] == 3
+    assert stats['insert_note']['count'] == 1
+    assert stats['posted_content_exists']['count'] == 0
+    totals = [row['total_ms'] for row in repository.stats()]
+    assert totals == sorted(totals, reverse=True)
+
+
+def test_failed_query_is_still_timed(repository):
+    with pytest.raises(sqlite3.OperationalError):
+        repository.fetch_all('posted_content_exists', ('p1', 'x'))
+    assert repository.histograms['posted_content_exists'].count == 1
+
+
+def test_one_repository_per_database(repository, db_path, tmp_path):
+    other_path = str(tmp_path / "other.db")
+    try:
+        other = QueryRepository(other_path)
+        assert QueryRepository(db_path) is repository
+        assert other is not repository
+        assert other.db_path == other_path
+        with pytest.raises(sqlite3.OperationalError):
+            other.fetch_all('notes', ('p1',))  # bảng notes chỉ có trong db_path
+    finally:
+        QueryRepository._instances.pop(other_path, None)
+        DatabasePool._instances.pop(other_path).close_all()
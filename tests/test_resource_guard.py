@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+import resource_guard
+from resource_guard import CACHE, EXECUTOR, TABLE, THREAD, ResourceGuard
+
+
+@pytest.fixture
+def guard():
+    ResourceGuard._instance = None
+    guard = ResourceGuard()
+    yield guard
+    guard.stop()
+    ResourceGuard._instance = None
+
+
+def test_track_returns_object_and_lists_by_owner(guard):
+    cache = {}
+    assert guard.track('bot:1', CACHE, 'seen', cache) is cache
+    guard.track('bot:2', CACHE, 'seen', {})
+    assert [r.name for r in guard.resources('bot:1')] == ['seen']
+    assert len(guard.resources()) == 2
+
+
+def test_release_joins_threads_before_clearing_caches(guard):
+    order = []
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)
+    thread.start()
+    cache = {'a': 1}
+
+    def close_cache(obj, timeout):
+        order.append('cache')
+        obj.clear()
+
+    def close_thread(obj, timeout):
+        order.append('thread')
+        stop.set()
+        obj.join(timeout)
+
+    guard.track('bot:1', CACHE, 'seen', cache, close=close_cache)
+    guard.track('bot:1', THREAD, 'worker', thread, close=close_thread)
+    assert guard.release('bot:1', timeout=5) == []
+    # Giải phóng theo thứ tự ngược lúc đăng ký
+    assert order == ['thread', 'cache']
+    assert cache == {}
+    assert guard.resources('bot:1') == []
+
+
+def test_release_reports_leftovers(guard):
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)
+    thread.start()
+    try:
+        guard.track('bot:1', THREAD, 'worker', thread)
+        guard.track('bot:1', CACHE, 'broken', None, close=lambda obj, timeout: 1 / 0)
+        leftovers = guard.release('bot:1', timeout=0.05)
+    finally:
+        stop.set()
+        thread.join()
+    assert ('thread', 'worker', 1) in leftovers
+    assert any(name == 'broken' and str(remaining).startswith('lỗi') for _, name, remaining in leftovers)
+
+
+def test_release_shuts_down_executor(guard):
+    from concurrent.futures import ThreadPoolExecutor
+    executor = ThreadPoolExecutor(max_workers=2)
+    executor.submit(lambda: None).result()
+    guard.track('bot:1', EXECUTOR, 'pool', executor)
+    assert guard.release('bot:1') == []
+
+
+def test_enforce_trims_resources_over_cap(guard):
+    rows = list(range(10))
+    untrimmed = list(range(10))
+    guard.track('gui', TABLE, 'rows', rows, cap=4, trim=lambda obj, cap: obj.__delitem__(slice(0, len(obj) - cap)))
+    guard.track('gui', TABLE, 'no_trim', untrimmed, cap=4)
+    guard.track('gui', TABLE, 'under_cap', [1], cap=4)
+    guard.enforce()
+    assert rows == [6, 7, 8, 9]
+    # Không có trim thì chỉ đếm vi phạm
+    assert len(untrimmed) == 10
+    assert guard.trims == 1
+    assert guard.cap_violations == 2
+
+
+def test_configure_overrides_cap(guard):
+    rows = list(range(10))
+    guard.track('gui', TABLE, 'rows', rows, cap=100, trim=lambda obj, cap: obj.__delitem__(slice(cap, None)))
+    guard.configure(caps={'rows': 3})
+    guard.enforce()
+    assert rows == [0, 1, 2]
+
+
+def test_enforce_calls_pressure_handlers_over_max_rss(guard, monkeypatch):
+    calls = []
+    guard.on_memory_pressure(lambda: calls.append('cleared'))
+    monkeypatch.setattr(resource_guard, 'rss_bytes', lambda: 200 * 1024 * 1024)
+    guard.configure(max_rss_mb=100)
+    snapshot = guard.sample()
+    assert snapshot['rss_bytes'] == 200 * 1024 * 1024
+    guard.enforce()
+    assert calls == ['cleared']
+    assert guard.pressure_events == 1
+
+    guard.configure(max_rss_mb=300)
+    guard.sample()
+    guard.enforce()
+    assert calls == ['cleared']
+
+
+def test_sample_totals_by_kind(guard):
+    guard.track('bot:1', CACHE, 'a', {1: 1, 2: 2})
+    guard.track('bot:2', CACHE, 'b', {3: 3})
+    snapshot = guard.sample()
+    assert snapshot['totals'][CACHE] == 3
+    assert {row['name'] for row in snapshot['resources']} == {'a', 'b'}
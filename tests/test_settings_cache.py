@@ -0,0 +1,70 @@
+import pytest
+
+from db_pool import DatabasePool
+from settings_cache import FILTER_DEFAULTS, SettingsCache, parse_settings
+
+
+def save_settings(db_path, profile_id, **values):
+    conn = DatabasePool(db_path).connection()
+    with conn:
+        conn.execute("""CREATE TABLE IF NOT EXISTS settings (
+            profile_id TEXT PRIMARY KEY, max_replies INTEGER, skip_replies INTEGER, start_time TEXT
+        )""")
+        conn.execute(
+            "INSERT OR REPLACE INTO settings (profile_id, max_replies, skip_replies, start_time) VALUES (?, ?, ?, ?)",
+            (profile_id, values.get('max_replies'), values.get('skip_replies'), values.get('start_time'))
+        )
+
+
+@pytest.fixture
+def other_db(tmp_path):
+    path = str(tmp_path / "other.db")
+    yield path
+    SettingsCache._instances.pop(path, None)
+    DatabasePool._instances.pop(path).close_all()
+
+
+def test_parse_settings_fills_defaults_and_types():
+    snapshot = parse_settings({'max_replies': '20', 'skip_replies': '0', 'schedule_days': '1, 3'})
+
+    assert snapshot['filters']['max_replies'] == 20
+    assert snapshot['filters']['skip_replies'] is False
+    assert snapshot['filters']['interval'] == FILTER_DEFAULTS['interval']
+    assert snapshot['schedule_days'] == ['1', '3']
+    assert parse_settings(None)['start_time'] == '09:00'
+
+
+def test_get_reads_database_once_until_invalidated(db_path):
+    save_settings(db_path, 'p1', max_replies=10)
+    cache = SettingsCache(db_path)
+
+    assert cache.get('p1')['filters']['max_replies'] == 10
+    save_settings(db_path, 'p1', max_replies=99)
+    assert cache.get('p1')['filters']['max_replies'] == 10
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.invalidate('p1')
+    assert cache.version('p1') == 1
+    assert cache.get('p1')['filters']['max_replies'] == 99
+
+
+def test_invalidate_all_bumps_every_version(db_path):
+    save_settings(db_path, 'p1')
+    save_settings(db_path, 'p2')
+    cache = SettingsCache(db_path)
+    cache.get('p1')
+    cache.get('p2')
+
+    cache.invalidate()
+    assert (cache.version('p1'), cache.version('p2')) == (1, 1)
+    cache.get('p1')
+    assert cache.misses == 3
+
+
+def test_one_cache_per_database(db_path, other_db):
+    save_settings(db_path, 'p1', start_time='08:00')
+    save_settings(other_db, 'p1', start_time='22:00')
+
+    assert SettingsCache(db_path) is SettingsCache(db_path)
+    assert SettingsCache(db_path).get('p1')['start_time'] == '08:00'
+    assert SettingsCache(other_db).get('p1')['start_time'] == '22:00'
@@ -0,0 +1,28 @@
+from startup_timing import StartupTimer, timing_enabled
+
+
+def test_timing_enabled_by_flag_or_env(monkeypatch):
+    monkeypatch.delenv('STARTUP_TIMING', raising=False)
+    assert not timing_enabled(['app'])
+    assert timing_enabled(['app', '--startup-timing'])
+    monkeypatch.setenv('STARTUP_TIMING', '1')
+    assert timing_enabled(['app'])
+
+
+def test_report_lists_marks_in_order():
+    timer = StartupTimer(enabled=False, budget_ms=60000)
+    timer.mark("imports")
+    timer.mark("main window")
+    timer.first_frame()
+
+    report = timer.report()
+    assert report.index("imports") < report.index("main window") < report.index("first frame")
+    assert "[OK]" in report
+
+
+def test_first_frame_warns_only_over_budget(capsys):
+    StartupTimer(enabled=False, budget_ms=60000).first_frame()
+    assert capsys.readouterr().out == ""
+
+    StartupTimer(enabled=False, budget_ms=-1).first_frame()
+    assert "--startup-timing" in capsys.readouterr().out
@@ -0,0 +1,103 @@
+import http.client
+import json
+import socket
+
+import pytest
+
+from status_server import StatusServer, status_endpoint_requested
+
+
+@pytest.fixture
+def server(db_path):
+    server = StatusServer(port=0, db_path=db_path)
+    server.start()
+    yield server
+    server.stop()
+
+
+def request(server, method, path):
+    host, port = server.address[len("http://"):].split(':')
+    conn = http.client.HTTPConnection(host, int(port), timeout=5)
+    try:
+        conn.request(method, path)
+        response = conn.getresponse()
+        return response.status, response.getheader('Content-Type'), response.read()
+    finally:
+        conn.close()
+
+
+def test_endpoint_is_opt_in(monkeypatch):
+    monkeypatch.delenv('STATUS_PORT', raising=False)
+    monkeypatch.delenv('STATUS_SOCKET', raising=False)
+    assert status_endpoint_requested(['app']) == (None, None)
+    assert status_endpoint_requested(['app', '--status-port', '9000']) == (9000, None)
+    monkeypatch.setenv('STATUS_SOCKET', '/tmp/x2.sock')
+    assert status_endpoint_requested(['app']) == (None, '/tmp/x2.sock')
+
+
+def test_listens_on_localhost_only(server):
+    assert server.address.startswith("http://127.0.0.1:")
+
+
+def test_health_and_status(server):
+    server.add_source('bots', lambda: {'running': 2})
+
+    status, content_type, body = request(server, 'GET', '/health')
+    assert status == 200
+    assert content_type.startswith('application/json')
+    assert json.loads(body) == {'ok': True}
+
+    status, _, body = request(server, 'GET', '/status')
+    data = json.loads(body)
+    assert status == 200
+    assert data['bots'] == {'running': 2}
+    assert set(data['queues']['log_writer']) == {'queue_depth', 'queue_max', 'running'}
+    assert 'db_pool_timeouts' in data['errors']
+
+
+def test_metrics_include_pool_and_queries(server):
+    status, _, body = request(server, 'GET', '/metrics?format=json')
+    data = json.loads(body)
+
+    assert status == 200
+    assert 'checkouts' in data['db']['pool']
+    assert data['db']['queries'] == []
+    assert 'enabled' in data['profiler']
+
+
+def test_failing_source_is_reported_not_raised(server):
+    def broken():
+        raise RuntimeError("bot table locked")
+
+    server.add_source('bots', broken)
+    _, _, body = request(server, 'GET', '/status')
+    assert json.loads(body)['bots'] == {'error': "bot table locked"}
+
+
+@pytest.mark.parametrize('method', ['POST', 'PUT', 'DELETE'])
+def test_endpoint_is_read_only(server, method):
+    status, _, _ = request(server, method, '/status')
+    assert status == 501
+
+
+def test_unknown_path_is_404(server):
+    assert request(server, 'GET', '/shutdown')[0] == 404
+
+
+def test_unix_socket(db_path, tmp_path):
+    path = str(tmp_path / "status.sock")
+    server = StatusServer(unix_socket=path, db_path=db_path)
+    try:
+        assert server.start() == path
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.settimeout(5)
+        client.connect(path)
+        client.sendall(b"GET /health HTTP/1.0\r\nHost: localhost\r\n\r\n")
+        response = b""
+        while chunk := client.recv(4096):
+            response += chunk
+        client.close()
+    finally:
+        server.stop()
+    assert response.startswith(b"HTTP/1.0 200")
+    assert response.endswith(b'{"ok": true}')
@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from ttl_cache import TTLCache, make_key, ttl_cached
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_make_key_is_order_independent():
+    assert make_key({'a': 1, 'b': 2}) == make_key({'b': 2, 'a': 1})
+    assert make_key('x', 1) != make_key('x', 2)
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttl_seconds=10, clock=clock)
+    cache.put('k', 'v')
+    clock.now = 9.9
+    assert cache.get('k') == 'v'
+    clock.now = 10.0
+    assert cache.get('k') is None
+    assert cache.expirations == 1
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = TTLCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache()
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('k', loader)))
+               for _ in range(5)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert calls == [1]
+    assert results == ['value'] * 5
+
+
+def test_load_errors_are_not_cached():
+    cache = TTLCache()
+
+    def failing():
+        raise RuntimeError("api down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load('k', failing)
+    assert cache.get_or_load('k', lambda: 'ok') == 'ok'
+
+
+def test_ttl_cached_uses_key_function():
+    calls = []
+
+    @ttl_cached(key=lambda profile_id, text: (profile_id,), max_entries=10)
+    def respond(profile_id, text):
+        calls.append(text)
+        return f"{profile_id}:{text}"
+
+    assert respond('p1', 'first') == 'p1:first'
+    # Cùng key: kết quả đã cache
+    assert respond('p1', 'second') == 'p1:first'
+    assert respond('p2', 'third') == 'p2:third'
+    assert calls == ['first', 'third']
+    respond.cache.invalidate()
+    assert len(respond.cache) == 0
@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+pytest.importorskip('PyQt6')
+
+from PyQt6.QtCore import QCoreApplication
+
+from ui_batcher import UpdateBatcher
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def process_events_until(app, condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+def test_pushes_are_applied_as_one_batch(app):
+    batches = []
+    batcher = UpdateBatcher(batches.append, interval_ms=20)
+    for i in range(5):
+        batcher.push(i)
+
+    assert batches == []
+    assert process_events_until(app, lambda: batches)
+    assert batches == [[0, 1, 2, 3, 4]]
+    assert batcher.batches == 1
+
+
+def test_flush_applies_immediately_and_stops_timer(app):
+    batches = []
+    batcher = UpdateBatcher(batches.append, interval_ms=10000)
+    batcher.push('a')
+    assert batcher.timer.isActive()
+
+    batcher.flush()
+    assert batches == [['a']]
+    assert not batcher.timer.isActive()
+    batcher.flush()
+    assert batches == [['a']]
+
+
+def test_overflow_drops_oldest_items(app):
+    batches = []
+    batcher = UpdateBatcher(batches.append, max_pending=3)
+    for i in range(5):
+        batcher.push(i)
+    batcher.flush()
+
+    assert batches == [[2, 3, 4]]
+    assert batcher.dropped == 2
+
+
+def test_apply_errors_do_not_break_the_batcher(app, capsys):
+    def apply(items):
+        raise ValueError("widget deleted")
+
+    batcher = UpdateBatcher(apply)
+    batcher.push(1)
+    batcher.flush()
+    assert "widget deleted" in capsys.readouterr().out
+
+    batcher.push(2)
+    assert list(batcher.pending) == [2]
+    batcher.clear()
+    assert not batcher.pending
+    assert not batcher.timer.isActive()
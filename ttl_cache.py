@@ -0,0 +1,156 @@
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def make_key(*parts):
+    """Key ổn định (không phụ thuộc địa chỉ bộ nhớ hay thứ tự dict) từ các giá trị JSON được"""
+    data = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class _Loading:
+    """Một lần nạp đang chạy cho một key; các thread khác chờ kết quả của nó"""
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """Cache LRU có giới hạn max_entries, mỗi mục hết hạn sau ttl_seconds.
+
+    get_or_load() đảm bảo mỗi key chỉ có một lần nạp tại một thời điểm: các thread
+    cùng miss một key sẽ chờ và dùng chung kết quả (single-flight). Lỗi khi nạp
+    không được cache.
+    """
+    def __init__(self, max_entries=1024, ttl_seconds=300, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (hết hạn lúc, value)
+        self._loading = {}
+        self._lock = threading.Lock()
+        # Số liệu
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.shared_loads = 0
+
+    def _lookup(self, key):
+        """Tìm key còn hạn (gọi khi đang giữ lock)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            self.expirations += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key, value):
+        self._entries[key] = (self.clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_load(self, key, loader):
+        """Trả về giá trị đã cache hoặc gọi loader() (chỉ một thread gọi cho mỗi key)"""
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            loading = self._loading.get(key)
+            leader = loading is None
+            if leader:
+                loading = self._loading[key] = _Loading()
+            else:
+                self.shared_loads += 1
+
+        if not leader:
+            loading.done.wait()
+            if loading.error is not None:
+                raise loading.error
+            return loading.value
+
+        try:
+            loading.value = loader()
+        except BaseException as e:
+            loading.error = e
+            raise
+        else:
+            with self._lock:
+                self._store(key, loading.value)
+            return loading.value
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+            loading.done.set()
+
+    def invalidate(self, key=None):
+        """Xóa một key, hoặc toàn bộ cache nếu key=None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups * 100 if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'shared_loads': self.shared_loads,
+            }
+
+
+def ttl_cached(key, max_entries=1024, ttl_seconds=300):
+    """Decorator cache kết quả theo key(*args, **kwargs) trả về các phần tạo nên key.
+
+    key phải chọn đúng các giá trị ảnh hưởng tới kết quả (ví dụ bỏ self, chỉ lấy
+    profile_id), vì vậy không có key mặc định. Cache dùng chung cho mọi lần gọi và
+    truy cập được qua wrapper.cache.
+    """
+    def decorator(func):
+        cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return cache.get_or_load(make_key(*key(*args, **kwargs)), lambda: func(*args, **kwargs))
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
@@ -1,39 +1,41 @@
 import os
 import time
-import bs4
 import asyncio
 from database import DatabaseManager
-from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException
+from settings_cache import SettingsCache, parse_settings
+from queries import QueryRepository
+from dedup_store import ReplyDedupStore
+from daily_stats import DailyStats
+from log_writer import LogWriter
+from log_pipeline import LogPipeline, ConsoleHandler, DatabaseHandler, SignalHandler
+from profiler import profiled
+from ttl_cache import ttl_cached
+from migrations import migrate
+from resource_guard import ResourceGuard, CACHE, THREAD
+# Selenium, thư viện AI và HTTP được import khi dùng lần đầu (xem lazy_import.py)
+import browser_provider as browser
+import ai_provider as ai
+import http_provider as http
 from datetime import datetime, timedelta
-import google.generativeai as genai
-from langdetect import detect as lang_detect
 from PyQt6.QtCore import QObject, pyqtSignal, QThread
-from PyQt6.QtWidgets import QMessageBox, QGroupBox, QLineEdit
-from selenium.webdriver.chrome.options import Options
-import openai
+from PyQt6.QtWidgets import QMessageBox
 import sys
-import functools
 from typing import Dict
-import requests
 import random
-from selenium.webdriver.chrome.service import Service  # Uncomment dòng này
-from selenium.webdriver.chrome.options import Options
-import sqlite3
-from concurrent.futures import ThreadPoolExecutor
-from functools import lru_cache
-import queue
-import threading
 from urllib.parse import quote  # Thêm import này ở đầu file
 import re
 import json
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (python-dotenv là tùy chọn)
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+# Số tweet id đã xử lý giữ trong bộ nhớ cho mỗi lượt monitor_feed (tweet cũ hơn đã có
+# trong ReplyDedupStore nên bỏ khỏi bộ nhớ không gây reply trùng)
+MAX_SEEN_TWEETS = 5000
 
 # Constants
 class TwitterConstants:
@@ -53,47 +55,6 @@ class TwitterConstants:
     SELECTOR_VERIFIED_ICON = '[data-testid="icon-verified"]'
     SELECTOR_VERIFIED_BADGE = '[aria-label*="Verified"]'
 
-# Cache decorator for API responses
-def cache_api_response(ttl_seconds=300):
-    cache = {}
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            key = str(args) + str(kwargs)
-            now = time.time()
-            if key in cache:
-                result, timestamp = cache[key]
-                if now - timestamp < ttl_seconds:
-                    return result
-            result = func(*args, **kwargs)
-            cache[key] = (result, now)
-            return result
-        return wrapper
-    return decorator
-
-class DatabasePool:
-    _instance = None
-    _lock = threading.Lock()
-    
-    def __new__(cls):
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super().__new__(cls)
-                cls._instance.init_pool()
-            return cls._instance
-            
-    def init_pool(self):
-        self.pool = queue.Queue()
-        for _ in range(10):  # Tạo sẵn 10 kết nối
-            conn = sqlite3.connect('settings.db', check_same_thread=False)
-            self.pool.put(conn)
-            
-    def get_connection(self):
-        return self.pool.get()
-        
-    def return_connection(self, conn):
-        self.pool.put(conn)
-
 class TwitterBot(QObject):
     # Khai báo signals trước các phương thức
     tweet_processed_signal = pyqtSignal(str, str, str, str, str, bool, bool, bool, int, int, str, str)
@@ -112,6 +73,8 @@ class TwitterBot(QObject):
         self.main_window = main_window
         
         # Basic attributes
+        self.driver = None
+        self.wait = None
         self.is_paused = False
         self.should_run = True
         self.force_stop = False
@@ -122,7 +85,7 @@ class TwitterBot(QObject):
         self.mode_id = 1  # Mặc định là feed mode
         
         if not self.profile_id:
-            self.error_signal.emit("Không tìm thấy profile_id!")
+            self.error_log("Không tìm thấy profile_id!")
             raise ValueError("Không tìm thấy profile_id")
 
         # Load settings from database in main thread
@@ -134,13 +97,12 @@ class TwitterBot(QObject):
         self.chatgpt_key = credentials.get('chatgpt_key', '')
 
         # Initialize caches
-        self.api_cache = {}
-        self.api_cache_ttl = 300  # 5 minutes
-        self.tweet_cache = {}
         self.replied_tweets = self.load_replied_tweets()
-
-        # Initialize thread pool
-        self.thread_pool = ThreadPoolExecutor(max_workers=3)
+        # Tweet id đã xử lý trong lượt monitor_feed hiện tại (dict giữ thứ tự thêm, cũ nhất đầu tiên)
+        self.seen_tweets = {}
+        # Tài nguyên của bot được giải phóng cùng lúc trong cleanup()
+        self.resource_owner = f"bot:{self.profile_id}"
+        ResourceGuard().track(self.resource_owner, CACHE, 'seen_tweets', self.seen_tweets, cap=MAX_SEEN_TWEETS)
 
         # Khởi tạo các thuộc tính khác...
         self.user_mode = credentials.get('user_mode', False)
@@ -148,167 +110,92 @@ class TwitterBot(QObject):
         self.replied_users = set()
 
     def load_initial_settings(self):
-        """Load initial settings from database in main thread"""
+        """Load initial settings (đọc qua SettingsCache, chỉ truy vấn database lần đầu)"""
         try:
-            settings = self.db.get_settings(self.profile_id)
-            if settings:
-                # Convert database values to appropriate types
-                self.filter_settings = {
-                    'max_replies': int(settings.get('max_replies', 50)),
-                    'min_views': int(settings.get('min_views', 0)),
-                    'skip_replies': bool(int(settings.get('skip_replies', 1))),
-                    'skip_retweets': bool(int(settings.get('skip_retweets', 1))),
-                    'skip_japanese': bool(int(settings.get('skip_japanese', 0))),
-                    'auto_like': bool(int(settings.get('auto_like', 1))),
-                    'auto_follow_verified': bool(int(settings.get('auto_follow_verified', 0))),
-                    'auto_retweet': bool(int(settings.get('auto_retweet', 0))),
-                    'japanese_only': bool(int(settings.get('japanese_only', 0))),
-                    'reply_first_only': bool(int(settings.get('reply_first_only', 0))),
-                    'minimize_window': bool(int(settings.get('minimize_window', 0))),
-                    'time_limit_hours': int(settings.get('time_limit_hours', 24)),
-                    'time_limit_minutes': int(settings.get('time_limit_minutes', 0)),
-                    'interval': int(settings.get('interval', 30)),
-                    'reply_interval': int(settings.get('reply_interval', 0))
-                }
-
-                # Update instance variables from settings
-                self.time_limit_hours = self.filter_settings['time_limit_hours']
-                self.time_limit_minutes = self.filter_settings['time_limit_minutes']
-                self.interval = self.filter_settings['interval']
-                self.reply_interval = self.filter_settings['reply_interval']
-                self.should_minimize = self.filter_settings['minimize_window']
-
-                # Schedule settings
-                self.schedule_enabled = bool(int(settings.get('schedule_enabled', 0)))
-                self.start_time = settings.get('start_time', '09:00')
-                self.end_time = settings.get('end_time', '17:00')
-                self.schedule_days = settings.get('schedule_days', '0,1,2,3,4,5,6').split(',')
-
+            snapshot = SettingsCache().get(self.profile_id)
+            self.apply_settings(snapshot)
+            if snapshot['found']:
                 self.log(f"Đã tải cấu hình từ database cho {self.profile_id}")
-
         except Exception as e:
             self.log(f"Lỗi khi đọc cấu hình cho {self.profile_id}: {str(e)}")
             # Use default settings
-            self.filter_settings = {
-                'max_replies': 50,
-                'min_views': 0,
-                'skip_replies': True,
-                'skip_retweets': True,
-                'skip_japanese': False,
-                'auto_like': True,
-                'auto_follow_verified': False,
-                'auto_retweet': False,
-                'japanese_only': False,
-                'reply_first_only': False,
-                'minimize_window': False,
-                'time_limit_hours': 24,
-                'time_limit_minutes': 0,
-                'interval': 30,
-                'reply_interval': 0
-            }
-            # Set default instance variables
-            self.time_limit_hours = 24
-            self.time_limit_minutes = 0
-            self.interval = 30
-            self.reply_interval = 0
-            self.should_minimize = False
-            self.schedule_enabled = False
-            self.start_time = '09:00'
-            self.end_time = '17:00'
-            self.schedule_days = ['0','1','2','3','4','5','6']
+            self.apply_settings(parse_settings({}))
+
+    def apply_settings(self, snapshot):
+        """Áp dụng một snapshot cấu hình đã parse vào bot"""
+        self.filter_settings = dict(snapshot['filters'])
+        self.time_limit_hours = self.filter_settings['time_limit_hours']
+        self.time_limit_minutes = self.filter_settings['time_limit_minutes']
+        self.interval = self.filter_settings['interval']
+        self.reply_interval = self.filter_settings['reply_interval']
+        self.should_minimize = self.filter_settings['minimize_window']
+
+        # Schedule settings
+        self.schedule_enabled = snapshot['schedule_enabled']
+        self.start_time = snapshot['start_time']
+        self.end_time = snapshot['end_time']
+        self.schedule_days = list(snapshot['schedule_days'])
+        self._settings_version = SettingsCache().version(self.profile_id)
+
+    def current_settings(self):
+        """Snapshot cấu hình hiện tại; chỉ đọc lại database khi GUI đã báo thay đổi"""
+        cache = SettingsCache()
+        snapshot = cache.get(self.profile_id)
+        if getattr(self, '_settings_version', None) != cache.version(self.profile_id):
+            self.apply_settings(snapshot)
+        return snapshot
+
+    def update_settings(self, new_settings=None):
+        """GUI gọi khi cấu hình được lưu: bot sẽ áp dụng ở lần đọc cấu hình tiếp theo"""
+        SettingsCache().invalidate(self.profile_id)
 
     def update_settings_from_db(self):
         """Update settings from database in the current thread"""
-        db_pool = DatabasePool()
-        conn = None
         try:
-            conn = db_pool.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT * FROM settings WHERE profile_id = ?", (self.profile_id,))
-            settings = cursor.fetchone()
-            
-            if settings:
-                self.filter_settings.update({
-                    'max_replies': int(settings.get('max_replies', 50)),
-                    'min_views': int(settings.get('min_views', 0)),
-                    'skip_replies': bool(int(settings.get('skip_replies', 1))),
-                    'skip_retweets': bool(int(settings.get('skip_retweets', 1))),
-                    'skip_japanese': bool(int(settings.get('skip_japanese', 0))),
-                    'auto_like': bool(int(settings.get('auto_like', 1))),
-                    'auto_follow_verified': bool(int(settings.get('auto_follow_verified', 0))),
-                    'auto_retweet': bool(int(settings.get('auto_retweet', 0))),
-                    'japanese_only': bool(int(settings.get('japanese_only', 0))),
-                    'reply_first_only': bool(int(settings.get('reply_first_only', 0))),
-                    'minimize_window': bool(int(settings.get('minimize_window', 0))),
-                    'time_limit_hours': int(settings.get('time_limit_hours', 24)),
-                    'time_limit_minutes': int(settings.get('time_limit_minutes', 0)),
-                    'interval': int(settings.get('interval', 30)),
-                    'reply_interval': int(settings.get('reply_interval', 0))
-                })
+            SettingsCache().invalidate(self.profile_id)
+            snapshot = self.current_settings()
+            if snapshot['found']:
                 self.log(f"Đã cập nhật cấu hình từ database")
                 return True
-                
+            return False
         except Exception as e:
             self.log(f"Lỗi khi cập nhật cấu hình từ database: {str(e)}")
             return False
-            
-        finally:
-            if conn:
-                db_pool.return_connection(conn)
 
     def _initialize_signals(self):
-        """Initialize all signals"""
+        """Initialize all signals and the log pipeline"""
         try:
-            # Connect basic signals
-            self.log_signal.connect(self.log_message)
-            self.error_signal.connect(self.error_message)
+            # Mỗi log đi qua một pipeline duy nhất: console, database và GUI
+            # (qua log_signal/error_signal) mỗi nơi nhận đúng một lần
+            self.logger = LogPipeline("TwitterBot", handlers=[
+                ConsoleHandler(),
+                DatabaseHandler(),
+                SignalHandler(self.log_signal, self.error_signal),
+            ])
         except Exception as e:
             print(f"Error initializing signals: {str(e)}")
 
     def log_message(self, message):
         """Default log message handler"""
-        print(f"LOG: {message}")
-        # Lưu log vào database nếu có self.db
-        db = getattr(self, 'db', None)
-        if not db and hasattr(self, 'main_window') and hasattr(self.main_window, 'db'):
-            db = self.main_window.db
-        if db:
-            db.add_log(level="INFO", module="TwitterBot", account=getattr(self, 'username', None), message=message)
+        self.log(message)
 
     def error_message(self, message):
         """Default error message handler"""
-        print(f"ERROR: {message}")
-        db = getattr(self, 'db', None)
-        if not db and hasattr(self, 'main_window') and hasattr(self.main_window, 'db'):
-            db = self.main_window.db
-        if db:
-            db.add_log(level="ERROR", module="TwitterBot", account=getattr(self, 'username', None), message=message)
-
-    def log(self, message):
-        """Ghi log với signal và lưu vào database"""
-        if hasattr(self, 'log_signal'):
-            clean_message = message.replace(f"[@{getattr(self, 'username', '')}]", "").strip()
-            self.log_signal.emit(clean_message)
-            print(clean_message)
-            db = getattr(self, 'db', None)
-            if not db and hasattr(self, 'main_window') and hasattr(self.main_window, 'db'):
-                db = self.main_window.db
-            if db:
-                db.add_log(level="INFO", module="TwitterBot", account=getattr(self, 'username', None), message=clean_message)
+        self.error_log(message)
+
+    def _clean_message(self, message):
+        return message.replace(f"[@{getattr(self, 'username', '')}]", "").strip()
+
+    @profiled("bot.log")
+    def log(self, message, level="INFO"):
+        """Ghi log qua pipeline (console, database, GUI)"""
+        logger = getattr(self, 'logger', None)
+        if logger and logger.is_enabled_for(level):
+            logger.log(level, self._clean_message(message), account=getattr(self, 'username', None))
 
     def error_log(self, message):
-        """Ghi log lỗi với signal và lưu vào database"""
-        if hasattr(self, 'error_signal'):
-            clean_message = message.replace(f"[@{getattr(self, 'username', '')}]", "").strip()
-            error_message = f"ERROR: {clean_message}"
-            self.error_signal.emit(error_message)
-            print(error_message)
-            db = getattr(self, 'db', None)
-            if not db and hasattr(self, 'main_window') and hasattr(self.main_window, 'db'):
-                db = self.main_window.db
-            if db:
-                db.add_log(level="ERROR", module="TwitterBot", account=getattr(self, 'username', None), message=clean_message)
+        """Ghi log lỗi qua pipeline (console, database, GUI)"""
+        self.log(message, level="ERROR")
 
     def check_logged_in(self):
         """Kiểm tra xem đã đăng nhập thành công chưa"""
@@ -341,9 +228,9 @@ class TwitterBot(QObject):
                 try:
                     # Kiểm tra sự hiện diện của các element chỉ có khi đã đăng nhập
                     is_logged_in = any([
-                        len(self.driver.find_elements(By.CSS_SELECTOR, '[data-testid="SideNav_NewTweet_Button"]')) > 0,
-                        len(self.driver.find_elements(By.CSS_SELECTOR, '[data-testid="AppTabBar_Profile_Link"]')) > 0,
-                        len(self.driver.find_elements(By.CSS_SELECTOR, '[aria-label="Twitter"]')) > 0
+                        len(self.driver.find_elements(browser.By.CSS_SELECTOR, '[data-testid="SideNav_NewTweet_Button"]')) > 0,
+                        len(self.driver.find_elements(browser.By.CSS_SELECTOR, '[data-testid="AppTabBar_Profile_Link"]')) > 0,
+                        len(self.driver.find_elements(browser.By.CSS_SELECTOR, '[aria-label="Twitter"]')) > 0
                     ])
                     
                     if is_logged_in:
@@ -367,7 +254,7 @@ class TwitterBot(QObject):
         try:
             # Gọi API GPMLogin để mở profile
             url = f"http://127.0.0.1:19995/api/v3/profiles/start/{self.profile_id}"
-            response = requests.get(url)
+            response = http.requests.get(url)
             
             if response.status_code != 200:
                 raise Exception(f"Không thể mở profile {self.profile_id}: {response.text}")
@@ -379,11 +266,11 @@ class TwitterBot(QObject):
                 raise Exception(f"Không nhận được debug port từ GPMLogin")
             
             # Cấu hình remote debugging
-            options = Options()
+            options = browser.Options()
             options.debugger_address = f"127.0.0.1:{debug_port}"
             
             # Kết nối tới browser đã mở
-            self.driver = webdriver.Chrome(options=options)
+            self.driver = browser.webdriver.Chrome(options=options)
             
             # Set window size nếu cần
             if self.should_minimize:
@@ -396,15 +283,6 @@ class TwitterBot(QObject):
             self.error_log(f"Lỗi khi setup driver: {str(e)}")
             return False
 
-    def cleanup(self):
-        """Cleanup resources"""
-        try:
-            if hasattr(self, 'driver') and self.driver:
-                self.driver.quit()
-                self.driver = None
-        except Exception as e:
-            self.log(f"Error in cleanup: {str(e)}")
-
     def check_connection(self):
         """Kiểm tra kết nối remote debugging còn hoạt động không"""
         try:
@@ -461,14 +339,18 @@ class TwitterBot(QObject):
     def start(self):
         """Khởi động bot"""
         try:
+            # Cột/index mà các truy vấn của bot cần (chỉ chạy thật lần đầu trong process).
+            # Chạy trên thread bot: migration có thể đánh index FTS cho cả bảng logs
+            migrate()
+            
             # Kết nối với trình duyệt
             if not self.setup_driver():
-                self.error_signal.emit("Không thể khởi tạo driver cho profile " + self.profile_id)
+                self.error_log("Không thể khởi tạo driver cho profile " + self.profile_id)
                 return False
             
             # Kiểm tra đăng nhập 
             if not self.login():
-                self.error_signal.emit("Chưa đăng nhập Twitter!")
+                self.error_log("Chưa đăng nhập Twitter!")
                 return False
 
             # Nếu đã đăng nhập thành công
@@ -483,9 +365,10 @@ class TwitterBot(QObject):
             return True
             
         except Exception as e:
-            self.error_signal.emit(f"Lỗi khi khởi động bot: {str(e)}")
+            self.error_log(f"Lỗi khi khởi động bot: {str(e)}")
             return False
 
+    @profiled("bot.get_recent_tweets")
     def get_recent_tweets(self, max_tweets=50):
         """Get the most recent tweets from the feed"""
         try:
@@ -493,7 +376,7 @@ class TwitterBot(QObject):
             self.scroll_feed(scroll_count=10)  # Giới hạn 10 lần cuộn
             
             tweets = self.wait.until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'article[data-testid="tweet"]'))
+                browser.EC.presence_of_all_elements_located((browser.By.CSS_SELECTOR, 'article[data-testid="tweet"]'))
             )
             
             if not tweets:
@@ -527,7 +410,7 @@ class TwitterBot(QObject):
         try:
             # Đợi tối đa 30 giây
             return self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'article[data-testid="tweet"]'))
+                browser.EC.presence_of_element_located((browser.By.CSS_SELECTOR, 'article[data-testid="tweet"]'))
             )
         except Exception as e:
             self.log(f"Lỗi khi đợi trang tải: {str(e)}")
@@ -535,35 +418,12 @@ class TwitterBot(QObject):
     def resume(self):
         """Tiếp tục hoạt động của bot"""
         try:
-            # Đọc lại cấu hình từ database trong thread hiện tại
+            # Áp dụng cấu hình mới nhất (từ cache, đọc lại nếu GUI đã lưu thay đổi)
             try:
-                if self.main_window:
-                    settings = self.main_window.db.get_settings(self.profile_id)
-                else:
-                    settings = self.db.get_settings(self.profile_id)
-                    
-                if settings:
-                    self.filter_settings.update({
-                        'max_replies': int(settings.get('max_replies', 50)),
-                        'min_views': int(settings.get('min_views', 0)),
-                        'skip_replies': bool(int(settings.get('skip_replies', 1))),
-                        'skip_retweets': bool(int(settings.get('skip_retweets', 1))),
-                        'skip_japanese': bool(int(settings.get('skip_japanese', 0))),
-                        'auto_like': bool(int(settings.get('auto_like', 1))),
-                        'auto_follow_verified': bool(int(settings.get('auto_follow_verified', 0))),
-                        'auto_retweet': bool(int(settings.get('auto_retweet', 0))),
-                        'japanese_only': bool(int(settings.get('japanese_only', 0))),
-                        'reply_first_only': bool(int(settings.get('reply_first_only', 0))),
-                        'minimize_window': bool(int(settings.get('minimize_window', 0))),
-                        'time_limit_hours': int(settings.get('time_limit_hours', 24)),
-                        'time_limit_minutes': int(settings.get('time_limit_minutes', 0)),
-                        'interval': int(settings.get('interval', 30)),
-                        'reply_interval': int(settings.get('reply_interval', 0))
-                    })
-                    self.log(f"Đã cập nhật cấu hình từ database khi resume")
-                else:
+                if not self.current_settings()['found']:
                     self.log("Không tìm thấy cấu hình trong database khi resume!")
                     return False
+                self.log(f"Đã cập nhật cấu hình khi resume")
             except Exception as e:
                 self.log(f"Lỗi khi đọc cấu hình từ database trong resume: {str(e)}")
                 return False
@@ -608,30 +468,19 @@ class TwitterBot(QObject):
                 return self.reply_to_commenters_mode(interval)
             elif self.mode_id == 4:  # Trending mode
                 # Kiểm tra thời gian chờ trước khi tìm kiếm
-                if hasattr(self, 'main_window') and self.main_window:
-                    db = self.main_window.db
-                else:
-                    db = self.db
-                    
                 try:
-                    # Lấy cấu hình mới nhất từ database
-                    settings = db.get_settings(self.profile_id)
-                    if settings:
-                        reply_interval = int(settings.get('reply_interval', 60))  # Mặc định 60s nếu không có
+                    # Lấy cấu hình mới nhất (từ cache)
+                    settings = self.current_settings()
+                    if settings['found']:
+                        reply_interval = settings['filters']['reply_interval']
                     else:
                         reply_interval = 60  # Giá trị mặc định
                         
                     # Kiểm tra thời gian của bài đăng gần nhất
-                    cursor = db.execute_query("""
-                        SELECT posted_at FROM posted_tweets 
-                        WHERE profile_id = ? 
-                        ORDER BY posted_at DESC LIMIT 1
-                    """, (self.profile_id,))
-                    last_post = cursor.fetchone()
+                    last_post = QueryRepository().fetch_one('last_posted_epoch', (self.profile_id,))
                     
-                    if last_post:
-                        last_post_time = datetime.strptime(last_post[0], '%Y-%m-%d %H:%M:%S')
-                        time_since_last_post = (datetime.now() - last_post_time).total_seconds()
+                    if last_post and last_post['posted_at_epoch'] is not None:
+                        time_since_last_post = time.time() - last_post['posted_at_epoch']
                         
                         if time_since_last_post < reply_interval:
                             wait_time = reply_interval - time_since_last_post
@@ -662,7 +511,7 @@ class TwitterBot(QObject):
             time.sleep(3)
             
             processed_any = False  # Flag để kiểm tra xem đã xử lý tweet nào chưa
-            processed_tweets = set()  # Set để lưu ID của các tweets đã xử lý
+            self.seen_tweets.clear()
             
             # Scroll và xử lý tweets
             while True:
@@ -673,13 +522,13 @@ class TwitterBot(QObject):
                 self.scroll_feed(scroll_count=10)
                     
                 # Tìm và xử lý tweets mới
-                tweets = self.driver.find_elements(By.CSS_SELECTOR, "article[data-testid='tweet']")
+                tweets = self.driver.find_elements(browser.By.CSS_SELECTOR, "article[data-testid='tweet']")
                 
                 for tweet in tweets:
                     try:
                         # Kiểm tra xem tweet đã được xử lý chưa
                         tweet_id = self.get_tweet_id(tweet)
-                        if tweet_id in processed_tweets:
+                        if tweet_id in self.seen_tweets:
                             continue
                             
                         if self.mode_id == 4:  # Trending mode
@@ -687,12 +536,12 @@ class TwitterBot(QObject):
                                 result = self.process_trending_tweet(tweet)
                                 if result:
                                     processed_any = True
-                                    processed_tweets.add(tweet_id)
+                                    self.mark_seen(tweet_id)
                                     # Đợi reply_interval rồi tiếp tục
                                     try:
-                                        settings = self.db.get_settings(self.profile_id)
-                                        if settings:
-                                            reply_interval = int(settings.get('reply_interval', 60))
+                                        settings = self.current_settings()
+                                        if settings['found']:
+                                            reply_interval = settings['filters']['reply_interval']
                                             if reply_interval > 0:
                                                 self.log(f"Đợi {reply_interval} giây...")
                                                 time.sleep(reply_interval)
@@ -702,7 +551,7 @@ class TwitterBot(QObject):
                             if self.should_process_tweet(tweet):
                                 self.process_tweet(tweet)
                                 processed_any = True
-                                processed_tweets.add(tweet_id)
+                                self.mark_seen(tweet_id)
                     except Exception as e:
                         self.log(f"Lỗi khi xử lý tweet: {str(e)}")
                         continue  # Bỏ qua tweet lỗi và tiếp tục với tweet tiếp theo
@@ -720,34 +569,30 @@ class TwitterBot(QObject):
             self.log(f"Lỗi khi monitor feed: {str(e)}")
             return True  # Return True để tiếp tục chạy
 
+    def mark_seen(self, tweet_id):
+        """Ghi nhận tweet đã xử lý, bỏ id cũ nhất khi vượt MAX_SEEN_TWEETS"""
+        self.seen_tweets[tweet_id] = None
+        if len(self.seen_tweets) > MAX_SEEN_TWEETS:
+            del self.seen_tweets[next(iter(self.seen_tweets))]
+
+    @profiled("bot.process_trending_tweet")
     def process_trending_tweet(self, tweet_element):
         """Xử lý tweet trong mode trending"""
         try:
-            # Lấy database connection
-            if hasattr(self, 'main_window') and self.main_window:
-                db = self.main_window.db
-            else:
-                db = self.db
-                
+            queries = QueryRepository()
             try:
-                # Lấy cấu hình mới nhất từ database
-                settings = db.get_settings(self.profile_id)
-                if settings:
-                    reply_interval = int(settings.get('reply_interval', 60))  # Mặc định 60s nếu không có
+                # Lấy cấu hình mới nhất (từ cache)
+                settings = self.current_settings()
+                if settings['found']:
+                    reply_interval = settings['filters']['reply_interval']
                 else:
                     reply_interval = 60  # Giá trị mặc định
                     
                 # Kiểm tra thời gian của bài đăng gần nhất
-                cursor = db.execute_query("""
-                    SELECT posted_at FROM posted_tweets 
-                    WHERE profile_id = ? 
-                    ORDER BY posted_at DESC LIMIT 1
-                """, (self.profile_id,))
-                last_post = cursor.fetchone()
+                last_post = queries.fetch_one('last_posted_epoch', (self.profile_id,))
                 
-                if last_post:
-                    last_post_time = datetime.strptime(last_post[0], '%Y-%m-%d %H:%M:%S')
-                    time_since_last_post = (datetime.now() - last_post_time).total_seconds()
+                if last_post and last_post['posted_at_epoch'] is not None:
+                    time_since_last_post = time.time() - last_post['posted_at_epoch']
                     
                     if time_since_last_post < reply_interval:
                         wait_time = reply_interval - time_since_last_post
@@ -770,18 +615,12 @@ class TwitterBot(QObject):
                 return False
                 
             # Kiểm tra xem tweet đã được xử lý chưa
-            cursor = db.execute_query(
-                "SELECT COUNT(*) FROM posted_tweets WHERE profile_id = ? AND original_id = ?",
-                (self.profile_id, tweet_id)
-            )
-            processed = cursor.fetchone()[0]
-            
-            if processed > 0:
+            if queries.exists('posted_original_exists', (self.profile_id, tweet_id)):
                 self.log(f"Tweet {tweet_id} đã được xử lý trước đó, bỏ qua")
                 return False
 
             # Lấy nội dung tweet
-            text_element = tweet_element.find_element(By.CSS_SELECTOR, "[data-testid='tweetText']")
+            text_element = tweet_element.find_element(browser.By.CSS_SELECTOR, "[data-testid='tweetText']")
             content = text_element.text
             
             self.log(f"Đang xử lý tweet {tweet_id}: {content[:100]}...")
@@ -810,13 +649,7 @@ class TwitterBot(QObject):
                 
             if rewritten and rewritten != content:  # Kiểm tra nội dung có thay đổi không
                 # Kiểm tra nội dung trùng lặp trong database
-                cursor = db.execute_query(
-                    "SELECT COUNT(*) FROM posted_tweets WHERE profile_id = ? AND posted_content = ?",
-                    (self.profile_id, rewritten)
-                )
-                duplicate = cursor.fetchone()[0]
-                
-                if duplicate > 0:
+                if queries.exists('posted_content_exists', (self.profile_id, rewritten)):
                     self.log("Nội dung viết lại trùng với bài đã đăng trước đó, bỏ qua")
                     return False
                     
@@ -824,21 +657,13 @@ class TwitterBot(QObject):
                 if self.post_tweet(rewritten, downloaded_media if downloaded_media else None):
                     try:
                         # Lưu tweet đã xử lý vào database
-                        cursor = db.execute_query(
-                            """INSERT INTO posted_tweets 
-                               (profile_id, original_id, original_content, posted_content, posted_at) 
-                               VALUES (?, ?, ?, ?, ?)""",
-                            (self.profile_id, tweet_id, content, rewritten, 
-                             datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-                        )
-                        
-                        # Commit thay đổi vào database
-                        if hasattr(cursor, 'connection'):
-                            cursor.connection.commit()
-                        elif hasattr(db, 'conn'):
-                            db.conn.commit()
-                        elif hasattr(db, 'commit'):
-                            db.commit()
+                        posted_at = datetime.now()
+                        queries.execute('insert_posted_tweet', (
+                            self.profile_id, tweet_id, content, rewritten,
+                            posted_at.strftime('%Y-%m-%d %H:%M:%S'), int(posted_at.timestamp())
+                        ))
+                        # Bài đăng lại từ Trending Mode được tính vào thẻ Retweets trên trang Statistics
+                        self.record_daily_stats(posts=1, retweets=1)
                         
                         self.log(f"Đã xử lý và đăng lại tweet thành công")
                         
@@ -864,23 +689,39 @@ class TwitterBot(QObject):
     def get_keyword(self):
         """Lấy keyword từ UI"""
         try:
-            # Tìm keyword input trong widget của tài khoản
-            for i in range(self.main_window.accounts_layout.count()):
-                widget = self.main_window.accounts_layout.itemAt(i).widget()
-                if isinstance(widget, QGroupBox) and widget.property("profile_id") == self.profile_id:
-                    keyword_input = widget.findChild(QLineEdit, f"keyword_input_{self.profile_id}")
-                    if keyword_input:
-                        return keyword_input.text().strip()
+            # Keyword input của tài khoản được GUI đăng ký theo (profile_id, role)
+            if self.main_window is None:
+                return None
+            keyword_input = self.main_window.widget_for(self.profile_id, "keyword_input")
+            if keyword_input:
+                return keyword_input.text().strip()
             return None
         except Exception as e:
             self.log(f"Lỗi khi lấy keyword: {str(e)}")
             return None
 
-    def cleanup(self):
-        """Dọn dẹp tài nguyên"""
+    def request_stop(self):
+        """Đặt cờ dừng, không chờ: vòng lặp của bot thoát ở lần kiểm tra cờ tiếp theo"""
+        self.should_run = False
+        self.force_stop = True
+
+    def cleanup(self, timeout=10.0):
+        """Dừng bot và giải phóng tài nguyên (thread, cache...) đã đăng ký với ResourceGuard.
+
+        Gọi nhiều lần không sao; trả về danh sách tài nguyên chưa giải phóng được.
+        """
+        leftovers = []
         try:
-            if self.driver:
-                # KHÔNG quit() driver khi dùng remote debugging
+            self.request_stop()
+
+            # Thread chạy bot (đăng ký bởi BotWorker/headless) được join trước, rồi tới các cache
+            leftovers = ResourceGuard().release(self.resource_owner, timeout)
+            for kind, name, remaining in leftovers:
+                self.log(f"Chưa giải phóng được {kind} '{name}' ({remaining})", level="WARNING")
+
+            # Chỉ bỏ driver khi thread bot đã dừng, nếu không thread đó sẽ gặp driver = None
+            if not any(kind == THREAD for kind, _, _ in leftovers):
+                # KHÔNG quit() driver khi dùng remote debugging: trình duyệt thuộc về GPMLogin
                 self.driver = None
                 self.wait = None
 
@@ -889,19 +730,16 @@ class TwitterBot(QObject):
                 
             # Lưu danh sách tweet đã reply trước khi dừng
             self.save_replied_tweets()
-            
-            if hasattr(self, 'thread_pool'):
-                self.thread_pool.shutdown()
-            if hasattr(self, 'driver'):
-                self.driver = None
-            if hasattr(self, 'db_pool'):
-                while not self.db_pool.pool.empty():
-                    conn = self.db_pool.get_connection()
-                    conn.close()
+
+            # Yêu cầu ghi nốt các log còn trong hàng đợi nhưng không chờ: cleanup() chạy cả trên
+            # thread GUI, và các bản ghi đã nằm trong journal nên không mất khi thoát giữa chừng
+            LogWriter().flush(timeout=0)
             
         except Exception as e:
             self.log(f"Lỗi khi cleanup: {str(e)}")
+        return leftovers
 
+    @profiled("bot.get_tweet_id")
     def get_tweet_id(self, tweet_element):
         """Extract unique identifier for a tweet"""
         try:
@@ -911,15 +749,15 @@ class TwitterBot(QObject):
             
             try:
                 # Method 1: Get from status link
-                links = tweet_element.find_elements(By.TAG_NAME, "a")
+                links = tweet_element.find_elements(browser.By.TAG_NAME, "a")
                 links = [link.get_attribute("href") for link in links if link.get_attribute("href")]
             except:
                 pass
             
             try:
                 # Method 2: Get from time element
-                time_element = tweet_element.find_element(By.CSS_SELECTOR, 'time')
-                time_href = time_element.find_element(By.XPATH, '..').get_attribute('href')
+                time_element = tweet_element.find_element(browser.By.CSS_SELECTOR, 'time')
+                time_href = time_element.find_element(browser.By.XPATH, '..').get_attribute('href')
             except:
                 pass
 
@@ -938,6 +776,7 @@ class TwitterBot(QObject):
             self.log(f"Error getting tweet ID: {str(e)}")
             return None
 
+    @profiled("bot.get_tweet_timestamp")
     def get_tweet_timestamp(self, tweet_element):
         """Extract timestamp from a tweet"""
         try:
@@ -946,21 +785,21 @@ class TwitterBot(QObject):
             
             # Cách 1: Tìm trực tiếp thẻ time
             try:
-                time_element = tweet_element.find_element(By.CSS_SELECTOR, 'time')
+                time_element = tweet_element.find_element(browser.By.CSS_SELECTOR, 'time')
             except:
                 pass
                 
             # Cách 2: Tìm trong thẻ a chứa timestamp    
             if not time_element:
                 try:
-                    time_element = tweet_element.find_element(By.CSS_SELECTOR, 'a[href*="/status/"] time')
+                    time_element = tweet_element.find_element(browser.By.CSS_SELECTOR, 'a[href*="/status/"] time')
                 except:
                     pass
                     
             # Cách 3: Tìm theo data-testid
             if not time_element:
                 try:
-                    time_element = tweet_element.find_element(By.CSS_SELECTOR, '[data-testid="timestamp"]')
+                    time_element = tweet_element.find_element(browser.By.CSS_SELECTOR, '[data-testid="timestamp"]')
                 except:
                     pass
                     
@@ -1015,12 +854,13 @@ class TwitterBot(QObject):
             self.log(f"Lỗi khi tìm time element: {str(e)}")
             return None
 
+    @profiled("bot.is_own_tweet")
     def is_own_tweet(self, tweet_element):
         """Check if the tweet is from our own account"""
         try:
             # Tìm username trong tweet
-            username_element = tweet_element.find_element(By.CSS_SELECTOR, '[data-testid="User-Name"]')
-            username_links = username_element.find_elements(By.TAG_NAME, "a")
+            username_element = tweet_element.find_element(browser.By.CSS_SELECTOR, '[data-testid="User-Name"]')
+            username_links = username_element.find_elements(browser.By.TAG_NAME, "a")
             
             # Lấy username từ link profile (format: @username)
             for link in username_links:
@@ -1043,14 +883,15 @@ class TwitterBot(QObject):
             self.log(f"Lỗi kiểm tra tweet ownership: {str(e)}")
             return False
 
+    @profiled("bot.is_reply_tweet")
     def is_reply_tweet(self, tweet_element):
         """Check if the tweet is a reply"""
         try:
-            reply_indicators = tweet_element.find_elements(By.CSS_SELECTOR, '[data-testid="socialContext"]')
+            reply_indicators = tweet_element.find_elements(browser.By.CSS_SELECTOR, '[data-testid="socialContext"]')
             if reply_indicators:
                 return True
 
-            replying_to = tweet_element.find_elements(By.XPATH, './/*[contains(text(), "Replying to")]')
+            replying_to = tweet_element.find_elements(browser.By.XPATH, './/*[contains(text(), "Replying to")]')
             if replying_to:
                 return True
 
@@ -1089,7 +930,10 @@ class TwitterBot(QObject):
         
         return main_content
 
-    @cache_api_response(ttl_seconds=300)
+    @profiled("bot.generate_ai_response")
+    # Cache theo tài khoản, model và nội dung tweet: dùng chung một cache có giới hạn cho mọi bot
+    @ttl_cached(key=lambda self, tweet_text: (self.profile_id, bool(self.use_gemini), tweet_text),
+                max_entries=512, ttl_seconds=300)
     def generate_ai_response(self, tweet_text: str) -> str:
         """Generate AI response with caching"""
         try:
@@ -1098,7 +942,7 @@ class TwitterBot(QObject):
                 return "Hmm"
             
             try:
-                language = lang_detect(tweet_text)
+                language = ai.lang_detect(tweet_text)
                 self.log(f"Ngôn ngữ phát hiện: {language}")
             except Exception as e:
                 self.log(f"Lỗi phát hiện ngôn ngữ: {str(e)}")
@@ -1170,7 +1014,7 @@ class TwitterBot(QObject):
             # Generate response using selected AI model
             if self.use_gemini:
                 # Sử dụng Gemini API
-                import google.generativeai as genai
+                genai = ai.genai
                 genai.configure(api_key=self.gemini_key)
                 model = genai.GenerativeModel('gemini-1.5-pro')
                 response = model.generate_content(
@@ -1185,8 +1029,7 @@ class TwitterBot(QObject):
                     
             else:
                 # Sử dụng ChatGPT API
-                from openai import OpenAI
-                client = OpenAI(api_key=self.chatgpt_key)
+                client = ai.OpenAI(api_key=self.chatgpt_key)
                 response = client.chat.completions.create(
                     model="gpt-3.5-turbo",
                     messages=[
@@ -1221,11 +1064,11 @@ class TwitterBot(QObject):
             try:
                 if check_interactable:
                     element = self.wait.until(
-                        EC.element_to_be_clickable((by, value))
+                        browser.EC.element_to_be_clickable((by, value))
                     )
                 else:
                     element = self.wait.until(
-                        EC.presence_of_element_located((by, value))
+                        browser.EC.presence_of_element_located((by, value))
                     )
                     if not element.is_displayed():
                         raise Exception("Element is not visible")
@@ -1241,6 +1084,7 @@ class TwitterBot(QObject):
                 print(f"Retrying to find element... Attempt {attempt + 2}/{max_attempts}")
                 time.sleep(1)
         return None
+    @profiled("bot.like_tweet")
     def like_tweet(self, tweet_element):
         """Like a tweet before replying"""
         try:
@@ -1257,7 +1101,7 @@ class TwitterBot(QObject):
     
             for selector in selectors:
                 try:
-                    like_button = tweet_element.find_element(By.CSS_SELECTOR, selector)
+                    like_button = tweet_element.find_element(browser.By.CSS_SELECTOR, selector)
                     if like_button and like_button.is_displayed():
                         break
                 except:
@@ -1295,11 +1139,11 @@ class TwitterBot(QObject):
                 
                 for selector in liked_selectors:
                     try:
-                        unlike_button = tweet_element.find_element(By.CSS_SELECTOR, selector)
+                        unlike_button = tweet_element.find_element(browser.By.CSS_SELECTOR, selector)
                         if unlike_button:
                             self.log("Đã like tweet thành công")
                             return True
-                    except NoSuchElementException:
+                    except browser.NoSuchElementException:
                         continue
                         
                 self.log("Không thể xác nhận like thành công")
@@ -1312,6 +1156,7 @@ class TwitterBot(QObject):
         except Exception as e:
             self.log(f"Lỗi khi like tweet: {str(e)}")
             return False
+    @profiled("bot.check_verified_and_follow")
     def check_verified_and_follow(self, username, profile_link, current_url):
         """Kiểm tra verified và follow user trong tab hiện tại"""
         if self.is_paused:  # Kiểm tra pause
@@ -1323,10 +1168,10 @@ class TwitterBot(QObject):
             return False
             
             
-        # Đọc lại cấu hình từ database để đảm bảo dùng giá trị mới nhất
+        # Kiểm tra lại cấu hình mới nhất (từ cache, không truy vấn database)
         try:
-            settings = self.db.get_settings(self.profile_id)
-            if settings and not settings.get('auto_follow_verified', False):
+            settings = self.current_settings()
+            if settings['found'] and not settings['filters']['auto_follow_verified']:
                 self.log(f"Bỏ qua follow @{username} do cấu hình trong database auto_follow_verified = False")
                 return False
         except Exception as e:
@@ -1342,7 +1187,7 @@ class TwitterBot(QObject):
             
             # Đợi trang profile load xong
             try:
-                self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="primaryColumn"]')))
+                self.wait.until(browser.EC.presence_of_element_located((browser.By.CSS_SELECTOR, '[data-testid="primaryColumn"]')))
                 time.sleep(2)
             except:
                 self.log("Không thể load trang profile")
@@ -1361,7 +1206,7 @@ class TwitterBot(QObject):
                 
                 for selector in verified_selectors:
                     try:
-                        verified_badge = self.driver.find_element(By.CSS_SELECTOR, selector)
+                        verified_badge = self.driver.find_element(browser.By.CSS_SELECTOR, selector)
                         if verified_badge and verified_badge.is_displayed():
                             verified = True
                             break
@@ -1388,7 +1233,7 @@ class TwitterBot(QObject):
                         follow_button = None
                         for selector in follow_selectors:
                             try:
-                                buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                                buttons = self.driver.find_elements(browser.By.CSS_SELECTOR, selector)
                                 for button in buttons:
                                     if button.is_displayed():
                                         button_text = button.text.lower()
@@ -1425,7 +1270,7 @@ class TwitterBot(QObject):
                 else:
                     self.log(f"User @{username} không có tick xanh")
                 
-            except NoSuchElementException:
+            except browser.NoSuchElementException:
                 self.log(f"User @{username} không có tick xanh")
                 
         except Exception as e:
@@ -1473,7 +1318,7 @@ class TwitterBot(QObject):
             
             # Wait for element to be clickable
             element = self.wait.until(
-                EC.element_to_be_clickable(element)
+                browser.EC.element_to_be_clickable(element)
             )
             
             if interaction_type == "click":
@@ -1495,9 +1340,14 @@ class TwitterBot(QObject):
             self.log(f"Error interacting with element: {str(e)}")
             return False
 
+    @profiled("bot.reply_to_tweet")
     def reply_to_tweet(self, tweet_element):
         """Modified reply function with reliable element interaction"""
         reply_success = False
+        like_success = False
+        follow_success = False
+        # Tweet đã reply trước đó không phải một lần reply: không ghi số liệu
+        attempted = True
         
         # Initialize statistics tracking variables
         stats = {
@@ -1513,27 +1363,22 @@ class TwitterBot(QObject):
         start_time = time.time()
         
         try:
-            # Đọc lại cấu hình từ database trước khi xử lý
+            # Áp dụng cấu hình mới nếu GUI vừa lưu thay đổi
             try:
-                settings = self.db.get_settings(self.profile_id)
-                if settings:
-                    self.filter_settings.update({
-                        'auto_like': bool(int(settings.get('auto_like', 1))),
-                        'auto_follow_verified': bool(int(settings.get('auto_follow_verified', 0))),
-                        'auto_retweet': bool(int(settings.get('auto_retweet', 0)))
-                    })
+                self.current_settings()
             except Exception as e:
                 self.log(f"Lỗi khi đọc cấu hình từ database trong reply_to_tweet: {str(e)}")
                 
             # Lấy tweet ID ngay từ đầu
-            time_element = tweet_element.find_element(By.CSS_SELECTOR, 'time')
-            tweet_link = time_element.find_element(By.XPATH, '..').get_attribute('href')
+            time_element = tweet_element.find_element(browser.By.CSS_SELECTOR, 'time')
+            tweet_link = time_element.find_element(browser.By.XPATH, '..').get_attribute('href')
             tweet_id = tweet_link.split('/status/')[-1].split('?')[0]
             stats["tweet_id"] = tweet_id
             
             # Kiểm tra xem đã reply chưa
             if tweet_id in self.replied_tweets:
                 self.log(f"Tweet {tweet_id} đã được reply trước đó, bỏ qua")
+                attempted = False
                 return False
             
             # Lấy và lưu tất cả thông tin cần thiết NGAY TỪ ĐẦU
@@ -1543,21 +1388,21 @@ class TwitterBot(QObject):
             content = ""  # Nội dung gốc của tweet
             try:
                 # Lấy username và profile link
-                user_name_element = tweet_element.find_element(By.CSS_SELECTOR, '[data-testid="User-Name"]')
-                profile_link_element = user_name_element.find_elements(By.TAG_NAME, 'a')[0]
+                user_name_element = tweet_element.find_element(browser.By.CSS_SELECTOR, '[data-testid="User-Name"]')
+                profile_link_element = user_name_element.find_elements(browser.By.TAG_NAME, 'a')[0]
                 profile_link = profile_link_element.get_attribute('href')
                 username = profile_link.split('/')[-1]
                 stats["username"] = username
                 
                 # Kiểm tra xem user có tick xanh không
                 try:
-                    verified_badge = user_name_element.find_element(By.CSS_SELECTOR, '[data-testid="icon-verified"], [aria-label*="Verified"]')
+                    verified_badge = user_name_element.find_element(browser.By.CSS_SELECTOR, '[data-testid="icon-verified"], [aria-label*="Verified"]')
                     stats["is_verified"] = True
                 except:
                     stats["is_verified"] = False
                 
                 # Lấy nội dung tweet
-                tweet_text_element = tweet_element.find_element(By.CSS_SELECTOR, '[data-testid="tweetText"]')
+                tweet_text_element = tweet_element.find_element(browser.By.CSS_SELECTOR, '[data-testid="tweetText"]')
                 tweet_text = tweet_text_element.text
                 content = tweet_text
                 stats["content"] = content
@@ -1565,14 +1410,14 @@ class TwitterBot(QObject):
                 
                 # Kiểm tra xem tweet có media không
                 try:
-                    media_elements = tweet_element.find_elements(By.CSS_SELECTOR, '[data-testid="tweetPhoto"], [data-testid="videoPlayer"]')
+                    media_elements = tweet_element.find_elements(browser.By.CSS_SELECTOR, '[data-testid="tweetPhoto"], [data-testid="videoPlayer"]')
                     stats["has_media"] = len(media_elements) > 0
                 except:
                     stats["has_media"] = False
                 
                 # Đếm số lượng tương tác (likes, retweets, etc)
                 try:
-                    interaction_elements = tweet_element.find_elements(By.CSS_SELECTOR, '[data-testid="reply"], [data-testid="like"], [data-testid="retweet"]')
+                    interaction_elements = tweet_element.find_elements(browser.By.CSS_SELECTOR, '[data-testid="reply"], [data-testid="like"], [data-testid="retweet"]')
                     stats["interaction_count"] = len(interaction_elements)
                 except:
                     stats["interaction_count"] = 0
@@ -1585,7 +1430,7 @@ class TwitterBot(QObject):
             time.sleep(random.uniform(2, 5))
             
             # Tương tác với nút reply
-            reply_button = self.find_element_with_retry(By.CSS_SELECTOR, '[data-testid="reply"]', max_attempts=5)
+            reply_button = self.find_element_with_retry(browser.By.CSS_SELECTOR, '[data-testid="reply"]', max_attempts=5)
             if reply_button:
                 try:
                     # Cuộn đến nút reply
@@ -1603,7 +1448,7 @@ class TwitterBot(QObject):
                 return False
 
             # Tương tác với textarea để nhập nội dung reply
-            textarea = self.find_element_with_retry(By.CSS_SELECTOR, '[data-testid="tweetTextarea_0"]', max_attempts=5)
+            textarea = self.find_element_with_retry(browser.By.CSS_SELECTOR, '[data-testid="tweetTextarea_0"]', max_attempts=5)
             if textarea:
                 try:
                     # Nhập nội dung reply
@@ -1644,7 +1489,7 @@ class TwitterBot(QObject):
                 return False
 
             # Tương tác với nút gửi (tweet button)
-            tweet_button = self.find_element_with_retry(By.CSS_SELECTOR, '[data-testid="tweetButton"]', max_attempts=5)
+            tweet_button = self.find_element_with_retry(browser.By.CSS_SELECTOR, '[data-testid="tweetButton"]', max_attempts=5)
             if tweet_button:
                 try:
                     # Cuộn đến nút gửi
@@ -1659,7 +1504,7 @@ class TwitterBot(QObject):
                     reply_success = True
                     
                     # Lưu lại tweet đã reply vào danh sách
-                    self.replied_tweets.add(tweet_id)
+                    self.replied_tweets.add(tweet_id, username, final_content)
                     self.save_replied_tweets()
                     
                     # Tính thời gian phản hồi
@@ -1678,13 +1523,11 @@ class TwitterBot(QObject):
             time.sleep(2)
             
             # Kiểm tra và thực hiện like tweet nếu được cấu hình
-            like_success = False
             if self.filter_settings.get('auto_like', False):
                 self.log("Thực hiện like tweet sau khi reply...")
                 like_success = self.like_tweet(tweet_element)
             
             # Kiểm tra và thực hiện follow user nếu được cấu hình
-            follow_success = False
             current_url = self.driver.current_url
             if self.filter_settings.get('auto_follow_verified', False) and stats["is_verified"]:
                 self.log("Thực hiện follow user sau khi reply...")
@@ -1750,26 +1593,31 @@ class TwitterBot(QObject):
                     stats.get("response_time_ms", 0),
                     stats.get("character_count", 0),
                     error_stats_json,
-                    self.driver.current_url if hasattr(self, 'driver') else ""
+                    self.driver.current_url if self.driver is not None else ""
                 )
             
             return False
 
-    def load_replied_tweets(self):
-        """Load danh sách tweet đã reply từ database hoặc file (nếu có)"""
+        finally:
+            # Cập nhật bảng tổng hợp số liệu theo ngày: đúng một lần cho mọi nhánh kết thúc
+            # (return sớm, lỗi, hoặc reply đã gửi nhưng bước sau đó lỗi)
+            if attempted:
+                self.record_daily_stats(
+                    replies=int(reply_success), reply_failures=int(not reply_success),
+                    likes=int(bool(like_success)), follows=int(bool(follow_success)),
+                    response_ms_total=stats["response_time_ms"]
+                )
+
+    def record_daily_stats(self, **deltas):
+        """Cộng số liệu hôm nay của profile vào bảng tổng hợp"""
         try:
-            # Nếu bạn lưu trong database:
-            if hasattr(self, 'db'):
-                rows = self.db.execute_query(
-                    "SELECT tweet_id FROM replied_tweets WHERE profile_id = ?", (self.profile_id,)
-                ).fetchall()
-                return set(row[0] for row in rows)
-            # Nếu bạn lưu trong file:
-            # with open(f"replied_{self.profile_id}.json", "r", encoding="utf-8") as f:
-            #     return set(json.load(f))
+            DailyStats().record(self.profile_id, **deltas)
         except Exception as e:
-            self.log(f"Lỗi khi load replied_tweets: {str(e)}")
-            return set()
+            self.log(f"Lỗi khi cập nhật thống kê: {str(e)}")
+
+    def load_replied_tweets(self):
+        """Tạo store kiểm tra tweet đã reply (không tải toàn bộ lịch sử vào bộ nhớ)"""
+        return ReplyDedupStore(self.profile_id)
 
     def save_replied_tweets(self):
         """Lưu danh sách tweet đã reply ra file (nếu cần)"""
@@ -1782,3 +1630,9 @@ class TwitterBot(QObject):
             self.log(f"Lỗi khi save replied_tweets: {str(e)}")
 
 
+
+
+# Cache câu trả lời AI dùng chung cho mọi bot; xóa khi RSS vượt giới hạn
+_ai_cache = TwitterBot.generate_ai_response.cache
+ResourceGuard().track('process', CACHE, 'ai_responses', _ai_cache, cap=_ai_cache.max_entries)
+ResourceGuard().on_memory_pressure(_ai_cache.invalidate)
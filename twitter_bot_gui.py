@@ -1,10 +1,13 @@
 import sys
 import os
 import time
-from datetime import datetime
 import re
 import json
 
+# Bắt đầu đo trước các import nặng (PyQt, twitter_bot)
+from startup_timing import StartupTimer
+STARTUP = StartupTimer()
+
 from PyQt6.QtCore import Qt, QSize, QThread, pyqtSignal, QTimer
 from PyQt6.QtGui import QIcon, QFont, QColor, QBrush
 from PyQt6.QtWidgets import (
@@ -12,12 +15,32 @@ from PyQt6.QtWidgets import (
     QLabel, QPushButton, QSlider, QFrame, QSizePolicy, QComboBox,
     QScrollArea, QGridLayout, QSplitter, QLineEdit, QTabWidget,
     QMessageBox, QGroupBox, QDialog, QFormLayout, QTableWidget, QTableWidgetItem,
-    QTextEdit, QDateEdit, QCheckBox, QSpinBox, QHeaderView, QFileDialog
+    QTextEdit, QDateEdit, QCheckBox, QSpinBox, QHeaderView, QFileDialog, QTableView,
+    QProgressDialog, QStackedWidget
 )
 
 # Import TwitterBot class và các thành phần cần thiết
 from twitter_bot import TwitterBot, DatabaseManager
+from db_pool import DatabasePool
+from daily_stats import DailyStats
+from metrics_model import MetricsModel
+from ui_batcher import UpdateBatcher
+from data_loader import DataLoader
+from migrations import startup_check
+from profiler import Profiler
+from resource_guard import ResourceGuard, THREAD, TABLE, CACHE
+from status_server import StatusServer, status_endpoint_requested
+from log_writer import LogWriter
+from settings_cache import SettingsCache
+from log_pipeline import LogPipeline, ConsoleHandler, DatabaseHandler
+from log_store import LogStore
+from log_retention import LogRetention, retention_requested
+from log_export import LogExportWorker
+from log_table_model import LogTableModel
 from account_manager import AccountManager, AccountDialog
+import browser_provider
+
+STARTUP.mark("imports")
 
 # Tạo class BotWorker để chạy bot trong thread riêng
 class BotWorker(QThread):
@@ -26,18 +49,17 @@ class BotWorker(QThread):
     tweet_processed_signal = pyqtSignal(str, str, str, str, str, bool, bool, bool, int, int, str, str)
     finished_signal = pyqtSignal()
     
-    def __init__(self, credentials, main_window=None):
+    def __init__(self, bot, main_window=None):
         super().__init__()
-        self.credentials = credentials
-        self.bot = None
+        self.bot = bot
         self.main_window = main_window
+        # Thread được join khi bot.cleanup() giải phóng tài nguyên của bot
+        ResourceGuard().track(bot.resource_owner, THREAD, 'worker', self,
+                              close=lambda worker, timeout: worker.stop(int(timeout * 1000)))
         
     def run(self):
         """Run bot in worker thread"""
         try:
-            credentials_copy = self.credentials.copy()
-            self.bot = TwitterBot(credentials_copy, main_window=self.main_window)
-            
             # Connect signals
             self.bot.log_signal.connect(self.handle_log)
             self.bot.error_signal.connect(self.handle_error)
@@ -53,6 +75,9 @@ class BotWorker(QThread):
         except Exception as e:
             self.log_signal.emit(f"Lỗi trong BotWorker: {str(e)}")
             self.finished_signal.emit()
+        finally:
+            # Kết nối database của thread bot chỉ đóng được đúng trên thread này
+            DatabasePool().close_thread_connection()
             
     def handle_log(self, message):
         """Handle log messages from bot"""
@@ -73,31 +98,146 @@ class BotWorker(QThread):
             reply_count, view_count, tweet_id, original_content
         )
         
-    def stop(self):
-        """Stop the bot"""
-        try:
-            if self.bot:
-                self.bot.cleanup()
-                self.bot = None
-        except Exception as e:
-            self.log_signal.emit(f"Lỗi khi dừng bot: {str(e)}")
+    def stop(self, timeout_ms=10000):
+        """Yêu cầu bot dừng và chờ thread kết thúc; trả về True nếu thread đã dừng"""
+        if self.bot:
+            self.bot.should_run = False
+            self.bot.force_stop = True
+        if QThread.currentThread() is self or not self.isRunning():
+            return not self.isRunning()
+        if not self.wait(timeout_ms):
+            # Bot kẹt trong một thao tác trình duyệt dài: buộc dừng thread
+            self.log_signal.emit("Bot không dừng kịp, buộc dừng thread")
+            self.terminate()
+            self.wait(1000)
         self.finished_signal.emit()
+        return not self.isRunning()
 
 class TwitterBotGUI(QMainWindow):
+    # Số dòng tối đa giữ trong bảng tweet của trang Statistics
+    TWEET_TABLE_MAX_ROWS = 500
+    # Thời gian chờ thread bot tự dừng trước khi buộc dừng (ms)
+    BOT_STOP_TIMEOUT_MS = 10000
+
     def __init__(self):
         super().__init__()
         self.bot_instances = {}  # Lưu các instance bot theo profile_id
         self.bot_workers = {}    # Lưu các worker thread theo profile_id
-        self.db = DatabaseManager(main_window=self)  # Khởi tạo DatabaseManager
+        self.stopping_bots = {}  # profile_id -> (bot, worker) đã yêu cầu dừng, chờ thread kết thúc
+        self.shutting_down = False  # closeEvent đang chờ các bot dừng rồi mới đóng cửa sổ
+        self._db = None  # DatabaseManager của thread GUI, chỉ tạo khi cần (xem property db)
+        # Truy vấn nạp dữ liệu chạy ở thread riêng, kết quả trả về qua signal
+        self.data_loader = DataLoader(self.openLoaderDatabase, parent=self)
+        self.data_loader.loaded_signal.connect(self.onDataLoaded)
+        self.data_loader.failed_signal.connect(self.onDataLoadFailed)
+        self.account_rows = None  # Danh sách tài khoản của lần nạp gần nhất
         self.sidebar_menu_buttons = {}  # Store references to sidebar menu buttons
+        self.logger = LogPipeline("System", handlers=[ConsoleHandler(), DatabaseHandler()])
+        self.log_store = LogStore()  # Đọc log theo trang cho trang Log
+        self.log_refresh_timer = None  # Timer auto-refresh duy nhất của trang Log
+        self.log_export_worker = None  # Thread export log đang chạy (nếu có)
+        LogWriter().start()  # Phát lại log/số liệu còn trong journal của lần chạy trước
+        if retention_requested():
+            LogRetention().start()  # Archive log cũ ở background (mặc định tắt)
+        # Số liệu chạy của phiên: model cập nhật theo signal, GUI vẽ lại theo timer
+        self.metrics = MetricsModel()
+        self.metrics_cards = {}
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.setInterval(500)
+        self.metrics_timer.timeout.connect(self.redrawMetrics)
+        self.metrics_timer.start()
+        # Gom các tweet mới và thêm vào bảng theo lô
+        self.tweet_batcher = UpdateBatcher(self.applyTweetRows, interval_ms=250,
+                                           max_pending=self.TWEET_TABLE_MAX_ROWS, parent=self)
+        # Kích thước các bảng/cache của GUI, đo và cắt trên thread GUI theo timer
+        guard = ResourceGuard()
+        guard.track('gui', CACHE, 'tweet_batcher', self.tweet_batcher.pending,
+                    cap=self.TWEET_TABLE_MAX_ROWS, close=lambda pending, timeout: None)
+        guard.track('gui', CACHE, 'bot_instances', self.bot_instances, close=lambda bots, timeout: None)
+        self.resource_timer = QTimer(self)
+        self.resource_timer.setInterval(int(guard.sample_interval * 1000))
+        self.resource_timer.timeout.connect(self.checkResources)
+        self.resource_timer.start()
+        # Các trang được tạo một lần khi mở lần đầu rồi giữ trong QStackedWidget
+        self.pages = {}
+        self.current_page = None
+        self.accounts_layout = None
+        self.log_table = None
+        self.log_model = None
+        self.tweets_table = None
+        self.stats_cards = {}
+        self.performance_table = None
+        self.performance_timer = None  # Làm mới trang Performance khi đang mở
+        # Widget cần cập nhật theo key (profile_id, role); control của trang dùng profile_id=None
+        self.widgets = {}
+        self.status_server = None  # Status endpoint chỉ đọc, bật bằng --status-port/--status-socket
         self.initUI()
         self.showAccountsPage()
+        self.startStatusServer()
         # self.loadAccounts()  # XÓA hoặc COMMENT dòng này để không gọi khi layout chưa tạo
     
+    @property
+    def db(self):
+        """DatabaseManager cho các thao tác của người dùng (thêm/sửa tài khoản...)"""
+        if self._db is None:
+            self._db = DatabaseManager(main_window=self)
+        return self._db
+
+    def startStatusServer(self):
+        """Bật status endpoint nếu được yêu cầu; các source chỉ đọc giá trị trong bộ nhớ"""
+        port, unix_socket = status_endpoint_requested()
+        if port is None and unix_socket is None:
+            return
+        server = StatusServer(port=port, unix_socket=unix_socket)
+        server.add_source('gui_queues', lambda: {
+            'data_loader': self.data_loader.pending_count(),
+            'tweet_batcher': len(self.tweet_batcher.pending),
+            'tweet_batcher_dropped': self.tweet_batcher.dropped,
+        })
+        server.add_source('bots', lambda: [
+            {
+                'profile_id': profile_id,
+                'username': bot.username,
+                'running': profile_id in self.bot_workers and self.bot_workers[profile_id].isRunning(),
+                'paused': bot.is_paused,
+            }
+            for profile_id, bot in list(self.bot_instances.items())
+        ])
+        try:
+            self.logger.info(f"Status endpoint: {server.start()}")
+            self.status_server = server
+        except OSError as e:
+            self.logger.error(f"Không thể mở status endpoint: {str(e)}")
+
+    @staticmethod
+    def openLoaderDatabase():
+        """Chạy trong thread DataLoader: tạo DatabaseManager, migrate và kiểm tra query plan"""
+        db = DatabaseManager(main_window=None)
+        startup_check()
+        return db
+
+    def onDataLoaded(self, key, result):
+        """Nhận kết quả từ DataLoader (chạy trên thread GUI)"""
+        handlers = {
+            "accounts": self.onAccountsLoaded,
+            "stats_totals": self.onStatsTotalsLoaded,
+            "recent_tweets": self.populateRecentTweets,
+        }
+        handler = handlers.get(key)
+        if handler:
+            handler(result)
+
+    def onDataLoadFailed(self, key, error):
+        if key == "accounts" and self.accounts_layout is not None:
+            self.clearAccountCards()
+        self.showMessage("Lỗi", f"Không thể tải dữ liệu ({key}): {error}")
+
     def update_account_widget(self, profile_id, new_settings):
         """Update account widget with new settings from Account Manager"""
         try:
             self.log(f"Cập nhật cài đặt cho tài khoản {profile_id}")
+            # Báo cho cache cấu hình (và các bot đang chạy) biết cấu hình đã đổi
+            SettingsCache().invalidate(profile_id)
             
             # Refresh account if it's currently active
             if profile_id in self.bot_instances:
@@ -112,10 +252,9 @@ class TwitterBotGUI(QMainWindow):
         except Exception as e:
             self.log(f"Lỗi khi cập nhật widget tài khoản: {str(e)}")
     
-    def log(self, message):
-        """Log a message to console and potentially to a log widget"""
-        print(f"LOG: {message}")
-        # If you want to add a log widget later, you can update it here
+    def log(self, message, level="INFO"):
+        """Log a message through the shared log pipeline (console + database)"""
+        self.logger.log(level, message)
         
     def initUI(self):
         # Thiết lập cửa sổ chính
@@ -138,23 +277,9 @@ class TwitterBotGUI(QMainWindow):
         self.content_layout.setContentsMargins(20, 20, 20, 20)
         main_layout.addWidget(self.content_area, 4)
         
-        # Tạo header
-        self.create_header()
-        
-        # Container cho account cards
-        self.accounts_container = QWidget()
-        self.accounts_layout = QGridLayout(self.accounts_container)
-        self.accounts_layout.setContentsMargins(0, 0, 0, 0)
-        self.accounts_layout.setSpacing(20)
-        
-        # Scroll area cho accounts
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setFrameShape(QFrame.Shape.NoFrame)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll_area.setWidget(self.accounts_container)
-        
-        self.content_layout.addWidget(scroll_area)
+        # Các trang nội dung
+        self.page_stack = QStackedWidget()
+        self.content_layout.addWidget(self.page_stack)
         
         # Mode selection
         self.mode_group = QComboBox()
@@ -252,6 +377,7 @@ class TwitterBotGUI(QMainWindow):
             {"name": "Settings", "icon": "⚙️", "selected": False},
             {"name": "Statistics", "icon": "📊", "selected": False},
             {"name": "Log", "icon": "📝", "selected": False},  # Changed from "Templates" to "Log"
+            {"name": "Performance", "icon": "⏱️", "selected": False},
             {"name": "Account Manager", "icon": "👥", "selected": False}  # Thêm menu Account Manager
         ]
         
@@ -277,6 +403,8 @@ class TwitterBotGUI(QMainWindow):
                 menu_button.clicked.connect(self.showStatsPage)
             elif item["name"] == "Log":
                 menu_button.clicked.connect(self.showLogPage)
+            elif item["name"] == "Performance":
+                menu_button.clicked.connect(self.showPerformancePage)
             elif item["name"] == "Account Manager":
                 menu_button.clicked.connect(self.showAccountManager)  # Kết nối với hàm mới
             
@@ -325,78 +453,100 @@ class TwitterBotGUI(QMainWindow):
         
         return sidebar_frame
         
-    def create_header(self):
-        # Header container
-        header_widget = QWidget()
-        header_layout = QVBoxLayout(header_widget)
-        
-        # Welcome title
-        welcome_label = QLabel("Accounts Dashboard")
-        welcome_label.setFont(QFont("Arial", 24, QFont.Weight.Bold))
-        
-        # Subtitle
-        subtitle_label = QLabel("Manage your Twitter bot accounts and activities")
-        subtitle_label.setFont(QFont("Arial", 14))
-        subtitle_label.setStyleSheet("color: #757575")
-        
-        header_layout.addWidget(welcome_label)
-        header_layout.addWidget(subtitle_label)
-        
-        # Thêm nút "Add Account" vào header
-        add_account_button = QPushButton("Add Account")
-        add_account_button.setStyleSheet("""
-            background-color: #1DA1F2;
-            color: white;
-            padding: 8px 15px;
-            border-radius: 5px;
-            font-weight: bold;
-        """)
-        add_account_button.setFixedWidth(150)
-        add_account_button.clicked.connect(self.addNewAccount)
-        header_layout.addWidget(add_account_button, 0, Qt.AlignmentFlag.AlignRight)
-        
-        self.content_layout.addWidget(header_widget)
-    
+    def register_widget(self, profile_id, role, widget):
+        """Ghi nhận widget để tra cứu O(1) thay vì findChild duyệt cả cây widget"""
+        self.widgets[(profile_id, role)] = widget
+
+    def widget_for(self, profile_id, role):
+        """Widget đã đăng ký theo (profile_id, role), None nếu không có"""
+        return self.widgets.get((profile_id, role))
+
+    def account_widgets(self, role):
+        """Mọi widget role của các account card đang hiển thị"""
+        return [widget for (profile_id, key), widget in self.widgets.items()
+                if profile_id is not None and key == role]
+
+    def unregister_account_widgets(self):
+        """Bỏ các widget của account card trước khi card bị xóa"""
+        for key in [key for key in self.widgets if key[0] is not None]:
+            del self.widgets[key]
+
     def loadAccounts(self):
-        """Load tài khoản từ database"""
+        """Load tài khoản từ database ở thread DataLoader, hiện skeleton trong lúc chờ"""
+        if self.accounts_layout is None:
+            # Trang Accounts chưa được tạo, sẽ load khi mở lần đầu
+            return
+        if self.account_rows is None:
+            self.showAccountSkeletons()
+        self.data_loader.request("accounts", self.queryAccounts)
+
+    @staticmethod
+    def queryAccounts(db):
+        """Chạy trong thread DataLoader: danh sách tài khoản và số liệu của chúng"""
+        accounts = db.get_all_accounts() or []  # Sửa thành get_all_accounts thay vì get_accounts
+        # Số liệu của mọi tài khoản trong một truy vấn trên bảng tổng hợp
+        return accounts, DailyStats().totals_by_account()
+
+    def onAccountsLoaded(self, result):
+        accounts, account_totals = result
+        self.account_rows = accounts
+        if self.accounts_layout is not None:
+            self.populateAccounts(accounts, account_totals)
+        # Cập nhật các combo lọc tài khoản đã được tạo
+        for combo in (self.widget_for(None, "account_filter"), getattr(self, 'stats_account_combo', None)):
+            if combo is not None:
+                self.fillAccountCombo(combo)
+
+    def clearAccountCards(self):
+        """Xóa tất cả account card (hoặc skeleton) hiện có trong grid"""
+        self.unregister_account_widgets()
+        for i in reversed(range(self.accounts_layout.count())):
+            widget = self.accounts_layout.itemAt(i).widget()
+            if widget:
+                widget.deleteLater()
+
+    def showAccountSkeletons(self, count=4):
+        """Hiện các card giữ chỗ cho tới khi danh sách tài khoản được nạp xong"""
+        self.clearAccountCards()
+        for i in range(count):
+            self.accounts_layout.addWidget(self.create_skeleton_card(), 0, i)
+
+    def create_skeleton_card(self):
+        card_frame = QFrame()
+        card_frame.setObjectName("account_card")
+        card_layout = QVBoxLayout(card_frame)
+        for width in (140, 90, 200, 200, 160, 120):
+            bar = QFrame()
+            bar.setFixedSize(width, 14)
+            bar.setStyleSheet("background-color: #e1e8ed; border-radius: 4px;")
+            card_layout.addWidget(bar)
+        card_layout.addStretch()
+        return card_frame
+
+    def populateAccounts(self, accounts, account_totals):
+        """Cập nhật account card tại chỗ; chỉ dựng lại grid khi tài khoản được thêm hoặc xóa"""
         try:
-            # Xóa tất cả account hiện tại trong grid
-            for i in reversed(range(self.accounts_layout.count())):
-                widget = self.accounts_layout.itemAt(i).widget()
-                if widget:
-                    widget.deleteLater()
-            
-            # Lấy danh sách account từ database
-            accounts = self.db.get_all_accounts()  # Sửa thành get_all_accounts thay vì get_accounts
-            
             if not accounts:
+                self.clearAccountCards()
                 self.showMessage("Không có tài khoản nào", "Vui lòng thêm tài khoản trong phần Account Manager")
                 return
-                
+            
+            # Mỗi bot chạy trên thread riêng với một kết nối database riêng
+            DatabasePool().size_for_accounts(len(accounts))
+            
+            cards = [self.account_card_data(i, account, account_totals) for i, account in enumerate(accounts)]
+            
+            # Cùng danh sách tài khoản: chỉ cập nhật nội dung các card đang hiển thị
+            if [card["profile_id"] for card in cards] == self.account_card_ids():
+                for account_data in cards:
+                    self.updateAccountCard(account_data)
+                return
+            
+            self.clearAccountCards()
+            
             # Thêm mỗi account vào grid
-            for i, account in enumerate(accounts):
-                profile_id = account.get('profile_id')
-                
-                # Tạo account card
-                account_data = {
-                    "name": account.get('name', f"Account {i+1}"),
-                    "username": account.get('username', ""),
-                    "profile_id": profile_id,
-                    "status": "Stopped",
-                    "replies": 0,
-                    "likes": 0,
-                    "follows": 0,
-                    "gemini_key": account.get('gemini_key', ""),
-                    "chatgpt_key": account.get('chatgpt_key', ""),
-                    "use_gemini": account.get('use_gemini', True)
-                }
-                
-                # Lấy số liệu thống kê từ database
-                stats = self.db.get_account_stats(profile_id)
-                if stats:
-                    account_data["replies"] = stats.get('replies_sent', 0)
-                    account_data["likes"] = stats.get('likes_given', 0)
-                    account_data["follows"] = stats.get('follows_made', 0)
+            for i, account_data in enumerate(cards):
+                profile_id = account_data["profile_id"]
                 
                 # Thêm vào grid
                 row, col = divmod(i, 4)
@@ -415,6 +565,45 @@ class TwitterBotGUI(QMainWindow):
         except Exception as e:
             self.showMessage("Lỗi", f"Không thể tải danh sách tài khoản: {str(e)}")
     
+    @staticmethod
+    def account_card_data(i, account, account_totals):
+        """Dữ liệu hiển thị của một account card"""
+        profile_id = account.get('profile_id')
+        account_data = {
+            "name": account.get('name', f"Account {i+1}"),
+            "username": account.get('username', ""),
+            "profile_id": profile_id,
+            "status": "Stopped",
+            "replies": 0,
+            "likes": 0,
+            "follows": 0,
+            "gemini_key": account.get('gemini_key', ""),
+            "chatgpt_key": account.get('chatgpt_key', ""),
+            "use_gemini": account.get('use_gemini', True)
+        }
+        
+        # Lấy số liệu thống kê từ bảng tổng hợp
+        stats = account_totals.get(profile_id)
+        if stats:
+            account_data["replies"] = stats['replies']
+            account_data["likes"] = stats['likes']
+            account_data["follows"] = stats['follows']
+        return account_data
+    
+    def account_card_ids(self):
+        """profile_id của các account card đang hiển thị, theo thứ tự trong grid"""
+        return [profile_id for (profile_id, role) in self.widgets
+                if profile_id is not None and role == "card"]
+    
+    def updateAccountCard(self, account_data):
+        """Cập nhật tên và số liệu của một account card có sẵn, không tạo lại widget"""
+        profile_id = account_data["profile_id"]
+        self.widget_for(profile_id, "name").setText(account_data["username"])
+        self.widget_for(profile_id, "username").setText(f"@{account_data['username']}")
+        self.widget_for(profile_id, "replies").setText(f"Replies: {account_data['replies']}")
+        self.widget_for(profile_id, "likes").setText(f"Likes: {account_data['likes']}")
+        self.widget_for(profile_id, "follows").setText(f"Follows: {account_data['follows']}")
+    
     def create_account_card(self, account_data):
         # Frame cho account card
         card_frame = QFrame()
@@ -425,6 +614,7 @@ class TwitterBotGUI(QMainWindow):
         card_layout.setContentsMargins(15, 15, 15, 15)
         
         profile_id = account_data.get("profile_id", "")
+        self.register_widget(profile_id, "card", card_frame)
         
         # Header với icon và tên tài khoản
         header_widget = QWidget()
@@ -435,12 +625,14 @@ class TwitterBotGUI(QMainWindow):
         icon_label.setFont(QFont("Arial", 16))
         
         name_label = QLabel(account_data["username"])
+        self.register_widget(profile_id, "name", name_label)
         name_label.setFont(QFont("Arial", 14, QFont.Weight.Bold))
         
         # Switch status
         switch_color = "#4CD964" if account_data["status"] == "Running" else "#8E8E93"
         switch = QPushButton()
         switch.setObjectName(f"switch_{profile_id}")
+        self.register_widget(profile_id, "switch", switch)
         switch.setCheckable(True)
         switch.setChecked(account_data["status"] == "Running")
         switch.setFixedSize(50, 30)
@@ -469,12 +661,14 @@ class TwitterBotGUI(QMainWindow):
         
         # Username and status
         username_label = QLabel(f"@{account_data['username']}")
+        self.register_widget(profile_id, "username", username_label)
         username_label.setStyleSheet("color: #1DA1F2;")
         username_label.setFont(QFont("Arial", 12))
         card_layout.addWidget(username_label)
         
         status_label = QLabel(account_data["status"])
         status_label.setObjectName(f"status_{profile_id}")
+        self.register_widget(profile_id, "status", status_label)
         status_label.setStyleSheet(
             "color: #4CD964;" if account_data["status"] == "Running" else "color: #8E8E93;"
         )
@@ -494,12 +688,15 @@ class TwitterBotGUI(QMainWindow):
         
         replies_label = QLabel(f"Replies: {account_data['replies']}")
         replies_label.setObjectName(f"replies_{profile_id}")
+        self.register_widget(profile_id, "replies", replies_label)
         
         likes_label = QLabel(f"Likes: {account_data['likes']}")
         likes_label.setObjectName(f"likes_{profile_id}")
+        self.register_widget(profile_id, "likes", likes_label)
         
         follows_label = QLabel(f"Follows: {account_data['follows']}")
         follows_label.setObjectName(f"follows_{profile_id}")
+        self.register_widget(profile_id, "follows", follows_label)
         
         stats_grid.addWidget(replies_label, 0, 0)
         stats_grid.addWidget(likes_label, 1, 0)
@@ -512,6 +709,7 @@ class TwitterBotGUI(QMainWindow):
         
         performance_value = QLabel("Active" if account_data["status"] == "Running" else "Inactive")
         performance_value.setObjectName(f"performance_{profile_id}")
+        self.register_widget(profile_id, "performance", performance_value)
         performance_value.setFont(QFont("Arial", 18, QFont.Weight.Bold))
         performance_value.setStyleSheet("color: #4CD964;" if account_data["status"] == "Running" else "color: #FF3B30;")
         
@@ -531,6 +729,7 @@ class TwitterBotGUI(QMainWindow):
         mode_label = QLabel("Mode:")
         mode_combo = QComboBox()
         mode_combo.setObjectName(f"mode_combo_{profile_id}")
+        self.register_widget(profile_id, "mode_combo", mode_combo)
         mode_combo.addItems(["Feed Mode", "User Mode", "Comments Mode", "Trending Mode"])
         
         # Kết nối signal
@@ -546,6 +745,7 @@ class TwitterBotGUI(QMainWindow):
         keyword_label = QLabel("Keyword:")
         keyword_input = QLineEdit()
         keyword_input.setObjectName(f"keyword_input_{profile_id}")
+        self.register_widget(profile_id, "keyword_input", keyword_input)
         keyword_input.setPlaceholderText("Enter search keyword")
         
         keyword_layout.addWidget(keyword_label)
@@ -608,13 +808,17 @@ class TwitterBotGUI(QMainWindow):
             account_manager = AccountManager(main_window=self)
             account_manager.account_changed.connect(self.onAccountChanged)
             account_manager.exec()
+            # AccountManager có thể đã sửa cấu hình của bất kỳ tài khoản nào
+            SettingsCache().invalidate()
             # Sau khi đóng AccountManager, refresh lại danh sách tài khoản
+            self.set_active_menu_item(self.current_page)
             self.loadAccounts()
         except Exception as e:
             self.showMessage("Lỗi", f"Không thể mở Account Manager: {str(e)}")
 
     def onAccountChanged(self, profile_id):
         """Xử lý khi thông tin tài khoản thay đổi"""
+        SettingsCache().invalidate(profile_id)
         self.loadAccounts()  # Tải lại tất cả tài khoản
 
     def addNewAccount(self):
@@ -652,18 +856,18 @@ class TwitterBotGUI(QMainWindow):
     def showAccountSettings(self, profile_id):
         """Hiển thị dialog cấu hình chi tiết cho bot"""
         try:
-            # Lấy thông tin tài khoản và settings từ database
+            # Lấy thông tin tài khoản từ database
             account = self.db.get_account(profile_id)
             if not account:
                 self.showMessage("Lỗi", "Không tìm thấy thông tin tài khoản")
                 return
                 
             username = account.get('username', '')
-            settings = self.db.get_settings(profile_id)
             
             # Show account settings dialog from AccountManager
             account_manager = AccountManager(main_window=self)
             account_manager.show_account_settings(profile_id)
+            SettingsCache().invalidate(profile_id)
             
             # Refresh lại tài khoản sau khi cập nhật settings
             self.loadAccounts()
@@ -729,6 +933,11 @@ class TwitterBotGUI(QMainWindow):
     def startBot(self, profile_id):
         """Khởi động bot cho tài khoản"""
         try:
+            # Bot cũ của tài khoản chưa dừng hẳn (dùng chung tên tài nguyên với bot mới)
+            if profile_id in self.stopping_bots:
+                self.showMessage("Thông báo", "Bot đang dừng, vui lòng thử lại sau giây lát")
+                return
+            
             # Kiểm tra xem bot đã được khởi tạo chưa
             if profile_id not in self.bot_instances:
                 # Lấy thông tin tài khoản từ database
@@ -746,18 +955,22 @@ class TwitterBotGUI(QMainWindow):
                     'chatgpt_key': account.get('chatgpt_key', '')
                 }
                 
+                if not browser_provider.available():
+                    self.showMessage("Lỗi", "Chưa cài selenium, không thể chạy bot. Cài bằng: pip install selenium")
+                    return
+                
                 bot = TwitterBot(credentials, main_window=self)
                 
                 # Kết nối signal
                 bot.tweet_processed_signal.connect(self.onTweetProcessed)
-                bot.log_signal.connect(self.onBotLog)
-                bot.error_signal.connect(self.onBotError)
+                # log_signal/error_signal không nối vào GUI: log đã được LogPipeline ghi
+                # xuống database và trang Log tự làm mới, tránh một event cho mỗi dòng log
                 
                 # Lưu vào dictionary
                 self.bot_instances[profile_id] = bot
                 
                 # Set mode cho bot
-                mode_combo = self.findChild(QComboBox, f"mode_combo_{profile_id}")
+                mode_combo = self.widget_for(profile_id, "mode_combo")
                 if mode_combo:
                     mode_index = mode_combo.currentIndex() + 1  # mode_id từ 1-4
                     bot.mode_id = mode_index
@@ -773,7 +986,7 @@ class TwitterBotGUI(QMainWindow):
                 
             # Khởi động bot trong thread riêng
             worker = BotWorker(bot, main_window=self)
-            worker.finished.connect(lambda: self.onBotFinished(profile_id))
+            worker.finished.connect(lambda: self.onBotFinished(profile_id, worker))
             
             # Lưu worker và khởi động
             self.bot_workers[profile_id] = worker
@@ -786,30 +999,62 @@ class TwitterBotGUI(QMainWindow):
             self.showMessage("Lỗi", f"Không thể khởi động bot: {str(e)}")
     
     def stopBot(self, profile_id):
-        """Dừng bot đang chạy"""
+        """Dừng bot đang chạy mà không chặn thread GUI.
+
+        Chỉ đặt cờ dừng; bot được dọn dẹp khi thread của nó kết thúc (signal finished)
+        hoặc khi hết BOT_STOP_TIMEOUT_MS thì thread bị buộc dừng.
+        """
         try:
             if profile_id in self.bot_instances:
-                bot = self.bot_instances[profile_id]
+                # Lần khởi động sau tạo bot mới với tài nguyên mới
+                bot = self.bot_instances.pop(profile_id)
+                worker = self.bot_workers.pop(profile_id, None)
+                bot.request_stop()
                 
-                # Dừng worker thread
-                if profile_id in self.bot_workers:
-                    worker = self.bot_workers[profile_id]
-                    worker.force_stop = True
-                    worker.terminate()
-                    worker.wait(1000)  # Đợi tối đa 1 giây
-                    
-                    # Xóa worker
-                    del self.bot_workers[profile_id]
+                if worker is None or not worker.isRunning():
+                    self.stopping_bots[profile_id] = (bot, worker)
+                    self.finishStopBot(profile_id, bot)
+                    return
                 
-                # Dọn dẹp tài nguyên bot
-                bot.cleanup()
+                self.stopping_bots[profile_id] = (bot, worker)
+                worker.finished.connect(lambda: self.finishStopBot(profile_id, bot))
+                QTimer.singleShot(self.BOT_STOP_TIMEOUT_MS, lambda: self.forceStopBot(profile_id, bot))
                 
                 # Cập nhật UI
-                self.updateAccountStatus(profile_id, "Stopped")
+                self.updateAccountStatus(profile_id, "Stopping")
                 
         except Exception as e:
             self.showMessage("Lỗi", f"Không thể dừng bot: {str(e)}")
     
+    def forceStopBot(self, profile_id, bot):
+        """Hết hạn chờ mà thread bot chưa dừng: buộc dừng (finished sẽ gọi finishStopBot)"""
+        entry = self.stopping_bots.get(profile_id)
+        if entry is None or entry[0] is not bot:
+            return
+        worker = entry[1]
+        if worker.isRunning():
+            self.logger.log('WARNING', f"Bot {profile_id} không dừng kịp, buộc dừng thread")
+            worker.terminate()
+        else:
+            self.finishStopBot(profile_id, bot)
+    
+    def finishStopBot(self, profile_id, bot):
+        """Giải phóng tài nguyên của bot sau khi thread của nó đã kết thúc"""
+        entry = self.stopping_bots.get(profile_id)
+        if entry is None or entry[0] is not bot:
+            return
+        del self.stopping_bots[profile_id]
+        try:
+            # Thread đã dừng nên cleanup() không phải chờ lâu
+            bot.cleanup(timeout=1.0)
+        except Exception as e:
+            print(f"Lỗi khi dọn dẹp bot {profile_id}: {str(e)}")
+        if profile_id not in self.bot_instances:
+            self.updateAccountStatus(profile_id, "Stopped")
+        # closeEvent đang chờ bot cuối cùng dừng
+        if self.shutting_down and not self.stopping_bots:
+            self.close()
+    
     def pauseBot(self, profile_id):
         """Tạm dừng bot"""
         try:
@@ -851,7 +1096,7 @@ class TwitterBotGUI(QMainWindow):
                 bot.mode_id = mode_index + 1
                 
                 # Hiện/ẩn trường keyword tùy theo mode
-                keyword_input = self.findChild(QLineEdit, f"keyword_input_{profile_id}")
+                keyword_input = self.widget_for(profile_id, "keyword_input")
                 if keyword_input:
                     # Chỉ hiển thị keyword input cho trending mode (index = 3)
                     keyword_input.setVisible(mode_index == 3)
@@ -864,7 +1109,7 @@ class TwitterBotGUI(QMainWindow):
         try:
             # Duyệt qua tất cả combo box mode trong các account card
             for profile_id in self.bot_instances:
-                mode_combo = self.findChild(QComboBox, f"mode_combo_{profile_id}")
+                mode_combo = self.widget_for(profile_id, "mode_combo")
                 if mode_combo:
                     mode_combo.setCurrentIndex(mode_index)
                 
@@ -893,7 +1138,7 @@ class TwitterBotGUI(QMainWindow):
             for profile_id in list(self.bot_instances.keys()):
                 self.stopBot(profile_id)
                 
-            self.showMessage("Thành công", "Đã dừng tất cả các bot")
+            self.showMessage("Thành công", "Đã yêu cầu dừng tất cả các bot")
                 
         except Exception as e:
             self.showMessage("Lỗi", f"Không thể dừng tất cả bot: {str(e)}")
@@ -902,7 +1147,7 @@ class TwitterBotGUI(QMainWindow):
         """Cập nhật trạng thái hiển thị của tài khoản"""
         try:
             # Cập nhật label status
-            status_label = self.findChild(QLabel, f"status_{profile_id}")
+            status_label = self.widget_for(profile_id, "status")
             if status_label:
                 status_label.setText(status)
                 if status == "Running":
@@ -913,7 +1158,7 @@ class TwitterBotGUI(QMainWindow):
                     status_label.setStyleSheet("color: #8E8E93;")
             
             # Cập nhật performance
-            performance_label = self.findChild(QLabel, f"performance_{profile_id}")
+            performance_label = self.widget_for(profile_id, "performance")
             if performance_label:
                 if status == "Running":
                     performance_label.setText("Active")
@@ -926,7 +1171,7 @@ class TwitterBotGUI(QMainWindow):
                     performance_label.setStyleSheet("color: #FF3B30;")
             
             # Cập nhật switch
-            switch = self.findChild(QPushButton, f"switch_{profile_id}")
+            switch = self.widget_for(profile_id, "switch")
             if switch:
                 switch.setChecked(status == "Running")
                 if status == "Running":
@@ -937,84 +1182,88 @@ class TwitterBotGUI(QMainWindow):
         except Exception as e:
             self.showMessage("Lỗi", f"Không thể cập nhật trạng thái: {str(e)}")
     
-    def onTweetProcessed(self, time_str, username, tweet_link, reply_text, status, like_success, follow_success, retweet_success, response_time, char_count, additional_stats_json, current_url):
+    def onTweetProcessed(self, profile_id, username, original_content, response_content, timestamp, reply_success, like_success, follow_success, response_time, char_count, additional_stats_json, current_url):
         """Handle tweet processed signal and update statistics"""
         try:
             # Parse additional stats
             additional_stats = json.loads(additional_stats_json) if additional_stats_json else {}
+            status = "Thành công" if reply_success else "Thất bại"
             
-            # Update metrics
-            if self.metrics_cards:
-                # Increment total processed
-                total_processed = int(self.metrics_cards["total_processed"].text()) + 1
-                self.metrics_cards["total_processed"].setText(str(total_processed))
-                
-                # Update success rate
-                success_count = int(self.metrics_cards["success_rate"].text().rstrip('%')) * total_processed / 100
-                if status == "Thành công":
-                    success_count += 1
-                self.metrics_cards["success_rate"].setText(f"{(success_count/total_processed*100):.1f}%")
-                
-                # Update average response time
-                current_avg = float(self.metrics_cards["avg_response"].text().rstrip('ms'))
-                new_avg = (current_avg * (total_processed - 1) + response_time) / total_processed
-                self.metrics_cards["avg_response"].setText(f"{new_avg:.0f}ms")
-                
-                # Update verified users count
-                if additional_stats.get("is_verified"):
-                    verified_count = int(self.metrics_cards["verified_users"].text()) + 1
-                    self.metrics_cards["verified_users"].setText(str(verified_count))
-                
-                # Update media tweets count
-                if additional_stats.get("has_media"):
-                    media_count = int(self.metrics_cards["media_tweets"].text()) + 1
-                    self.metrics_cards["media_tweets"].setText(str(media_count))
-                
-                # Update average interactions
-                current_avg_interactions = float(self.metrics_cards["avg_interactions"].text())
-                new_interactions = additional_stats.get("interaction_count", 0)
-                new_avg_interactions = (current_avg_interactions * (total_processed - 1) + new_interactions) / total_processed
-                self.metrics_cards["avg_interactions"].setText(f"{new_avg_interactions:.1f}")
-            
-            # Add row to table
-            row = self.tweet_table.rowCount()
-            self.tweet_table.insertRow(row)
-            
-            # Set row data
-            self.tweet_table.setItem(row, 0, QTableWidgetItem(time_str))
-            self.tweet_table.setItem(row, 1, QTableWidgetItem(f"@{username}"))
-            self.tweet_table.setItem(row, 2, QTableWidgetItem(additional_stats.get("username", "unknown")))
-            self.tweet_table.setItem(row, 3, QTableWidgetItem(additional_stats.get("content", "")))
-            self.tweet_table.setItem(row, 4, QTableWidgetItem(f"{response_time}ms"))
-            self.tweet_table.setItem(row, 5, QTableWidgetItem(status))
-            self.tweet_table.setItem(row, 6, QTableWidgetItem("Yes" if additional_stats.get("is_verified") else "No"))
-            self.tweet_table.setItem(row, 7, QTableWidgetItem("Yes" if additional_stats.get("has_media") else "No"))
+            # Cập nhật model (O(1)), thẻ số liệu được vẽ lại bởi metrics_timer
+            self.metrics.record_tweet(
+                success=reply_success,
+                response_time_ms=response_time,
+                like=like_success,
+                follow=follow_success,
+                is_verified=additional_stats.get("is_verified"),
+                has_media=additional_stats.get("has_media"),
+                interaction_count=additional_stats.get("interaction_count", 0)
+            )
             
-            # Scroll to new row
-            self.tweet_table.scrollToBottom()
+            # Dòng mới cho bảng tweet được gom lại, thêm vào bảng theo lô
+            self.tweet_batcher.push((
+                timestamp, username, additional_stats.get("tweet_id", ""), response_content or "",
+                status, like_success, follow_success
+            ))
             
         except Exception as e:
             print(f"Error updating tweet statistics: {str(e)}")
     
-    def onBotLog(self, message):
-        """Xử lý log từ bot"""
-        print(f"Bot log: {message}")
+    def applyTweetRows(self, rows):
+        """Thêm một lô tweet vào đầu bảng (mới nhất trên cùng) và cắt bớt dòng cũ"""
+        table = self.tweets_table
+        if table is None:
+            return
+        rows = rows[-self.TWEET_TABLE_MAX_ROWS:]
+        table.setUpdatesEnabled(False)
+        try:
+            table.model().insertRows(0, len(rows))
+            for i, (timestamp, username, tweet_id, reply_text, status, like, follow) in enumerate(reversed(rows)):
+                table.setItem(i, 0, QTableWidgetItem(str(timestamp)))
+                table.setItem(i, 1, QTableWidgetItem(username))
+                url_item = QTableWidgetItem(f"https://twitter.com/i/web/status/{tweet_id}")
+                url_item.setForeground(QBrush(QColor("#1DA1F2")))
+                table.setItem(i, 2, url_item)
+                table.setItem(i, 3, QTableWidgetItem(reply_text[:100] + "..." if len(reply_text) > 100 else reply_text))
+                status_item = QTableWidgetItem(status)
+                status_item.setForeground(QBrush(QColor("#34C759" if status == "Thành công" else "#FF3B30")))
+                table.setItem(i, 4, status_item)
+                table.setItem(i, 5, QTableWidgetItem(f"{'❤️ ' if like else ''}{'👤' if follow else ''}".strip()))
+                table.setItem(i, 6, QTableWidgetItem("0"))
+            # Giữ bảng như một ring buffer: bỏ các dòng cũ nhất ở cuối
+            if table.rowCount() > self.TWEET_TABLE_MAX_ROWS:
+                table.setRowCount(self.TWEET_TABLE_MAX_ROWS)
+        finally:
+            table.setUpdatesEnabled(True)
     
-    def onBotError(self, message):
-        """Xử lý lỗi từ bot"""
-        print(f"Bot error: {message}")
+    def redrawMetrics(self):
+        """Vẽ lại các thẻ số liệu của phiên từ MetricsModel (chỉ khi có thay đổi)"""
+        if not self.metrics_cards or not self.metrics.dirty:
+            return
+        data = self.metrics.snapshot()
+        texts = {
+            "total_processed": str(data['total_processed']),
+            "success_rate": f"{data['success_rate']:.1f}%",
+            "avg_response": f"{data['avg_response']:.0f}ms",
+            "p95_response": f"{data['p95_response']:.0f}ms",
+            "verified_users": str(data['verified_users']),
+            "media_tweets": str(data['media_tweets']),
+            "avg_interactions": f"{data['avg_interactions']:.1f}",
+        }
+        for key, label in self.metrics_cards.items():
+            if key in texts:
+                label.setText(texts[key])
     
-    def onBotFinished(self, profile_id):
-        """Xử lý khi bot kết thúc"""
+    def onBotFinished(self, profile_id, worker):
+        """Thread bot tự kết thúc (hết việc hoặc lỗi): dọn dẹp giống như khi dừng bằng stopBot"""
         try:
-            # Kiểm tra nếu bot dừng do lỗi
-            if profile_id in self.bot_instances:
-                # Cập nhật trạng thái
-                self.updateAccountStatus(profile_id, "Stopped")
-                
-                # Dọn dẹp
-                if profile_id in self.bot_workers:
-                    del self.bot_workers[profile_id]
+            # Bot đã được stopBot lấy ra thì finishStopBot lo phần dọn dẹp
+            if self.bot_workers.get(profile_id) is not worker:
+                return
+            bot = self.bot_instances.pop(profile_id)
+            del self.bot_workers[profile_id]
+            self.stopping_bots[profile_id] = (bot, worker)
+            self.finishStopBot(profile_id, bot)
                 
         except Exception as e:
             print(f"Lỗi khi xử lý bot finished: {str(e)}")
@@ -1023,21 +1272,35 @@ class TwitterBotGUI(QMainWindow):
         """Xử lý khi mode chính thay đổi"""
         try:
             # Cập nhật mode cho tất cả account
-            for i in range(self.accounts_layout.count()):
-                widget = self.accounts_layout.itemAt(i).widget()
-                if isinstance(widget, QFrame) and widget.property("profile_id"):
-                    profile_id = widget.property("profile_id")
-                    combo = self.findChild(QComboBox, f"mode_combo_{profile_id}")
-                    if combo:
-                        combo.setCurrentIndex(index)
+            for combo in self.account_widgets("mode_combo"):
+                combo.setCurrentIndex(index)
                         
         except Exception as e:
             print(f"Lỗi khi thay đổi mode: {str(e)}")
     
+    def showPage(self, name, build, refresh=None):
+        """Chuyển tới trang name: tạo bằng build() ở lần đầu, các lần sau chỉ gọi refresh()"""
+        if self.current_page == "Log" and name != "Log":
+            # Dừng auto-refresh của trang Log khi rời trang
+            self.stopLogAutoRefresh()
+        if self.current_page == "Performance" and name != "Performance" and self.performance_timer:
+            self.performance_timer.stop()
+        page = self.pages.get(name)
+        if page is None:
+            page = build()
+            self.pages[name] = page
+            self.page_stack.addWidget(page)
+        elif refresh is not None:
+            refresh()
+        self.page_stack.setCurrentWidget(page)
+        self.current_page = name
+        self.set_active_menu_item(name)
+    
     def showAccountsPage(self):
         """Hiển thị trang Account Dashboard"""
-        self.clearContentArea()
-        self.set_active_menu_item("Accounts")
+        self.showPage("Accounts", self.buildAccountsPage, self.loadAccounts)
+    
+    def buildAccountsPage(self):
         dashboard_container = QWidget()
         dashboard_layout = QVBoxLayout(dashboard_container)
         title_label = QLabel("Accounts Dashboard")
@@ -1074,8 +1337,8 @@ class TwitterBotGUI(QMainWindow):
         scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         scroll_area.setWidget(self.accounts_container)
         dashboard_layout.addWidget(scroll_area)
-        self.content_layout.addWidget(dashboard_container)
         self.loadAccounts()
+        return dashboard_container
     
     def set_active_menu_item(self, menu_name):
         """Set the active menu item in the sidebar"""
@@ -1109,11 +1372,9 @@ class TwitterBotGUI(QMainWindow):
     
     def showSettingsPage(self):
         """Show the settings page"""
-        self.clearContentArea()
-        
-        # Update the active menu item
-        self.set_active_menu_item("Settings")
-        
+        self.showPage("Settings", self.buildSettingsPage)
+    
+    def buildSettingsPage(self):
         # Create container for settings
         settings_container = QWidget()
         settings_layout = QVBoxLayout(settings_container)
@@ -1336,16 +1597,13 @@ class TwitterBotGUI(QMainWindow):
         settings_layout.addLayout(save_btn_layout)
         settings_layout.addSpacing(15)
         
-        # Add the settings container to the content area
-        self.content_layout.addWidget(settings_container)
+        return settings_container
     
     def showStatsPage(self):
         """Show the statistics page with processed tweet information"""
-        self.clearContentArea()
-        
-        # Update the active menu item
-        self.set_active_menu_item("Statistics")
-        
+        self.showPage("Statistics", self.buildStatsPage, self.refreshStatsData)
+    
+    def buildStatsPage(self):
         # Create container for stats
         stats_container = QWidget()
         stats_layout = QVBoxLayout(stats_container)
@@ -1367,15 +1625,9 @@ class TwitterBotGUI(QMainWindow):
         account_label = QLabel("Account:")
         filter_layout.addWidget(account_label)
         
-        # Get all accounts from database
-        accounts = self.db.get_all_accounts()
-        account_names = ["All Accounts"]
-        if accounts:
-            for account in accounts:
-                account_names.append(f"@{account.get('username')}")
-        
         account_combo = QComboBox()
-        account_combo.addItems(account_names)
+        self.fillAccountCombo(account_combo)
+        self.stats_account_combo = account_combo
         filter_layout.addWidget(account_combo)
         
         filter_layout.addSpacing(20)
@@ -1425,75 +1677,52 @@ class TwitterBotGUI(QMainWindow):
         metrics_grid = QGridLayout()
         metrics_grid.setSpacing(15)
         
-        # Get tweet stats from database for all accounts
-        total_tweets = 0
-        total_likes = 0
-        total_follows = 0
-        total_retweets = 0
-        engagement_rate = 0.0
-        
-        for account in accounts:
-            profile_id = account.get('profile_id')
-            stats = self.db.get_account_stats(profile_id)
-            if stats:
-                total_tweets += stats.get('replies_sent', 0)
-                total_likes += stats.get('likes_given', 0)
-                total_follows += stats.get('follows_made', 0)
-                total_retweets += stats.get('retweets', 0)
-        
-        # Calculate engagement rate (simple example: likes + retweets / total tweets)
-        if total_tweets > 0:
-            engagement_rate = round(((total_likes + total_retweets) / total_tweets) * 100, 1)
-        
-        # Metrics cards data [title, value, icon]
+        # Thẻ số liệu tổng, giá trị được điền bởi refreshStatsData()
         metrics_data = [
-            ["Processed Tweets", str(total_tweets), "📝"],
-            ["Engagement Rate", f"{engagement_rate}%", "📊"],
-            ["Likes Given", str(total_likes), "❤️"],
-            ["Retweets", str(total_retweets), "🔄"],
-            ["Follows Made", str(total_follows), "👤"],
-            ["Success Rate", f"{100.0 if total_tweets == 0 else round((total_tweets - 0) / total_tweets * 100, 1)}%", "✅"]
+            ["processed", "Processed Tweets", "📝"],
+            ["engagement_rate", "Engagement Rate", "📊"],
+            ["likes", "Likes Given", "❤️"],
+            ["retweets", "Retweets", "🔄"],
+            ["follows", "Follows Made", "👤"],
+            ["success_rate", "Success Rate", "✅"]
         ]
         
-        for i, (title, value, icon) in enumerate(metrics_data):
+        self.stats_cards = {}
+        for i, (key, title, icon) in enumerate(metrics_data):
             row, col = i // 3, i % 3
-            
-            card = QFrame()
-            card.setStyleSheet("""
-                QFrame {
-                    background-color: white;
-                    border-radius: 8px;
-                    border: 1px solid #E1E8ED;
-                }
-            """)
-            card.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-            card.setMinimumHeight(120)
-            
-            card_layout = QVBoxLayout(card)
-            
-            # Icon and Title in same row
-            header_layout = QHBoxLayout()
-            icon_label = QLabel(icon)
-            icon_label.setFont(QFont("Arial", 14))
-            header_layout.addWidget(icon_label)
-            
-            title_label = QLabel(title)
-            title_label.setStyleSheet("color: #657786; font-weight: normal;")
-            header_layout.addWidget(title_label)
-            header_layout.addStretch()
-            
-            card_layout.addLayout(header_layout)
-            
-            # Value
-            value_label = QLabel(value)
-            value_label.setFont(QFont("Arial", 24, QFont.Weight.Bold))
-            card_layout.addWidget(value_label)
-            
+            # "…" giữ chỗ cho tới khi số liệu được nạp xong
+            card, value_label = self.create_metric_card(title, "…", icon)
+            self.stats_cards[key] = value_label
             metrics_grid.addWidget(card, row, col)
         
         stats_layout.addLayout(metrics_grid)
         stats_layout.addSpacing(20)
         
+        # Số liệu của phiên hiện tại (cập nhật trực tiếp từ MetricsModel)
+        session_label = QLabel("Current Session")
+        session_label.setFont(QFont("Arial", 18, QFont.Weight.Bold))
+        stats_layout.addWidget(session_label)
+        
+        session_grid = QGridLayout()
+        session_grid.setSpacing(15)
+        session_metrics = [
+            ["total_processed", "Processed", "📝"],
+            ["success_rate", "Success Rate", "✅"],
+            ["avg_response", "Avg Response", "⏱️"],
+            ["p95_response", "P95 Response", "📈"],
+            ["verified_users", "Verified Users", "☑️"],
+            ["media_tweets", "Media Tweets", "🖼️"],
+        ]
+        self.metrics_cards = {}
+        for i, (key, title, icon) in enumerate(session_metrics):
+            card, value_label = self.create_metric_card(title, "", icon)
+            self.metrics_cards[key] = value_label
+            session_grid.addWidget(card, i // 3, i % 3)
+        stats_layout.addLayout(session_grid)
+        stats_layout.addSpacing(20)
+        self.metrics.dirty = True
+        self.redrawMetrics()
+        
         # Add tweet processing table
         table_label = QLabel("Recent Processed Tweets")
         table_label.setFont(QFont("Arial", 18, QFont.Weight.Bold))
@@ -1501,6 +1730,9 @@ class TwitterBotGUI(QMainWindow):
         
         # Create table for processed tweets
         self.tweets_table = QTableWidget()
+        ResourceGuard().track('gui', TABLE, 'tweets_table', self.tweets_table,
+                              size=lambda table: table.rowCount(), cap=self.TWEET_TABLE_MAX_ROWS,
+                              trim=lambda table, cap: table.setRowCount(cap))
         self.tweets_table.setColumnCount(7)
         self.tweets_table.setHorizontalHeaderLabels([
             "Time", "Username", "Tweet Link", "Reply", "Status", "Actions", "Views"
@@ -1540,25 +1772,94 @@ class TwitterBotGUI(QMainWindow):
         
         stats_layout.addWidget(self.tweets_table)
         
-        # Add the stats container to the content area
-        self.content_layout.addWidget(stats_container)
+        self.refreshStatsData()
+        return stats_container
+        
+    def create_metric_card(self, title, value, icon):
+        """Tạo thẻ số liệu, trả về (card, value_label)"""
+        card = QFrame()
+        card.setStyleSheet("""
+            QFrame {
+                background-color: white;
+                border-radius: 8px;
+                border: 1px solid #E1E8ED;
+            }
+        """)
+        card.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        card.setMinimumHeight(120)
+        
+        card_layout = QVBoxLayout(card)
+        
+        # Icon and Title in same row
+        header_layout = QHBoxLayout()
+        icon_label = QLabel(icon)
+        icon_label.setFont(QFont("Arial", 14))
+        header_layout.addWidget(icon_label)
+        
+        title_label = QLabel(title)
+        title_label.setStyleSheet("color: #657786; font-weight: normal;")
+        header_layout.addWidget(title_label)
+        header_layout.addStretch()
+        
+        card_layout.addLayout(header_layout)
+        
+        # Value
+        value_label = QLabel(value)
+        value_label.setFont(QFont("Arial", 24, QFont.Weight.Bold))
+        card_layout.addWidget(value_label)
+        return card, value_label
+        
+    def refreshStatsData(self):
+        """Cập nhật giá trị các thẻ số liệu từ bảng tổng hợp (không dựng lại trang)"""
+        # Tổng số liệu của mọi tài khoản từ bảng tổng hợp (một truy vấn, ở thread DataLoader)
+        self.data_loader.request("stats_totals", lambda db: DailyStats().totals())
+        if self.pages.get("Statistics") is not None:
+            self.fillAccountCombo(self.stats_account_combo)
+        self.redrawMetrics()
+
+    def onStatsTotalsLoaded(self, totals):
+        try:
+            total_tweets = totals['replies']
+            total_attempts = total_tweets + totals['reply_failures']
+            engagement_rate = 0.0
+            # Calculate engagement rate (simple example: likes + retweets / total tweets)
+            if total_tweets > 0:
+                engagement_rate = round(((totals['likes'] + totals['retweets']) / total_tweets) * 100, 1)
+            success_rate = 100.0 if total_attempts == 0 else round(total_tweets / total_attempts * 100, 1)
+            
+            values = {
+                "processed": str(total_tweets),
+                "engagement_rate": f"{engagement_rate}%",
+                "likes": str(totals['likes']),
+                "retweets": str(totals['retweets']),
+                "follows": str(totals['follows']),
+                "success_rate": f"{success_rate}%",
+            }
+            for key, label in self.stats_cards.items():
+                label.setText(values[key])
+            
+        except Exception as e:
+            print(f"Error refreshing statistics: {str(e)}")
         
     def refreshTweetStats(self):
         """Refresh the tweet statistics data"""
-        # Reload the showStatsPage to refresh all data
-        self.showStatsPage()
+        self.refreshStatsData()
+        self.loadRecentTweetData()
         
     def loadRecentTweetData(self):
         """Load recent tweet data into the tweets table"""
+        if self.tweets_table is None:
+            return
+        # Get up to 100 recent tweets ở thread DataLoader
+        self.data_loader.request("recent_tweets", lambda db: db.get_replied_tweets(limit=100))
+
+    def populateRecentTweets(self, tweets):
         try:
-            if not hasattr(self, 'tweets_table') or self.tweets_table is None:
+            if self.tweets_table is None:
                 return
             # Clear existing rows
             self.tweets_table.setRowCount(0)
             
-            # Get tweet data from database using get_replied_tweets instead
-            tweets = self.db.get_replied_tweets(limit=100)  # Get up to 100 recent tweets
-            
             if not tweets:
                 return
                 
@@ -1602,13 +1903,109 @@ class TwitterBotGUI(QMainWindow):
         except Exception as e:
             self.showMessage("Error", f"Could not load tweet data: {str(e)}")
     
-    def showLogPage(self):
-        """Show the comprehensive program log page"""
-        self.clearContentArea()
+    PERFORMANCE_COLUMNS = ["Code Path", "Calls", "Total (ms)", "Mean (ms)", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Max (ms)"]
+
+    def showPerformancePage(self):
+        """Trang Performance: thời gian của các đoạn code được đo bởi Profiler"""
+        self.showPage("Performance", self.buildPerformancePage, self.refreshPerformanceData)
+        if self.performance_timer is None:
+            self.performance_timer = QTimer(self)
+            self.performance_timer.setInterval(2000)
+            self.performance_timer.timeout.connect(self.refreshPerformanceData)
+        self.performance_timer.start()
+
+    def buildPerformancePage(self):
+        performance_container = QWidget()
+        performance_layout = QVBoxLayout(performance_container)
         
-        # Update the active menu item
-        self.set_active_menu_item("Log")
+        title_label = QLabel("Performance")
+        title_label.setFont(QFont("Arial", 24, QFont.Weight.Bold))
+        performance_layout.addWidget(title_label)
         
+        subtitle_label = QLabel("Where wall-clock time goes: timings of bot, database and logging code paths")
+        subtitle_label.setStyleSheet("color: #757575")
+        subtitle_label.setFont(QFont("Arial", 14))
+        performance_layout.addWidget(subtitle_label)
+        performance_layout.addSpacing(20)
+        
+        controls_layout = QHBoxLayout()
+        profiling_check = QCheckBox("Enable profiling")
+        profiling_check.setChecked(Profiler().enabled)
+        profiling_check.toggled.connect(self.onProfilingToggled)
+        controls_layout.addWidget(profiling_check)
+        controls_layout.addStretch()
+        
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.resetPerformanceData)
+        controls_layout.addWidget(reset_btn)
+        
+        export_btn = QPushButton("Export JSON")
+        export_btn.setStyleSheet("background-color: #1DA1F2; color: white; border-radius: 4px; padding: 6px 12px;")
+        export_btn.clicked.connect(self.exportPerformanceData)
+        controls_layout.addWidget(export_btn)
+        performance_layout.addLayout(controls_layout)
+        
+        self.performance_table = QTableWidget(0, len(self.PERFORMANCE_COLUMNS))
+        self.performance_table.setHorizontalHeaderLabels(self.PERFORMANCE_COLUMNS)
+        self.performance_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.performance_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.performance_table.verticalHeader().setVisible(False)
+        performance_layout.addWidget(self.performance_table)
+        
+        self.refreshPerformanceData()
+        return performance_container
+
+    def onProfilingToggled(self, checked):
+        Profiler().enabled = checked
+
+    def refreshPerformanceData(self):
+        """Gộp histogram của mọi thread và vẽ lại bảng (đoạn code tốn thời gian nhất ở trên)"""
+        if self.performance_table is None:
+            return
+        rows = Profiler().snapshot()
+        table = self.performance_table
+        table.setUpdatesEnabled(False)
+        try:
+            table.setRowCount(len(rows))
+            for i, row in enumerate(rows):
+                values = [row['name'], str(row['count'])] + [
+                    f"{row[key]:.2f}" for key in ('total_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms')
+                ]
+                for column, value in enumerate(values):
+                    item = QTableWidgetItem(value)
+                    if column > 0:
+                        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                    table.setItem(i, column, item)
+        finally:
+            table.setUpdatesEnabled(True)
+
+    def resetPerformanceData(self):
+        Profiler().reset()
+        self.refreshPerformanceData()
+
+    def exportPerformanceData(self):
+        """Export số liệu của Profiler ra file JSON"""
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Performance Data", "", "JSON Files (*.json)")
+        if not file_path:
+            return
+        try:
+            count = Profiler().export_json(file_path)
+            self.showMessage("Export Performance Data", f"Exported {count} code paths to {file_path}")
+        except Exception as e:
+            self.showMessage("Error", f"Could not export performance data: {str(e)}")
+
+    def showLogPage(self):
+        """Show the comprehensive program log page"""
+        self.showPage("Log", self.buildLogPage, self.onLogPageShown)
+        # Start auto-refresh timer
+        self.startLogAutoRefresh()
+    
+    def onLogPageShown(self):
+        """Khi quay lại trang Log: chỉ lấy các log mới và cập nhật danh sách tài khoản"""
+        self.fillAccountCombo(self.widget_for(None, "account_filter"))
+        self.refreshLogData()
+    
+    def buildLogPage(self):
         # Create container for logs
         logs_container = QWidget()
         logs_layout = QVBoxLayout(logs_container)
@@ -1642,6 +2039,7 @@ class TwitterBotGUI(QMainWindow):
         module_combo = QComboBox()
         module_combo.addItems(["All Modules", "Bot", "System", "Database", "Account Manager", "Network"])
         module_combo.setObjectName("module_filter")
+        self.register_widget(None, "module_filter", module_combo)
         filter_layout.addWidget(module_label, 0, 0)
         filter_layout.addWidget(module_combo, 0, 1)
         
@@ -1650,19 +2048,16 @@ class TwitterBotGUI(QMainWindow):
         level_combo = QComboBox()
         level_combo.addItems(["All Levels", "INFO", "WARNING", "ERROR", "DEBUG", "SUCCESS"])
         level_combo.setObjectName("level_filter")
+        self.register_widget(None, "level_filter", level_combo)
         filter_layout.addWidget(level_label, 0, 2)
         filter_layout.addWidget(level_combo, 0, 3)
         
         # Account filter
         account_label = QLabel("Account:")
         account_combo = QComboBox()
-        account_combo.addItems(["All Accounts"])
-        # Add accounts from database
-        accounts = self.db.get_all_accounts()
-        if accounts:
-            for account in accounts:
-                account_combo.addItem(f"@{account.get('username')}")
+        self.fillAccountCombo(account_combo)
         account_combo.setObjectName("account_filter")
+        self.register_widget(None, "account_filter", account_combo)
         filter_layout.addWidget(account_label, 1, 0)
         filter_layout.addWidget(account_combo, 1, 1)
         
@@ -1671,6 +2066,7 @@ class TwitterBotGUI(QMainWindow):
         date_combo = QComboBox()
         date_combo.addItems(["Last Hour", "Last 24 Hours", "Last 7 Days", "Last 30 Days", "Custom Range"])
         date_combo.setObjectName("date_filter")
+        self.register_widget(None, "date_filter", date_combo)
         filter_layout.addWidget(date_label, 1, 2)
         filter_layout.addWidget(date_combo, 1, 3)
         
@@ -1679,6 +2075,7 @@ class TwitterBotGUI(QMainWindow):
         search_input = QLineEdit()
         search_input.setPlaceholderText("Search in logs...")
         search_input.setObjectName("search_input")
+        self.register_widget(None, "search_input", search_input)
         filter_layout.addWidget(search_label, 2, 0)
         filter_layout.addWidget(search_input, 2, 1, 1, 3)
         
@@ -1702,29 +2099,37 @@ class TwitterBotGUI(QMainWindow):
         logs_layout.addWidget(filter_container)
         logs_layout.addSpacing(20)
         
-        # Log table
-        self.log_table = QTableWidget()
+        # Log table: model/view, tải theo trang và chỉ vẽ các dòng đang hiển thị
+        self.log_table = QTableView()
         self.log_table.setObjectName("log_table")
-        self.log_table.setColumnCount(6)
-        self.log_table.setHorizontalHeaderLabels(["Timestamp", "Level", "Module", "Account", "Message", "Details"])
-        
-        # Set table properties
-        self.log_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)  # Timestamp
-        self.log_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)  # Level
-        self.log_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)  # Module
-        self.log_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)  # Account
-        self.log_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)          # Message
-        self.log_table.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents)  # Details
+        self.log_model = LogTableModel(self.log_store, parent=self.log_table)
+        ResourceGuard().track('gui', TABLE, 'log_table', self.log_model,
+                              size=lambda model: model.rowCount(), cap=self.log_model.max_rows,
+                              trim=lambda model, cap: model.trim(cap))
+        self.log_table.setModel(self.log_model)
+        
+        # Set table properties (không dùng ResizeToContents để tránh quét toàn bộ dòng)
+        header = self.log_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)  # Message
+        self.log_table.setColumnWidth(0, 150)  # Timestamp
+        self.log_table.setColumnWidth(1, 80)   # Level
+        self.log_table.setColumnWidth(2, 110)  # Module
+        self.log_table.setColumnWidth(3, 120)  # Account
+        self.log_table.setColumnWidth(5, 160)  # Details
+        self.log_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.log_table.verticalHeader().setDefaultSectionSize(32)
+        self.log_table.verticalHeader().setVisible(False)
         
         self.log_table.setAlternatingRowColors(True)
         self.log_table.setStyleSheet("""
-            QTableWidget#log_table {
+            QTableView#log_table {
                 background-color: white;
                 border: 1px solid #e1e8ed;
                 border-radius: 8px;
                 gridline-color: #e1e8ed;
             }
-            QTableWidget#log_table::item {
+            QTableView#log_table::item {
                 padding: 8px;
                 border-bottom: 1px solid #e1e8ed;
             }
@@ -1737,7 +2142,7 @@ class TwitterBotGUI(QMainWindow):
             }
         """)
         
-        # Add some sample logs (replace with actual log loading)
+        # Tải trang log đầu tiên
         self.loadLogData()
         
         logs_layout.addWidget(self.log_table)
@@ -1752,6 +2157,7 @@ class TwitterBotGUI(QMainWindow):
         auto_refresh_combo.addItems(["Off", "5 seconds", "10 seconds", "30 seconds", "1 minute"])
         auto_refresh_combo.setCurrentText("10 seconds")
         auto_refresh_combo.setObjectName("auto_refresh_combo")
+        self.register_widget(None, "auto_refresh_combo", auto_refresh_combo)
         auto_refresh_combo.currentTextChanged.connect(self.onAutoRefreshChanged)
         
         # Action buttons
@@ -1771,130 +2177,64 @@ class TwitterBotGUI(QMainWindow):
         bottom_controls.addWidget(export_logs_btn)
         
         logs_layout.addLayout(bottom_controls)
-        
-        # Add the logs container to the content area
-        self.content_layout.addWidget(logs_container)
-        
-        # Start auto-refresh timer
-        self.startLogAutoRefresh()
+        return logs_container
     
     def loadLogData(self):
-        """Load log data into the table"""
+        """Load the newest page of logs into the table"""
         try:
-            if not hasattr(self, 'log_table') or self.log_table is None:
+            if not hasattr(self, 'log_model') or self.log_model is None:
                 return
-            # Clear existing rows
-            self.log_table.setRowCount(0)
-            
-            # Get logs from database (implement this method in DatabaseManager)
-            logs = self.db.get_logs(limit=1000)  # Get last 1000 logs
+            self.log_model.reload()
             
-            if not logs:
+        except Exception as e:
+            self.showMessage("Error", f"Could not load logs: {str(e)}")
+    
+    def refreshLogData(self):
+        """Chỉ thêm các log mới vào bảng (dùng cho auto-refresh)"""
+        try:
+            if not hasattr(self, 'log_model') or self.log_model is None:
                 return
-                
-            # Add rows to table
-            for log in logs:
-                row = self.log_table.rowCount()
-                self.log_table.insertRow(row)
-                
-                # Format timestamp
-                timestamp = log.get('timestamp', '')
-                if isinstance(timestamp, str):
-                    try:
-                        timestamp = datetime.fromisoformat(timestamp)
-                    except ValueError:
-                        pass
-                if isinstance(timestamp, datetime):
-                    timestamp = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-                
-                # Set row data with appropriate colors
-                self.log_table.setItem(row, 0, QTableWidgetItem(str(timestamp)))
-                
-                # Level with color
-                level_item = QTableWidgetItem(log.get('level', 'INFO'))
-                level = log.get('level', 'INFO').upper()
-                if level == 'ERROR':
-                    level_item.setForeground(QBrush(QColor("#FF3B30")))
-                elif level == 'WARNING':
-                    level_item.setForeground(QBrush(QColor("#FF9500")))
-                elif level == 'SUCCESS':
-                    level_item.setForeground(QBrush(QColor("#4CD964")))
-                elif level == 'DEBUG':
-                    level_item.setForeground(QBrush(QColor("#8E8E93")))
-                self.log_table.setItem(row, 1, level_item)
-                
-                # Module
-                self.log_table.setItem(row, 2, QTableWidgetItem(log.get('module', '')))
-                
-                # Account
-                account = log.get('account', '')
-                if account:
-                    account = f"@{account}"
-                self.log_table.setItem(row, 3, QTableWidgetItem(account))
-                
-                # Message
-                self.log_table.setItem(row, 4, QTableWidgetItem(log.get('message', '')))
-                
-                # Details (if any)
-                details = log.get('details', '')
-                if details:
-                    try:
-                        # Try to format JSON details
-                        if isinstance(details, str):
-                            details = json.loads(details)
-                        details = json.dumps(details, indent=2)
-                    except:
-                        pass
-                self.log_table.setItem(row, 5, QTableWidgetItem(str(details)))
-            
-            # Scroll to bottom
-            self.log_table.scrollToBottom()
+            self.log_model.refresh()
             
         except Exception as e:
-            self.showMessage("Error", f"Could not load logs: {str(e)}")
+            print(f"Error refreshing logs: {str(e)}")
     
     def clearLogFilters(self):
         """Clear all log filters"""
         try:
             # Reset all filter controls
-            self.findChild(QComboBox, "module_filter").setCurrentIndex(0)
-            self.findChild(QComboBox, "level_filter").setCurrentIndex(0)
-            self.findChild(QComboBox, "account_filter").setCurrentIndex(0)
-            self.findChild(QComboBox, "date_filter").setCurrentIndex(0)
-            self.findChild(QLineEdit, "search_input").clear()
+            self.widget_for(None, "module_filter").setCurrentIndex(0)
+            self.widget_for(None, "level_filter").setCurrentIndex(0)
+            self.widget_for(None, "account_filter").setCurrentIndex(0)
+            self.widget_for(None, "date_filter").setCurrentIndex(0)
+            self.widget_for(None, "search_input").clear()
             
             # Reload logs
-            self.loadLogData()
+            self.log_model.set_filters(None)
             
         except Exception as e:
             self.showMessage("Error", f"Could not clear filters: {str(e)}")
     
+    def currentLogFilters(self):
+        """Đọc giá trị các bộ lọc trên trang Log thành dict cho LogStore"""
+        module = self.widget_for(None, "module_filter").currentText()
+        level = self.widget_for(None, "level_filter").currentText()
+        account = self.widget_for(None, "account_filter").currentText()
+        date_range = self.widget_for(None, "date_filter").currentText()
+        search_text = self.widget_for(None, "search_input").text().strip()
+        return {
+            'module': module if module != "All Modules" else None,
+            'level': level if level != "All Levels" else None,
+            'account': account if account != "All Accounts" else None,
+            'date_range': date_range,
+            'search_text': search_text if search_text else None
+        }
+    
     def applyLogFilters(self):
         """Apply selected filters to logs"""
         try:
-            # Get filter values
-            module = self.findChild(QComboBox, "module_filter").currentText()
-            level = self.findChild(QComboBox, "level_filter").currentText()
-            account = self.findChild(QComboBox, "account_filter").currentText()
-            date_range = self.findChild(QComboBox, "date_filter").currentText()
-            search_text = self.findChild(QLineEdit, "search_input").text().lower()
-            
-            # Get logs with filters
-            logs = self.db.get_filtered_logs(
-                module=module if module != "All Modules" else None,
-                level=level if level != "All Levels" else None,
-                account=account if account != "All Accounts" else None,
-                date_range=date_range,
-                search_text=search_text if search_text else None
-            )
-            
-            # Update table
-            self.log_table.setRowCount(0)
-            for log in logs:
-                # Add log to table (similar to loadLogData)
-                row = self.log_table.rowCount()
-                self.log_table.insertRow(row)
-                # ... (same as in loadLogData)
+            # Lọc trong SQL (index + FTS5), kết quả được tải theo trang khi cuộn
+            self.log_model.set_filters(self.currentLogFilters())
             
         except Exception as e:
             self.showMessage("Error", f"Could not apply filters: {str(e)}")
@@ -1920,93 +2260,159 @@ class TwitterBotGUI(QMainWindow):
             self.showMessage("Error", f"Could not clear logs: {str(e)}")
     
     def exportLogs(self):
-        """Export logs to file"""
+        """Export logs to file (streamed in a background thread)"""
         try:
+            if self.log_export_worker is not None and self.log_export_worker.isRunning():
+                self.showMessage("Export Logs", "An export is already running")
+                return
+            
             # Get save file path
             file_path, _ = QFileDialog.getSaveFileName(
                 self,
                 "Export Logs",
                 "",
-                "CSV Files (*.csv);;JSON Files (*.json);;Text Files (*.txt)"
+                "CSV Files (*.csv);;JSON Lines Files (*.jsonl *.json);;Text Files (*.txt)"
             )
             
             if not file_path:
                 return
-                
-            # Get current filters
-            module = self.findChild(QComboBox, "module_filter").currentText()
-            level = self.findChild(QComboBox, "level_filter").currentText()
-            account = self.findChild(QComboBox, "account_filter").currentText()
-            date_range = self.findChild(QComboBox, "date_filter").currentText()
             
-            # Export logs
-            self.db.export_logs(
-                file_path,
-                module=module if module != "All Modules" else None,
-                level=level if level != "All Levels" else None,
-                account=account if account != "All Accounts" else None,
-                date_range=date_range
+            # Export với bộ lọc hiện tại, ghi theo từng trang ở thread riêng
+            worker = LogExportWorker(file_path, self.currentLogFilters(), parent=self)
+            
+            progress = QProgressDialog("Exporting logs...", "Cancel", 0, 0, self)
+            progress.setWindowTitle("Export Logs")
+            progress.setWindowModality(Qt.WindowModality.WindowModal)
+            progress.setMinimumDuration(300)
+            progress.setAutoClose(False)
+            progress.setAutoReset(False)
+            progress.canceled.connect(worker.cancel)
+            
+            def on_progress(written, total):
+                if total > 0:
+                    progress.setMaximum(total)
+                    progress.setValue(min(written, total))
+                progress.setLabelText(f"Exported {written} of {total} logs...")
+            
+            def on_done():
+                progress.close()
+                self.log_export_worker = None
+            
+            worker.progress_signal.connect(on_progress)
+            worker.finished_signal.connect(
+                lambda path, count: self.showMessage("Success", f"Exported {count} logs to {path}")
             )
+            worker.cancelled_signal.connect(lambda: self.showMessage("Export Logs", "Export cancelled"))
+            worker.error_signal.connect(lambda error: self.showMessage("Error", f"Could not export logs: {error}"))
+            worker.finished.connect(on_done)
             
-            self.showMessage("Success", "Logs exported successfully!")
+            self.log_export_worker = worker
+            worker.start()
             
         except Exception as e:
             self.showMessage("Error", f"Could not export logs: {str(e)}")
     
+    # Khoảng thời gian auto-refresh (ms) theo lựa chọn trên trang Log
+    LOG_REFRESH_INTERVALS = {
+        "5 seconds": 5000,
+        "10 seconds": 10000,
+        "30 seconds": 30000,
+        "1 minute": 60000,
+    }
+
     def startLogAutoRefresh(self):
         """Start auto-refresh timer for logs"""
         try:
             # Get refresh interval
-            interval_text = self.findChild(QComboBox, "auto_refresh_combo").currentText()
-            if interval_text == "Off":
-                return
-                
-            # Convert to milliseconds
-            if interval_text == "5 seconds":
-                interval = 5000
-            elif interval_text == "10 seconds":
-                interval = 10000
-            elif interval_text == "30 seconds":
-                interval = 30000
-            elif interval_text == "1 minute":
-                interval = 60000
-            else:
+            interval_text = self.widget_for(None, "auto_refresh_combo").currentText()
+            interval = self.LOG_REFRESH_INTERVALS.get(interval_text)
+            if interval is None:
+                self.stopLogAutoRefresh()
                 return
                 
-            # Create and start timer
-            self.log_refresh_timer = QTimer()
-            self.log_refresh_timer.timeout.connect(self.loadLogData)
+            # Chỉ dùng một timer duy nhất, đổi interval thay vì tạo timer mới
+            if self.log_refresh_timer is None:
+                self.log_refresh_timer = QTimer(self)
+                self.log_refresh_timer.timeout.connect(self.refreshLogData)
             self.log_refresh_timer.start(interval)
             
         except Exception as e:
             print(f"Error starting log auto-refresh: {str(e)}")
     
+    def stopLogAutoRefresh(self):
+        """Stop the log auto-refresh timer if it is running"""
+        if self.log_refresh_timer is not None:
+            self.log_refresh_timer.stop()
+    
     def onAutoRefreshChanged(self, value):
         """Handle auto-refresh interval change"""
         try:
-            # Stop existing timer if any
-            if hasattr(self, 'log_refresh_timer'):
-                self.log_refresh_timer.stop()
-            
-            # Start new timer if not "Off"
-            if value != "Off":
+            if value == "Off":
+                self.stopLogAutoRefresh()
+            else:
                 self.startLogAutoRefresh()
                 
         except Exception as e:
             print(f"Error changing auto-refresh: {str(e)}")
 
-    def clearContentArea(self):
-        """Clear all widgets from the content area layout and reset instance widgets/layouts"""
-        while self.content_layout.count():
-            item = self.content_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-        # Reset all instance widgets/layouts to None
-        self.accounts_layout = None
-        self.accounts_container = None
-        self.log_table = None
-        self.tweets_table = None
+    def fillAccountCombo(self, combo):
+        """Điền danh sách tài khoản vào combo lọc, giữ lựa chọn hiện tại nếu còn"""
+        if self.account_rows is None:
+            # Chưa có danh sách: nạp ở background, onAccountsLoaded sẽ điền lại combo
+            if not self.data_loader.is_pending("accounts"):
+                self.data_loader.request("accounts", self.queryAccounts)
+            accounts = []
+        else:
+            accounts = self.account_rows
+        names = ["All Accounts"] + [f"@{account.get('username')}" for account in accounts]
+        if [combo.itemText(i) for i in range(combo.count())] == names:
+            return
+        current = combo.currentText()
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItems(names)
+        if current in names:
+            combo.setCurrentText(current)
+        combo.blockSignals(False)
+
+    def checkResources(self):
+        """Đo RSS/kích thước tài nguyên và cắt bảng/cache vượt giới hạn (thread GUI)"""
+        guard = ResourceGuard()
+        guard.sample()
+        guard.enforce()
+
+    def closeEvent(self, event):
+        """Dừng các bot, ghi nốt log đang chờ và đóng các kết nối database trước khi thoát"""
+        if not self.shutting_down:
+            self.resource_timer.stop()
+            # Mọi bot nhận cờ dừng cùng lúc nên dừng song song, chung một hạn chờ
+            for profile_id in list(self.bot_instances):
+                self.stopBot(profile_id)
+            if self.stopping_bots:
+                self.shutting_down = True
+                self.setEnabled(False)
+                self.setWindowTitle(f"{self.windowTitle()} - đang dừng {len(self.stopping_bots)} bot...")
+        if self.stopping_bots:
+            # Chưa đóng: finishStopBot gọi lại close() khi bot cuối cùng đã dừng
+            event.ignore()
+            return
+        self.bot_workers.clear()
+        # Mỗi bước có try riêng: một bước lỗi không làm bỏ qua các bước sau
+        # (nhất là ghi nốt log và đóng kết nối database)
+        steps = [
+            ("giải phóng tài nguyên của GUI", lambda: ResourceGuard().release('gui')),
+            ("dừng DataLoader", self.data_loader.stop),
+            ("dừng status endpoint", lambda: self.status_server and self.status_server.stop()),
+            ("dừng LogRetention", LogRetention().stop),
+            ("đóng LogWriter", LogWriter().close),
+            ("đóng kết nối database", DatabasePool().close_all),
+        ]
+        for name, step in steps:
+            try:
+                step()
+            except Exception as e:
+                print(f"Lỗi khi {name}: {str(e)}")
+        super().closeEvent(event)
 
     def showMessage(self, title, message):
         """Show a message dialog"""
@@ -2014,6 +2420,10 @@ class TwitterBotGUI(QMainWindow):
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    STARTUP.mark("QApplication")
     window = TwitterBotGUI()
+    STARTUP.mark("main window")
     window.show()
+    # Chạy ở vòng lặp sự kiện đầu tiên, sau khi cửa sổ đã được vẽ
+    QTimer.singleShot(0, STARTUP.first_frame)
     sys.exit(app.exec())
\ No newline at end of file
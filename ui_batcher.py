@@ -0,0 +1,45 @@
+from collections import deque
+
+from PyQt6.QtCore import QObject, QTimer
+
+
+class UpdateBatcher(QObject):
+    """Gom các cập nhật GUI tần suất cao và áp dụng theo lô mỗi interval_ms.
+
+    push() chỉ thêm vào bộ đệm (O(1)); timer single-shot gọi apply(items) một lần
+    cho cả lô. Bộ đệm có giới hạn max_pending: khi quá tải, mục cũ nhất bị bỏ.
+    """
+    def __init__(self, apply, interval_ms=200, max_pending=1000, parent=None):
+        super().__init__(parent)
+        self.apply = apply
+        self.pending = deque(maxlen=max_pending)
+        self.dropped = 0
+        self.batches = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.flush)
+
+    def push(self, item):
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append(item)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        """Áp dụng ngay mọi mục đang chờ"""
+        self.timer.stop()
+        if not self.pending:
+            return
+        items = list(self.pending)
+        self.pending.clear()
+        self.batches += 1
+        try:
+            self.apply(items)
+        except Exception as e:
+            print(f"UpdateBatcher: lỗi khi cập nhật GUI: {str(e)}")
+
+    def clear(self):
+        self.timer.stop()
+        self.pending.clear()